@@ -20,13 +20,16 @@ load_dotenv(ROOT_DIR / env_file, override=True)
 # ==========================================================
 # IMPORTACIÓN DE MODELOS
 # ==========================================================
-from app.models.worker import Worker, Role, Status, Campaign, Team, WorkType, ContractType, Attendance, UbycallSchedule, Schedule
+from app.models.worker import Worker, Role, Status, Campaign, Team, WorkType, ContractType, Attendance, UbycallSchedule, Schedule, WorkerHistory
 from app.models.planned import Planned
 from app.models.real_time_data import RealTimeData
 from app.models.user import User
 from app.models.data_kpi import PlannedData, RealData
 from app.models.sla_breached import SlaBreached
 from app.models.contacts_with_ccr import ContactsReceived, ContactsReceivedReason
+from app.models.upload_job import UploadJob
+from app.models.name_alias import NameAlias, NameRosterEntry
+from app.models.snapshot_version import SnapshotVersion
 
 # ==========================================================
 # CONFIGURACIÓN BASE DE ALEMBIC
@@ -0,0 +1,42 @@
+"""add schedule unique worker day
+
+Revision ID: a5c9e2f7b4d1
+Revises: e3b8d1f6a2c4
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5c9e2f7b4d1'
+down_revision: Union[str, Sequence[str], None] = 'e3b8d1f6a2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Depuración única: por (worker_document, start_date) se conserva el registro más reciente (mayor id)
+    op.execute(
+        """
+        DELETE FROM schedule s
+        USING (
+            SELECT id,
+                   row_number() OVER (PARTITION BY worker_document, start_date ORDER BY id DESC) AS rn
+            FROM schedule
+            WHERE start_date IS NOT NULL
+        ) d
+        WHERE s.id = d.id AND d.rn > 1
+        """
+    )
+    op.create_index(
+        'ux_schedule_worker_document_start_date', 'schedule', ['worker_document', 'start_date'], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_schedule_worker_document_start_date', table_name='schedule')
@@ -0,0 +1,44 @@
+"""add name_alias table
+
+Revision ID: b4d2f6a8c1e3
+Revises: 9a1c3e5b7d20
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d2f6a8c1e3'
+down_revision: Union[str, Sequence[str], None] = '9a1c3e5b7d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('namealias',
+    sa.Column('raw_name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('canonical_name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('resolved_at', sa.DateTime(), nullable=False),
+    sa.Column('last_seen', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('raw_name')
+    )
+    op.create_index(op.f('ix_namealias_canonical_name'), 'namealias', ['canonical_name'], unique=False)
+    op.create_table('namerosterentry',
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('added_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('namerosterentry')
+    op.drop_index(op.f('ix_namealias_canonical_name'), table_name='namealias')
+    op.drop_table('namealias')
@@ -0,0 +1,80 @@
+"""add worker row_hash and worker_history table
+
+Revision ID: c7e1a9d3f5b2
+Revises: b4d2f6a8c1e3
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e1a9d3f5b2'
+down_revision: Union[str, Sequence[str], None] = 'b4d2f6a8c1e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Campos de negocio del hash (mismo orden que app.crud.worker.WORKER_HASH_COLUMNS)
+HASH_COLUMNS = [
+    'name', 'role_id', 'status_id', 'campaign_id', 'team_id', 'manager', 'supervisor', 'coordinator',
+    'work_type_id', 'start_date', 'termination_date', 'contract_type_id', 'requirement_id', 'api_id',
+    'api_name', 'api_email', 'observation_1', 'observation_2', 'tenure', 'trainee', 'productive',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('worker', sa.Column('row_hash', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=True))
+    op.create_table('worker_history',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('document', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('role_id', sa.Integer(), nullable=True),
+    sa.Column('status_id', sa.Integer(), nullable=True),
+    sa.Column('campaign_id', sa.Integer(), nullable=True),
+    sa.Column('team_id', sa.Integer(), nullable=True),
+    sa.Column('manager', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('supervisor', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('coordinator', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('work_type_id', sa.Integer(), nullable=True),
+    sa.Column('start_date', sa.Date(), nullable=True),
+    sa.Column('termination_date', sa.Date(), nullable=True),
+    sa.Column('contract_type_id', sa.Integer(), nullable=True),
+    sa.Column('requirement_id', sqlmodel.sql.sqltypes.AutoString(length=15), nullable=True),
+    sa.Column('api_id', sqlmodel.sql.sqltypes.AutoString(length=40), nullable=True),
+    sa.Column('api_name', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('api_email', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('observation_1', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('observation_2', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('tenure', sa.Integer(), nullable=True),
+    sa.Column('trainee', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=True),
+    sa.Column('productive', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('row_hash', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+    sa.Column('valid_from', sa.DateTime(), nullable=False),
+    sa.Column('valid_to', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_worker_history_current', 'worker_history', ['document'], unique=True, postgresql_where=sa.text('valid_to IS NULL'))
+    op.create_index('ix_worker_history_document_valid_from', 'worker_history', ['document', 'valid_from'], unique=False)
+    op.create_index('ix_worker_history_validity', 'worker_history', [sa.text('tsrange(valid_from, valid_to)')], unique=False, postgresql_using='gist')
+
+    # Hash de los workers existentes y su versión inicial abierta
+    columns = ', '.join(HASH_COLUMNS)
+    op.execute(f"UPDATE worker SET row_hash = md5(ROW({columns})::text)")
+    op.execute(
+        f"INSERT INTO worker_history (document, {columns}, row_hash, valid_from) "
+        f"SELECT document, {columns}, row_hash, LOCALTIMESTAMP FROM worker"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_worker_history_validity', table_name='worker_history', postgresql_using='gist')
+    op.drop_index('ix_worker_history_document_valid_from', table_name='worker_history')
+    op.drop_index('ix_worker_history_current', table_name='worker_history', postgresql_where=sa.text('valid_to IS NULL'))
+    op.drop_table('worker_history')
+    op.drop_column('worker', 'row_hash')
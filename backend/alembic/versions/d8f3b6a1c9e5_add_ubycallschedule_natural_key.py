@@ -0,0 +1,53 @@
+"""add ubycallschedule natural key
+
+Revision ID: d8f3b6a1c9e5
+Revises: a5c9e2f7b4d1
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f3b6a1c9e5'
+down_revision: Union[str, Sequence[str], None] = 'a5c9e2f7b4d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Depuración única: por turno (documento, fecha, inicio, fin) se conserva el primero (menor id),
+    # el mismo que dejaba la carga al omitir los repetidos
+    op.execute(
+        """
+        DELETE FROM ubycallschedule u
+        USING (
+            SELECT id,
+                   row_number() OVER (
+                       PARTITION BY worker_document, date, start_time, end_time ORDER BY id
+                   ) AS rn
+            FROM ubycallschedule
+        ) d
+        WHERE u.id = d.id AND d.rn > 1
+        """
+    )
+    op.create_index(
+        'ux_ubycallschedule_natural_key',
+        'ubycallschedule',
+        [
+            'worker_document',
+            'date',
+            sa.text("coalesce(start_time, CAST('24:00' AS TIME))"),
+            sa.text("coalesce(end_time, CAST('24:00' AS TIME))"),
+        ],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_ubycallschedule_natural_key', table_name='ubycallschedule')
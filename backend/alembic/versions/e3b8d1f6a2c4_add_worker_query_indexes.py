@@ -0,0 +1,38 @@
+"""add worker query indexes
+
+Revision ID: e3b8d1f6a2c4
+Revises: c7e1a9d3f5b2
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b8d1f6a2c4'
+down_revision: Union[str, Sequence[str], None] = 'c7e1a9d3f5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_worker_team_document', 'worker', ['team_id', 'document'], unique=False)
+    op.create_index('ix_worker_status_document', 'worker', ['status_id', 'document'], unique=False)
+    op.create_index('ix_worker_campaign_document', 'worker', ['campaign_id', 'document'], unique=False)
+    op.create_index('ix_worker_supervisor_document', 'worker', ['supervisor', 'document'], unique=False)
+    op.create_index('ix_worker_coordinator_document', 'worker', ['coordinator', 'document'], unique=False)
+    op.create_index('ix_attendance_api_email_date', 'attendance', ['api_email', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_attendance_api_email_date', table_name='attendance')
+    op.drop_index('ix_worker_coordinator_document', table_name='worker')
+    op.drop_index('ix_worker_supervisor_document', table_name='worker')
+    op.drop_index('ix_worker_campaign_document', table_name='worker')
+    op.drop_index('ix_worker_status_document', table_name='worker')
+    op.drop_index('ix_worker_team_document', table_name='worker')
@@ -0,0 +1,125 @@
+"""partition schedule and attendance by week
+
+Revision ID: f4a7c2e9d6b3
+Revises: d8f3b6a1c9e5
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+import os
+from datetime import date, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a7c2e9d6b3'
+down_revision: Union[str, Sequence[str], None] = 'd8f3b6a1c9e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# La columna de partición pasa a ser parte de la llave primaria (NOT NULL): las filas
+# sin fecha no entran en ninguna partición, ni en una DEFAULT. Por defecto la
+# migración se detiene si las hay; con PARTITION_DROP_NULL_KEYS=1 se descartan
+PARTITION_DROP_NULL_KEYS = os.getenv("PARTITION_DROP_NULL_KEYS", "0") == "1"
+
+# Tabla → (columna de partición, llave foránea, índices con su definición)
+TABLES = {
+    'schedule': (
+        'start_date',
+        ('worker_document', 'worker (document)'),
+        {'ux_schedule_worker_document_start_date': 'UNIQUE INDEX {name} ON {table} (worker_document, start_date)'},
+    ),
+    'ubycallschedule': (
+        'date',
+        ('worker_document', 'worker (document)'),
+        {
+            'ux_ubycallschedule_natural_key': (
+                "UNIQUE INDEX {name} ON {table} (worker_document, date, "
+                "coalesce(start_time, CAST('24:00' AS TIME)), coalesce(end_time, CAST('24:00' AS TIME)))"
+            ),
+        },
+    ),
+    'attendance': (
+        'date',
+        ('api_email', 'worker (api_email)'),
+        {'ix_attendance_api_email_date': 'INDEX {name} ON {table} (api_email, date)'},
+    ),
+}
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Recrea `table` (particionada por semana o plana) con los mismos datos, secuencia, llave foránea e índices."""
+    key, (fk_column, fk_target), indexes = TABLES[table]
+    old = f'{table}_old'
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey')
+    for name in indexes:
+        op.execute(f'DROP INDEX {name}')
+
+    if partitioned:
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE ({key})')
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, {key})')
+        # Una partición por semana (lunes a lunes) desde el dato más antiguo hasta la semana siguiente a hoy
+        bind = op.get_bind()
+        first, last = bind.execute(sa.text(f'SELECT min({key}), max({key}) FROM {old}')).one()
+        today = date.today()
+        first = min(first or today, today)
+        last = max(last or today, today + timedelta(days=7))
+        monday = first - timedelta(days=first.weekday())
+        while monday <= last:
+            op.execute(
+                f"CREATE TABLE {table}_p{monday:%Y%m%d} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{monday.isoformat()}') TO ('{(monday + timedelta(days=7)).isoformat()}')"
+            )
+            monday += timedelta(days=7)
+        # Las filas sin fecha ya se contaron en _check_null_keys
+        op.execute(f'INSERT INTO {table} SELECT * FROM {old} WHERE {key} IS NOT NULL')
+    else:
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)')
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)')
+        op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+
+    op.execute(
+        f'ALTER TABLE {table} ADD CONSTRAINT {table}_{fk_column}_fkey '
+        f'FOREIGN KEY ({fk_column}) REFERENCES {fk_target}'
+    )
+    for name, definition in indexes.items():
+        op.execute('CREATE ' + definition.format(name=name, table=table))
+    # La secuencia del id pasa a la tabla nueva antes de borrar la anterior
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f'DROP TABLE {old} CASCADE')
+
+
+def _check_null_keys() -> None:
+    """Cuenta las filas sin columna de partición antes de tocar ninguna tabla."""
+    bind = op.get_bind()
+    counts = {
+        table: bind.execute(sa.text(f'SELECT count(*) FROM {table} WHERE {key} IS NULL')).scalar_one()
+        for table, (key, _, _) in TABLES.items()
+    }
+    counts = {table: n for table, n in counts.items() if n}
+    if not counts:
+        return
+    detail = ", ".join(f"{table}.{TABLES[table][0]}: {n}" for table, n in counts.items())
+    if not PARTITION_DROP_NULL_KEYS:
+        raise RuntimeError(
+            f"Hay filas sin fecha que no caben en ninguna partición ({detail}). "
+            "Corrígelas o bórralas, o corre la migración con PARTITION_DROP_NULL_KEYS=1 para descartarlas."
+        )
+    print(f"⚠️ [PARTITION] Se descartan {sum(counts.values())} filas sin fecha ({detail})")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _check_null_keys()
+    for table in TABLES:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        _rebuild(table, partitioned=False)
+    op.execute('ALTER TABLE schedule ALTER COLUMN start_date DROP NOT NULL')
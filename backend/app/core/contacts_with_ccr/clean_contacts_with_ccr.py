@@ -12,7 +12,18 @@ QUEUE_NAMES = {
 
 COUNTRY = ['ES', 'PT']
 
-def clean_contacts_with_ccr(data: pd.DataFrame):
+# Columnas del export que usa la limpieza (el resto no se carga al leer el CSV)
+CCR_SOURCE_COLUMNS = [
+    'queue_name', 'country', 'resolution_time', 'creation_timestamp_local',
+    'ticket_id', 'cr_l1', 'cr_l2', 'cr_l3'
+]
+
+INTERVAL_KEYS = ['date_pe', 'interval_pe', 'date_es', 'interval_es', 'team']
+REASON_KEYS = INTERVAL_KEYS + ['contact_reason']
+
+
+def prepare_contacts_with_ccr(data: pd.DataFrame) -> pd.DataFrame:
+    """Filtra colas/países y calcula fechas, intervalos, team y contact reason (fila a fila, sin agrupar)."""
 
     # ─────────────────────
     # Limpieza básica
@@ -30,43 +41,12 @@ def clean_contacts_with_ccr(data: pd.DataFrame):
         utc=True
     )
 
-    mask_dec31_11pm = (
-        (data['creation_timestamp_utc'].dt.year == 2025) &
-        (data['creation_timestamp_utc'].dt.month == 12) &
-        (data['creation_timestamp_utc'].dt.day == 31) &
-        (data['creation_timestamp_utc'].dt.hour == 23) &
-        (data['queue_name'] == 'VS-case-inbox-spa-ES-tier2')
-    )
-
-    dec31_11pm_data = data[mask_dec31_11pm]
-
-    print("📌 Registros 31/12/2025 - 11 PM (UTC):")
-    print(dec31_11pm_data[['creation_timestamp_local', 'creation_timestamp_utc', 'ticket_id']])
-
-    print("Cantidad total:", len(dec31_11pm_data))
-
     # ─────────────────────
     # Zonas horarias
     # ─────────────────────
     data['timestamp_pe'] = data['creation_timestamp_utc'].dt.tz_convert('America/Lima')
     data['timestamp_es'] = data['creation_timestamp_utc'].dt.tz_convert('Europe/Madrid')
 
-    pe_count = dec31_11pm_data.assign(
-        timestamp_pe=dec31_11pm_data['creation_timestamp_utc'].dt.tz_convert('America/Lima')
-    )
-
-    es_count = dec31_11pm_data.assign(
-        timestamp_es=dec31_11pm_data['creation_timestamp_utc'].dt.tz_convert('Europe/Madrid')
-    )
-
-    print("\n🇵🇪 Transformados a timestamp_pe:")
-    print(pe_count[['creation_timestamp_utc', 'timestamp_pe']])
-    print("Cantidad PE:", len(pe_count))
-
-    print("\n🇪🇸 Transformados a timestamp_es:")
-    print(es_count[['creation_timestamp_utc', 'timestamp_es']])
-    print("Cantidad ES:", len(es_count))
-
     data['date_pe'] = data['timestamp_pe'].dt.date
     data['interval_pe'] = data['timestamp_pe'].dt.strftime('%H:00')
 
@@ -85,14 +65,17 @@ def clean_contacts_with_ccr(data: pd.DataFrame):
     data.loc[data['cr_l2'].notna(), 'contact_reason'] += '/' + data['cr_l2']
     data.loc[data['cr_l3'].notna(), 'contact_reason'] += '/' + data['cr_l3']
 
+    return data
+
+
+def count_contacts_with_ccr(data: pd.DataFrame):
+    """Conteos parciales (por intervalo y por CR) de filas ya preparadas."""
+
     # ─────────────────────
     # Tabla 1: métricas por intervalo
     # ─────────────────────
     interval_metrics = (
-        data.groupby(
-            ['date_pe', 'interval_pe', 'date_es', 'interval_es', 'team'],
-            as_index=False
-        )
+        data.groupby(INTERVAL_KEYS, as_index=False)
         .size()
         .rename(columns={'size': 'contacts_received'})
     )
@@ -101,12 +84,42 @@ def clean_contacts_with_ccr(data: pd.DataFrame):
     # Tabla 2: conteo por CR
     # ─────────────────────
     cr_table = (
-        data.groupby(
-            ['date_pe', 'interval_pe', 'date_es', 'interval_es', 'team', 'contact_reason'],
-            as_index=False
-        )
+        data.groupby(REASON_KEYS, as_index=False)
         .size()
         .rename(columns={'size': 'count'})
     )
 
-    return interval_metrics, cr_table
\ No newline at end of file
+    return interval_metrics, cr_table
+
+
+def clean_contacts_with_ccr(data: pd.DataFrame):
+    data = prepare_contacts_with_ccr(data)
+    return count_contacts_with_ccr(data)
+
+
+def _merge_counts(frames, keys, value_col) -> pd.DataFrame:
+    """Suma conteos parciales con las mismas llaves (resultado ordenado como un groupby)."""
+    return pd.concat(frames, ignore_index=True).groupby(keys, as_index=False)[value_col].sum()
+
+
+def clean_contacts_with_ccr_chunks(chunks):
+    """
+    Versión por partes de clean_contacts_with_ccr: cada chunk se filtra y se
+    reduce a conteos parciales que se suman con el acumulado, así en memoria
+    solo hay un chunk y tablas del tamaño del número de grupos.
+    """
+    interval_metrics = cr_table = None
+    for chunk in chunks:
+        partial_interval, partial_cr = count_contacts_with_ccr(prepare_contacts_with_ccr(chunk))
+        if interval_metrics is None:
+            interval_metrics, cr_table = partial_interval, partial_cr
+            continue
+        interval_metrics = _merge_counts([interval_metrics, partial_interval], INTERVAL_KEYS, 'contacts_received')
+        cr_table = _merge_counts([cr_table, partial_cr], REASON_KEYS, 'count')
+
+    if interval_metrics is None:
+        return (
+            pd.DataFrame(columns=INTERVAL_KEYS + ['contacts_received']),
+            pd.DataFrame(columns=REASON_KEYS + ['count']),
+        )
+    return interval_metrics, cr_table
@@ -12,18 +12,35 @@ QUEUE_MAPPING = {
     "CS-chat-spa-ES-nonlive-order": "Customer Tier1",
 }
 
+# Columnas del export que usa la limpieza (el resto no se carga al leer el CSV)
+RTD_SOURCE_COLUMNS = [
+    "queue_name", "creation_timestamp_local", "Incoming Contacts", "AVG Resolution Time", "SLA FRT"
+]
+
+TIMESTAMP_FORMAT = "%B %d, %Y, %I:%M %p"
+GROUP_COLS = ["team", "date", "interval"]
+
 def split_timestamp(value: str):
     """
     Convierte un string como 'November 11, 2025, 1:00 PM' en dos valores:
     date = '2025-11-11', interval = '13:00'
     """
     try:
-        dt = datetime.strptime(value, "%B %d, %Y, %I:%M %p")
+        dt = datetime.strptime(value, TIMESTAMP_FORMAT)
         return pd.Series([dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M")])
     except Exception:
         return pd.Series([None, None])
 
-def clean_real_time_data(data: pd.DataFrame) -> pd.DataFrame:
+def split_timestamps(values: pd.Series) -> pd.DataFrame:
+    """Versión vectorizada de split_timestamp: columnas date/interval (None si no se pudo parsear)."""
+    parsed = pd.to_datetime(values, format=TIMESTAMP_FORMAT, errors="coerce")
+    return pd.DataFrame({
+        "date": parsed.dt.strftime("%Y-%m-%d").astype(object).where(parsed.notna(), None),
+        "interval": parsed.dt.strftime("%H:%M").astype(object).where(parsed.notna(), None),
+    }, index=values.index)
+
+def prepare_real_time_data(data: pd.DataFrame) -> pd.DataFrame:
+    """Filtra colas, separa fecha/intervalo y normaliza métricas (fila a fila, sin agrupar)."""
     # 1️⃣ Filtrar solo las colas relevantes
     data = data[data["queue_name"].isin(QUEUE_MAPPING.keys())].copy()
 
@@ -31,7 +48,7 @@ def clean_real_time_data(data: pd.DataFrame) -> pd.DataFrame:
     data["queue_name"] = data["queue_name"].replace(QUEUE_MAPPING)
 
     # 3️⃣ Dividir timestamp
-    data[["date", "interval"]] = data["creation_timestamp_local"].apply(split_timestamp)
+    data[["date", "interval"]] = split_timestamps(data["creation_timestamp_local"])
 
     # 4️⃣ Quitar filas sin fecha u hora
     data = data.dropna(subset=["date", "interval"])
@@ -66,29 +83,51 @@ def clean_real_time_data(data: pd.DataFrame) -> pd.DataFrame:
     if "THT" in data.columns:
         data["THT"] = pd.to_numeric(data["THT"], errors="coerce")
 
+    return data
+
+def partial_real_time_sums(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agregado parcial y sumable por grupo: total de contactos y numeradores de los
+    promedios ponderados (métrica * contactos). Sumar parciales de distintos
+    chunks da el mismo resultado que agrupar todo junto.
+    """
+    sums = data[GROUP_COLS + ["contacts_received"]].copy()
+    for col in ("SLA FRT", "THT"):
+        if col in data.columns:
+            sums[col] = data[col] * data["contacts_received"]
+    return sums.groupby(GROUP_COLS, as_index=False).sum()
+
+def finalize_real_time_data(sums: pd.DataFrame) -> pd.DataFrame:
+    """Cierra el agregado: promedios ponderados = numerador / total de contactos."""
     # ------------------------------------------
     # 🔥 6️⃣ AGRUPACIÓN final con métricas correctas
     # ------------------------------------------
-
-    # Para promedios ponderados
-    def weighted_avg(series, weights):
-        try:
-            return (series * weights).sum() / weights.sum()
-        except Exception:
-            return None
-
-    group_cols = ["team", "date", "interval"]
-
-    grouped = data.groupby(group_cols).apply(
-        lambda g: pd.Series({
-            "contacts_received": g["contacts_received"].sum(),
-            "SLA FRT": weighted_avg(g["SLA FRT"], g["contacts_received"]) if "SLA FRT" in g else None,
-            "THT": weighted_avg(g["THT"], g["contacts_received"]) if "THT" in g else None,
-        })
-    ).reset_index()
+    grouped = sums[GROUP_COLS].copy()
+    grouped["contacts_received"] = sums["contacts_received"].astype(float)
+    for col in ("SLA FRT", "THT"):
+        grouped[col] = sums[col] / sums["contacts_received"] if col in sums.columns else None
 
     # 7️⃣ Reordenar columnas
     final_cols = ["team", "date", "interval", "contacts_received", "SLA FRT", "THT"]
     grouped = grouped[[c for c in final_cols if c in grouped.columns]]
     print(grouped[grouped['team'] == 'Customer Tier1'])
     return grouped
+
+def clean_real_time_data(data: pd.DataFrame) -> pd.DataFrame:
+    return finalize_real_time_data(partial_real_time_sums(prepare_real_time_data(data)))
+
+def clean_real_time_data_chunks(chunks) -> pd.DataFrame:
+    """
+    Versión por partes de clean_real_time_data: cada chunk se reduce a sumas
+    parciales por (team, date, interval) que se acumulan; en memoria solo queda
+    un chunk y una fila por grupo.
+    """
+    sums = None
+    for chunk in chunks:
+        partial = partial_real_time_sums(prepare_real_time_data(chunk))
+        sums = partial if sums is None else (
+            pd.concat([sums, partial], ignore_index=True).groupby(GROUP_COLS, as_index=False).sum()
+        )
+    if sums is None:
+        return pd.DataFrame(columns=["team", "date", "interval", "contacts_received", "SLA FRT", "THT"])
+    return finalize_real_time_data(sums)
@@ -1,5 +1,8 @@
 import pandas as pd
 
+# Columnas del export que usa la limpieza
+SLA_SOURCE_COLUMNS = ['status', 'creation_timestamp_local', 'stakeholder', 'agent_email', 'Contact Link']
+
 def clean_sla_breached(data: pd.DataFrame):
     print("Columnas del DataFrame:", data.columns.tolist())
 
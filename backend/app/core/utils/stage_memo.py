@@ -0,0 +1,56 @@
+import time
+import pandas as pd
+from typing import Any, Callable, Dict, Tuple
+
+
+class StageMemo:
+    """
+    Memo de etapas intermedias para un solo request: si dos ramas del pipeline
+    piden la misma etapa sobre los mismos DataFrames de entrada (mismo objeto),
+    se calcula una vez y se reutiliza. La clave es el nombre de la etapa + la
+    identidad de los argumentos; el memo guarda referencias a ellos, así que
+    los ids no se reciclan mientras vive.
+
+    Cada consumidor recibe su propia copia de los DataFrames: las ramas suelen
+    modificar columnas en sitio y no deben pisarse entre sí.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._values: Dict[Tuple, Tuple[Any, Tuple]] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def get(self, stage: str, compute: Callable[..., Any], *args: Any) -> Any:
+        key = (stage, *(id(arg) for arg in args))
+        stage_stats = self.stats.setdefault(stage, {"computed": 0, "reused": 0, "seconds": 0.0})
+
+        if key in self._values:
+            stage_stats["reused"] += 1
+            value, _ = self._values[key]
+        else:
+            t0 = time.perf_counter()
+            value = compute(*args)
+            stage_stats["seconds"] += time.perf_counter() - t0
+            stage_stats["computed"] += 1
+            self._values[key] = (value, args)
+        return value.copy() if isinstance(value, pd.DataFrame) else value
+
+    def saved_seconds(self) -> float:
+        """Tiempo estimado ahorrado: lo que habrían costado los recálculos evitados."""
+        return sum(
+            s["seconds"] / s["computed"] * s["reused"]
+            for s in self.stats.values() if s["computed"]
+        )
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        for stage, s in self.stats.items():
+            origin = f"{int(s['reused'])} desde memo" if s["reused"] else "sin reutilizar"
+            print(f"♻️ [MEMO {self.name}] {stage}: calculado {int(s['computed'])}x ({s['seconds']:.3f}s) | {origin}")
+        return self.stats
+
+
+def memoized(memo: "StageMemo | None", stage: str, compute: Callable[..., Any], *args: Any) -> Any:
+    """Usa el memo si hay uno; si no, calcula directo (llamadas sueltas, scripts)."""
+    if memo is None:
+        return compute(*args)
+    return memo.get(stage, compute, *args)
@@ -0,0 +1,191 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+def normalize_match_name(name: str) -> str:
+    return name.lower().strip()
+
+
+class NameMatchIndex:
+    """
+    Índice en memoria de alias de nombres: nombre crudo normalizado → (nombre
+    canónico normalizado, score, momento en que se resolvió). Solo los nombres no
+    vistos pasan por rapidfuzz contra todo el padrón; el umbral se aplica al usar
+    el resultado, así que un alias con nombre canónico sirve para cualquier umbral.
+
+    Cada alias se valida por separado contra el padrón vigente: se conserva
+    mientras su nombre canónico siga en el padrón, y solo se vuelve a puntuar
+    contra los nombres que entraron (o volvieron) al padrón después de resolverlo.
+    Para eso el índice guarda, por nombre del padrón, desde cuándo está presente
+    sin interrupción. En un empate con un nombre nuevo gana el que aparece primero
+    en el padrón (como en argmax). El llamador pasa el padrón ordenado por nombre
+    normalizado, así ese orden no cambia entre uploads y un alias empatado con un
+    nombre ya puntuado sigue siendo el que elegiría la resolución sin índice.
+
+    Los nombres sin coincidencia que alcance el umbral (matcher por bloques) se
+    guardan como ("", umbral): "nada llega a este score", válido mientras el
+    umbral pedido no sea menor.
+
+    El nombre canónico devuelto es el valor del padrón vigente (con su formato),
+    no el normalizado que se guarda.
+
+    Cuenta aciertos/fallos desde el último `reset_stats` y guarda los alias
+    usados (`touched`) para que el servicio los persista en NameAlias. No es
+    thread-safe: cada upload carga su propia instancia.
+    """
+
+    def __init__(
+        self,
+        aliases: Iterable[Tuple[str, str, float, datetime]] = (),
+        roster: Dict[str, datetime] | None = None,
+    ):
+        # raw_name → (canonical_name, score, resolved_at)
+        self._aliases: Dict[str, Tuple[str, float, datetime]] = {
+            raw_name: (canonical_name, score, resolved_at)
+            for raw_name, canonical_name, score, resolved_at in aliases
+        }
+        # nombre normalizado del padrón → desde cuándo está presente sin interrupción
+        self._roster: Dict[str, datetime] = dict(roster or {})
+        self._clock = max(
+            [*self._roster.values(), *(entry[2] for entry in self._aliases.values())],
+            default=datetime.min,
+        )
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.rescored = 0
+        self.touched: Dict[str, Tuple[str, float, datetime]] = {}
+
+    @property
+    def alias_count(self) -> int:
+        return len(self._aliases)
+
+    @property
+    def roster(self) -> Dict[str, datetime]:
+        """Padrón vigente (nombre normalizado → desde cuándo está presente)."""
+        return dict(self._roster)
+
+    def _tick(self) -> datetime:
+        # Estrictamente creciente: dos observaciones nunca comparten marca
+        self._clock = max(datetime.now(), self._clock + timedelta(microseconds=1))
+        return self._clock
+
+    def _observe(self, ref_values: List[str]) -> Dict[str, str]:
+        """
+        Actualiza el padrón con `ref_values`: los nombres que faltan salen, los nuevos
+        entran con la marca actual. Devuelve nombre normalizado → primer valor del
+        padrón con esa forma (el que elegiría argmax).
+        """
+        current: Dict[str, str] = {}
+        for ref in ref_values:
+            current.setdefault(normalize_match_name(ref), ref)
+        removed = [name for name in self._roster if name not in current]
+        added = [name for name in current if name not in self._roster]
+        for name in removed:
+            del self._roster[name]
+        if added:
+            now = self._tick()
+            for name in added:
+                self._roster[name] = now
+        if removed:
+            # Los alias cuyo canónico salió del padrón ya no sirven
+            self._aliases = {
+                raw: entry for raw, entry in self._aliases.items()
+                if entry[0] == "" or entry[0] in self._roster
+            }
+        return current
+
+    def best_matches(
+        self,
+        target_values: List[str],
+        ref_values: List[str],
+        resolve: Callable[[List[str], List[str]], List[Tuple[Any, float]]],
+        score_cutoff: float = 0,
+    ) -> List[Tuple[Any, float]]:
+        """Igual que `resolve(target_values, ref_values)`, pero resolviendo desde el índice lo ya visto."""
+        current = self._observe(ref_values)
+        position = {name: i for i, name in enumerate(current)}
+        now = self._clock
+
+        keys = [normalize_match_name(t) for t in target_values]
+        unseen: List[str] = []
+        # resolved_at → alias a puntuar solo contra los nombres que entraron después
+        pending: Dict[datetime, List[str]] = {}
+        for key in dict.fromkeys(keys):
+            entry = self._aliases.get(key)
+            if entry is None or (entry[0] == "" and score_cutoff < entry[1]) or (
+                entry[0] != "" and entry[0] not in current
+            ):
+                unseen.append(key)
+            elif entry[2] < now:
+                pending.setdefault(entry[2], []).append(key)
+
+        unseen_set = set(unseen)
+        new_count = sum(1 for k in keys if k in unseen_set)
+        self.misses += new_count
+        self.hits += len(keys) - new_count
+
+        if unseen:
+            resolved = resolve(unseen, ref_values)
+            for key, (match, score) in zip(unseen, resolved):
+                if match is not None:
+                    self._aliases[key] = (normalize_match_name(match), score, now)
+                else:
+                    self._aliases[key] = ("", score_cutoff, now)
+
+        for resolved_at, group in pending.items():
+            added_refs = [ref for ref in ref_values if self._roster[normalize_match_name(ref)] > resolved_at]
+            if not added_refs:
+                # Solo salieron nombres (distintos del canónico): el alias sigue siendo exacto
+                for key in group:
+                    canonical, best, _ = self._aliases[key]
+                    self._aliases[key] = (canonical, best, now)
+                continue
+            self.rescored += len(group)
+            for key, (match, score) in zip(group, resolve(group, added_refs)):
+                self._aliases[key] = self._merge(self._aliases[key], match, score, score_cutoff, now, position)
+
+        results: List[Tuple[Any, float]] = []
+        for key in keys:
+            canonical, score, resolved_at = self._aliases[key]
+            self.touched[key] = (canonical, score, resolved_at)
+            results.append((current[canonical], score) if canonical != "" else (None, 0.0))
+        return results
+
+    @staticmethod
+    def _merge(
+        entry: Tuple[str, float, datetime],
+        match: Any,
+        score: float,
+        score_cutoff: float,
+        now: datetime,
+        position: Dict[str, int],
+    ) -> Tuple[str, float, datetime]:
+        """
+        Combina un alias con el mejor de los nombres nuevos del padrón (`match` es
+        None si ninguno llega a `score_cutoff`).
+        """
+        canonical, best, _ = entry
+        if canonical == "":
+            # Ningún nombre anterior llega a `best`
+            if match is None:
+                return "", score_cutoff, now
+            if score >= best:
+                return normalize_match_name(match), score, now
+            return "", best, now
+        if match is not None:
+            name = normalize_match_name(match)
+            if score > best or (score == best and position[name] < position[canonical]):
+                return name, score, now
+            return canonical, best, now
+        if score_cutoff <= best:
+            return canonical, best, now
+        # Los nuevos no llegan al umbral pero podrían superar al alias: solo se
+        # sabe que nada llega a score_cutoff
+        return "", score_cutoff, now
+
+    def hit_rate(self) -> float | None:
+        total = self.hits + self.misses
+        return self.hits / total if total else None
@@ -1,10 +1,19 @@
+import os
 import pandas as pd
 import re
 from datetime import datetime
 import pytz
 from rapidfuzz import process, fuzz
-from typing import Union
+from typing import Any, Callable, Dict, List, Tuple, Union
 import numpy as np
+from app.core.utils.workers_cx.name_match_index import NameMatchIndex, normalize_match_name
+
+# Matching difuso por bloques: en lugar de la matriz densa targets × padrón solo se
+# puntúan los candidatos que pasan el filtro de largo y q-gramas (ver blocked_best_matches)
+FUZZY_BLOCKING_ENABLED = os.getenv("FUZZY_BLOCKING_ENABLED", "1") == "1"
+# Por debajo de estas celdas (targets × padrón) la matriz densa es chica y más rápida
+FUZZY_DENSE_MAX_CELLS = int(os.getenv("FUZZY_DENSE_MAX_CELLS", "1000000"))
+_QGRAM = 3
 
 # utils.py
 
@@ -16,13 +25,195 @@ def normalize_name_sorted(name: str) -> str:
     # Unir las partes en el formato correcto (Título capitalizado)
     return " ".join(name_parts).title()
 
+def cdist_best_matches(
+    target_values: List[str],
+    ref_values: List[Any],
+    score_cutoff: float = 0,
+    scorer: Callable = fuzz.token_sort_ratio,
+    processor: Callable[[str], str] | None = None,
+) -> List[Tuple[Any, float]]:
+    """
+    Mejor valor del padrón (y su score) para cada target con la matriz densa completa.
+    Con el padrón vacío ningún target tiene coincidencia: (None, 0.0).
+    """
+    if not ref_values:
+        return [(None, 0.0)] * len(target_values)
+    prep = processor or (lambda value: value)
+    sim_matrix = process.cdist(
+        [prep(t) for t in target_values],
+        [prep(r) for r in ref_values],
+        scorer=scorer,
+        workers=-1  # usa todos los núcleos disponibles
+    )
+    best_idx = sim_matrix.argmax(axis=1)
+    return [(ref_values[j], float(sim_matrix[i, j])) for i, j in enumerate(best_idx)]
+
+
+def _sorted_tokens(value: str) -> str:
+    return " ".join(sorted(value.split()))
+
+
+def _sorted_unique_tokens(value: str) -> str:
+    return " ".join(sorted(set(value.split())))
+
+
+# Por scorer: forma de la cadena sobre la que equivale a fuzz.ratio cuando los
+# nombres no comparten tokens, y si compartir un token basta para ser candidato
+_BLOCKING_SCORERS: Dict[Callable, Tuple[Callable[[str], str], bool]] = {
+    fuzz.token_sort_ratio: (_sorted_tokens, False),
+    fuzz.token_set_ratio: (_sorted_unique_tokens, True),
+}
+
+
+def _qgram_table(values: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    q-gramas (q = 3) de todas las cadenas, vectorizado: (índice de la cadena, código
+    del q-grama, cantidad en la cadena), ordenado por código y luego por índice.
+    El código empaqueta los 3 code points (21 bits cada uno) en un uint64.
+    """
+    lens = np.fromiter((len(v) for v in values), dtype=np.int64, count=len(values))
+    chars = np.frombuffer("".join(values).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    n_grams = np.maximum(lens - _QGRAM + 1, 0)
+    owner = np.repeat(np.arange(len(values)), n_grams)
+    first_gram = np.cumsum(n_grams) - n_grams
+    pos = np.repeat(np.cumsum(lens) - lens - first_gram, n_grams) + np.arange(n_grams.sum())
+    codes = (chars[pos] << np.uint64(42)) | (chars[pos + 1] << np.uint64(21)) | chars[pos + 2]
+
+    order = np.lexsort((owner, codes))
+    owner, codes = owner[order], codes[order]
+    new = np.ones(len(codes), dtype=bool)
+    new[1:] = (codes[1:] != codes[:-1]) | (owner[1:] != owner[:-1])
+    starts = np.flatnonzero(new)
+    counts = np.diff(np.append(starts, len(codes)))
+    return owner[starts], codes[starts], counts
+
+
+def blocked_best_matches(
+    target_values: List[str],
+    ref_values: List[Any],
+    score_cutoff: float,
+    scorer: Callable = fuzz.token_sort_ratio,
+    processor: Callable[[str], str] | None = None,
+) -> List[Tuple[Any, float]]:
+    """
+    Igual que cdist_best_matches para todo target cuyo mejor score alcance
+    `score_cutoff` (mismo valor del padrón, mismo score float32, mismo desempate
+    por el primero); para el resto devuelve (None, 0.0).
+
+    Nunca arma la matriz completa. Con el umbral, el score de fuzz.ratio acota la
+    distancia Indel: d <= (a + b) * (100 - cutoff) / 100, así que solo sirven los
+    nombres del padrón con largo cercano, y como cada inserción/borrado destruye a
+    lo sumo q q-gramas, dos cadenas que pasan el umbral comparten al menos
+    max(a, b) - q + 1 - q·d q-gramas. Por target se cuentan los q-gramas
+    compartidos con listas invertidas del padrón (ordenado por largo: la ventana
+    de largos es un rango contiguo) y solo los candidatos que pasan el filtro se
+    puntúan con el scorer real. Para token_set_ratio los nombres que comparten un
+    token también son candidatos (ahí el score no sale de fuzz.ratio).
+    """
+    if scorer not in _BLOCKING_SCORERS or len(target_values) * len(ref_values) <= FUZZY_DENSE_MAX_CELLS:
+        return [
+            (match, score) if score >= score_cutoff else (None, 0.0)
+            for match, score in cdist_best_matches(target_values, ref_values, score_cutoff, scorer, processor)
+        ]
+    to_ratio_form, token_blocks = _BLOCKING_SCORERS[scorer]
+    prep = processor or (lambda value: value)
+
+    results: List[Tuple[Any, float]] = [(None, 0.0)] * len(target_values)
+    ref_pos = [j for j, r in enumerate(ref_values) if isinstance(r, str)]
+    if not ref_pos or not target_values:
+        return results
+    ref_strings = [prep(ref_values[j]) for j in ref_pos]
+    ref_forms = [to_ratio_form(r) for r in ref_strings]
+
+    # Padrón ordenado por largo; las listas invertidas usan el rango en ese orden
+    ref_lens = np.fromiter((len(f) for f in ref_forms), dtype=np.int64, count=len(ref_forms))
+    by_len = np.argsort(ref_lens, kind="stable")
+    sorted_lens = ref_lens[by_len]
+    post_owner, post_codes, post_counts = _qgram_table([ref_forms[k] for k in by_len])
+    code_start = np.flatnonzero(np.r_[True, post_codes[1:] != post_codes[:-1]])
+    uniq_codes = post_codes[code_start]
+    code_end = np.append(code_start[1:], len(post_codes))
+
+    token_postings: Dict[str, List[int]] = {}
+    if token_blocks:
+        for k, r in enumerate(ref_strings):
+            for token in set(r.split()):
+                token_postings.setdefault(token, []).append(k)
+
+    targets = [prep(t) for t in target_values]
+    forms = [to_ratio_form(t) for t in targets]
+    t_owner, t_codes, t_counts = _qgram_table(forms)
+    by_owner = np.argsort(t_owner, kind="stable")
+    t_owner, t_codes, t_counts = t_owner[by_owner], t_codes[by_owner], t_counts[by_owner]
+    t_bounds = np.searchsorted(t_owner, np.arange(len(forms) + 1))
+
+    # Margen de 1e-3 puntos: cdist redondea a float32 y el filtro debe ser un superconjunto
+    slack = (100 - score_cutoff + 1e-3) / 100
+
+    # token_sort_ratio = 100 solo si las formas ordenadas son iguales: el primero del
+    # padrón con la misma forma es el que elegiría argmax
+    exact_form: Dict[str, int] = {}
+    if not token_blocks:
+        for k, form in enumerate(ref_forms):
+            exact_form.setdefault(form, k)
+
+    for i, target in enumerate(targets):
+        if forms[i] in exact_form:
+            results[i] = (ref_values[ref_pos[exact_form[forms[i]]]], 100.0)
+            continue
+        a = len(forms[i])
+        # |a - b| <= d <= (a + b)·slack  →  ventana de largos posibles del padrón
+        if slack >= 1:
+            lo, hi = 0, len(sorted_lens)
+        else:
+            lo = np.searchsorted(sorted_lens, np.floor(a * (1 - slack) / (1 + slack)), "left")
+            hi = np.searchsorted(sorted_lens, np.ceil(a * (1 + slack) / (1 - slack)), "right")
+
+        candidates = set()
+        if hi > lo:
+            codes = t_codes[t_bounds[i]:t_bounds[i + 1]]
+            counts = t_counts[t_bounds[i]:t_bounds[i + 1]]
+            shared = np.zeros(hi - lo)
+            if len(codes):
+                idx = np.minimum(np.searchsorted(uniq_codes, codes), len(uniq_codes) - 1)
+                found = uniq_codes[idx] == codes
+                spans = [(code_start[k], code_end[k], c) for k, c in zip(idx[found], counts[found])]
+                if spans:
+                    ids = np.concatenate([post_owner[s:e] for s, e, _ in spans])
+                    weights = np.concatenate([np.minimum(post_counts[s:e], c) for s, e, c in spans])
+                    in_window = (ids >= lo) & (ids < hi)
+                    shared = np.bincount(ids[in_window] - lo, weights=weights[in_window], minlength=hi - lo)
+
+            b = sorted_lens[lo:hi]
+            max_dist = np.floor((a + b) * slack)
+            needed = np.maximum(a, b) - _QGRAM + 1 - _QGRAM * max_dist
+            passes = (shared >= needed) & (np.abs(a - b) <= max_dist)
+            candidates.update(by_len[lo + np.flatnonzero(passes)].tolist())
+
+        if token_blocks:
+            for token in set(target.split()):
+                candidates.update(token_postings.get(token, ()))
+        if not candidates:
+            continue
+
+        # Fila de cdist sobre los candidatos en orden del padrón: mismos scores
+        # (float32) y mismo desempate por argmax que la matriz densa
+        ordered = sorted(candidates)
+        scores = process.cdist([target], [ref_strings[k] for k in ordered], scorer=scorer)[0]
+        best = int(scores.argmax())
+        if scores[best] >= score_cutoff:
+            results[i] = (ref_values[ref_pos[ordered[best]]], float(scores[best]))
+    return results
+
+
 # Función para actualizar los nombres en una columna basándose en la columna 'WORKER'
 def update_column_based_on_worker(
     df_target: pd.DataFrame,
     df_reference: pd.DataFrame,
     column_to_update: str,
     reference_column: str,
-    score_threshold: int = 90
+    score_threshold: int = 90,
+    name_index: NameMatchIndex | None = None
 ) -> pd.DataFrame:
     # Extraer valores únicos válidos
     ref_values = df_reference[reference_column].dropna().unique().tolist()
@@ -31,26 +222,28 @@ def update_column_based_on_worker(
     if not ref_values or not target_values:
         return df_target  # nada que hacer
 
-    # Normalizar
-    ref_lower = [r.lower().strip() for r in ref_values]
-    tgt_lower = [t.lower().strip() for t in target_values]
+    # Padrón ordenado por nombre normalizado (estable): un empate de score se resuelve
+    # por nombre y no por el orden de las filas del archivo, igual con o sin índice
+    ref_values = sorted(ref_values, key=normalize_match_name)
 
-    # Matriz de similitudes (vectorizada y paralelizada)
-    sim_matrix = process.cdist(
-        tgt_lower, ref_lower,
-        scorer=fuzz.token_sort_ratio,
-        workers=-1  # usa todos los núcleos disponibles
-    )
+    # Mejor coincidencia por valor (token_sort_ratio sobre nombres normalizados):
+    # por bloques o con la matriz completa, y desde el índice de alias si hay uno
+    # (solo los nombres nuevos pasan por rapidfuzz)
+    matcher = blocked_best_matches if FUZZY_BLOCKING_ENABLED else cdist_best_matches
+
+    def resolve(targets: List[str], refs: List[str]) -> List[Tuple[Any, float]]:
+        return matcher(targets, refs, score_threshold, processor=normalize_match_name)
 
-    # Buscar mejor coincidencia por fila
-    best_idx = np.argmax(sim_matrix, axis=1)
-    best_scores = sim_matrix[np.arange(len(tgt_lower)), best_idx]
+    if name_index is not None:
+        best_matches = name_index.best_matches(target_values, ref_values, resolve, score_threshold)
+    else:
+        best_matches = resolve(target_values, ref_values)
 
     # Construir mapa de reemplazo (solo si supera el umbral)
     mapping = {}
-    for i, score in enumerate(best_scores):
+    for target, (match, score) in zip(target_values, best_matches):
         if score >= score_threshold:
-            mapping[target_values[i]] = ref_values[best_idx[i]]
+            mapping[target] = match
 
     # Aplicar reemplazos
     df_target[column_to_update] = df_target[column_to_update].replace(mapping)
@@ -1,6 +1,9 @@
 import pandas as pd
 from datetime import date
 
+# Columnas del reporte de conexiones que usa la limpieza
+ATTENDANCE_SOURCE_COLUMNS = ['Agent Email', 'Start Time', 'End Time', 'State']
+
 def clean_attendance(data: pd.DataFrame, target_date: pd.Timestamp | None = None) -> pd.DataFrame:
     # 1) Fecha objetivo (como date para comparar contra .dt.date)
     if target_date is None:
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 from app.core.utils.workers_cx.utils import update_column_based_on_worker
+from app.core.utils.workers_cx.name_match_index import NameMatchIndex
 from app.core.utils.workers_cx.columns_names import (
     DOCUMENT, ROLE, STATUS, CAMPAIGN, TEAM, MANAGER, SUPERVISOR, COORDINATOR,
     CONTRACT_TYPE, START_DATE, TERMINATION_DATE, WORK_TYPE, REQUIREMENT_ID,
@@ -49,7 +50,7 @@ COLUMNS_TEAM = {
     "UPDATE": UPDATE
 }
 
-def clean_people_consultation(data_active: pd.DataFrame, data_inactive: pd.DataFrame) -> pd.DataFrame:
+def clean_people_consultation(data_active: pd.DataFrame, data_inactive: pd.DataFrame, name_index: NameMatchIndex | None = None) -> pd.DataFrame:
     """Versión optimizada y estable de limpieza de trabajadores."""
     # --- 1️⃣ Unir solo DataFrames válidos (evita FutureWarning)
     frames = []
@@ -115,7 +116,7 @@ def clean_people_consultation(data_active: pd.DataFrame, data_inactive: pd.DataF
 
     # --- 8️⃣ Actualizar columnas jerárquicas con nombres reales (usa función optimizada)
     for col in [MANAGER, SUPERVISOR, COORDINATOR]:
-        data = update_column_based_on_worker(data, data, col, NAME)
+        data = update_column_based_on_worker(data, data, col, NAME, name_index=name_index)
 
     # --- 9️⃣ Mapear roles
     role_map = {
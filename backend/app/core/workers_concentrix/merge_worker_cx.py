@@ -1,9 +1,12 @@
 import pandas as pd
-from app.core.utils.workers_cx.utils import fuzzy_match
+from rapidfuzz import fuzz
+from app.core.utils.workers_cx.utils import blocked_best_matches
 from app.core.workers_concentrix.clean_people_consultation import clean_people_consultation
 from app.core.workers_concentrix.clean_scheduling_ppp import clean_scheduling_ppp
 from app.core.utils.workers_cx.utils import update_column_based_on_worker
 from app.core.utils.workers_cx.columns_names import NAME, API_EMAIL, API_ID, DOCUMENT, SUPERVISOR, REQUIREMENT_ID, TEAM
+from app.core.utils.stage_memo import StageMemo, memoized
+from app.core.utils.workers_cx.name_match_index import NameMatchIndex
 import numpy as np
 
 def merge_worker_data(df_people_consultation: pd.DataFrame,
@@ -54,14 +57,17 @@ def merge_worker_data_master(df_people_consultation: pd.DataFrame,
 def merge_by_similar_name(df1: pd.DataFrame, df2: pd.DataFrame, column1: str, column2: str, threshold=95, fallback_threshold=60):
     name_list_df2 = df2[column2].tolist()
 
-    def get_best_match(name):
-        best_match = fuzzy_match(name, name_list_df2, threshold)
-        if not best_match:
-            best_match = fuzzy_match(name, name_list_df2, fallback_threshold)
-        
-        return best_match
+    # La mejor coincidencia es la misma para ambos umbrales: basta buscarla una vez
+    # por nombre distinto con el menor de los dos (matcher por bloques, token_set_ratio)
+    names = [
+        name for name in df1[column1].dropna().unique()
+        if isinstance(name, str) and name.strip()
+    ]
+    min_threshold = min(threshold, fallback_threshold)
+    matches = blocked_best_matches(names, name_list_df2, min_threshold, scorer=fuzz.token_set_ratio)
+    best_by_name = {name: match for name, (match, _) in zip(names, matches) if match is not None}
 
-    df1["best_match"] = df1[column1].apply(get_best_match)
+    df1["best_match"] = df1[column1].map(best_by_name.get)
 
     merged_df = pd.merge(df1, df2, left_on="best_match", right_on=column2, how="left")
 
@@ -99,25 +105,33 @@ COLUMNS_MASTER = {
     'ASIGNACIÓN INTERNA' : SUPERVISOR
 }
 
+COLUMNS_API_ID = {
+    'DOCUMENT': DOCUMENT,
+    'API EMAIL': API_EMAIL,
+    'API ID': API_ID
+}
+
+def clean_api_id(api_id: pd.DataFrame) -> pd.DataFrame:
+    api_id = api_id.rename(columns=COLUMNS_API_ID)
+    return api_id[[DOCUMENT, API_EMAIL, API_ID]].copy()
+
 def generate_worker_cx_table(
     people_active: pd.DataFrame,
     people_inactive: pd.DataFrame,
     scheduling_ppp: pd.DataFrame,
     api_id: pd.DataFrame,
-    master_glovo_cx: pd.DataFrame
+    master_glovo_cx: pd.DataFrame,
+    memo: StageMemo | None = None,
+    name_index: NameMatchIndex | None = None
 ) -> pd.DataFrame:
 
-    df_people_consultation = clean_people_consultation(people_active, people_inactive)
+    # people y api_id también los usa la tabla Ubycall: con memo se limpian una sola vez
+    df_people_consultation = memoized(memo, "clean_people_consultation", clean_people_consultation, people_active, people_inactive, name_index)
     df_scheduling_ppp = clean_scheduling_ppp(scheduling_ppp)
     master_glovo_cx = master_glovo_cx.rename(columns=COLUMNS_MASTER)
     master_glovo_cx = master_glovo_cx[list(COLUMNS_MASTER.values())].copy()
 
-    api_id = api_id.rename(columns={
-        'DOCUMENT': DOCUMENT,
-        'API EMAIL': API_EMAIL,
-        'API ID': API_ID
-    })
-    api_id = api_id[[DOCUMENT, API_EMAIL, API_ID]]
+    api_id = memoized(memo, "clean_api_id", clean_api_id, api_id)
     print(df_people_consultation[SUPERVISOR])
     print(master_glovo_cx)
 
@@ -144,7 +158,8 @@ def generate_worker_cx_table(
         df_final_worker,
         df_people_consultation,
         SUPERVISOR,
-        NAME
+        NAME,
+        name_index=name_index
     )
 
     return df_final_worker
@@ -1,7 +1,8 @@
 import pandas as pd
-from datetime import datetime, timedelta, time
+from datetime import datetime
 import numpy as np
 from app.core.utils.workers_cx.columns_names import DOCUMENT, DATE, START_DATE, END_DATE, START_TIME, END_TIME, BREAK_START, BREAK_END, REST_DAY
+from app.core.workers_schedule.shift_normalization import overnight_end_dates, timedelta_to_clock_text, to_time_or_none
 
 def schedule_ppp(df: pd.DataFrame) -> pd.DataFrame:
 
@@ -52,47 +53,25 @@ def schedule_ppp(df: pd.DataFrame) -> pd.DataFrame:
             if col not in sub.columns:
                 sub[col] = None
 
-        # --- 5. Agregar start_date y end_date ---
-        # Inicializar las fechas de inicio y fin como el mismo día
+        # --- 5. Fecha del turno (end_date se calcula sobre todas las fechas juntas) ---
         sub[START_DATE] = date.date()  # solo la fecha, sin hora
-        sub[END_DATE] = date.date()  # por defecto el mismo día
 
-        # Verificamos si el fin del turno es al día siguiente
-        # Verificamos si el fin del turno es al día siguiente
-        for i, row in sub.iterrows():
-            try:
-                start_time = pd.to_timedelta(row[START_TIME])
-                end_time = pd.to_timedelta(row[END_TIME])
-            except ValueError:
-                continue  # Si hay un error en la conversión, se omite esta iteración
-
-            start_time_in_minutes = start_time.total_seconds() / 60  # Convertimos a minutos
-            end_time_in_minutes = end_time.total_seconds() / 60      # Convertimos a minutos
-
-            # Verificamos si el fin de turno es antes que el inicio (cruzó medianoche)
-            if end_time_in_minutes < start_time_in_minutes:
-                # Asignamos el día siguiente al 'end_date'
-                sub.at[i, END_DATE] = sub.at[i, END_DATE] + timedelta(days=1)
-
-        # --- 7. rest_day: True si no hay start_time o si es 'DSO' ---
-        sub[REST_DAY] = sub[START_TIME].isna()
-
-        # --- 7. Convertir horas a tipo time ---
-        for col in [START_TIME, END_TIME, BREAK_START, BREAK_END]:
-            sub[col] = sub[col].apply(lambda x: f"{x.components.hours:02}:{x.components.minutes:02}:{x.components.seconds:02}" if isinstance(x, pd.Timedelta) else x)
         # Guardamos registros de este día
-        records.append(sub[[DOCUMENT, START_DATE, END_DATE, START_TIME, END_TIME,
-                            BREAK_START, BREAK_END, REST_DAY]])
+        records.append(sub[[DOCUMENT, START_DATE, START_TIME, END_TIME, BREAK_START, BREAK_END]])
 
+    if not records:
+        raise ValueError("No se encontraron columnas de horario para ninguna fecha")
     final_df = pd.concat(records, ignore_index=True)
 
-    for col in (START_TIME, END_TIME, BREAK_START, BREAK_END):
-        final_df[col] = pd.to_datetime(final_df[col], format="%H:%M:%S", errors="coerce").dt.time
+    # --- 6. end_date: día siguiente si el turno cruza la medianoche ---
+    final_df[END_DATE] = overnight_end_dates(final_df[START_DATE], final_df[START_TIME], final_df[END_TIME])
+
+    # --- 7. rest_day: True si no hay start_time ---
+    final_df[REST_DAY] = final_df[START_TIME].isna()
 
+    # --- 8. Convertir horas a tipo time (Timedelta → "HH:MM:SS"; NaT → None) ---
     for col in (START_TIME, END_TIME, BREAK_START, BREAK_END):
-        final_df[col] = final_df[col].apply(lambda x: x if isinstance(x, time) else None)
-    # --- 10. Concatenar todo ---
-    if not records:
-        raise ValueError("No se encontraron columnas de horario para ninguna fecha")
+        final_df[col] = to_time_or_none(timedelta_to_clock_text(final_df[col]))
 
+    final_df = final_df[[DOCUMENT, START_DATE, END_DATE, START_TIME, END_TIME, BREAK_START, BREAK_END, REST_DAY]]
     return final_df
\ No newline at end of file
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+from datetime import timedelta
+from typing import Tuple
+
+# Tipos que pd.to_timedelta acepta como escalar (el resto: ValueError → celda sin hora)
+_CLOCK_KINDS = {"string", "timedelta", "integer", "floating", "mixed-integer-float", "empty"}
+_SCALAR_CLOCK_TYPES = (str, timedelta, np.timedelta64, int, float, np.integer, np.floating)
+
+
+def parse_clock(values: pd.Series) -> pd.Series:
+    """
+    Hora de inicio/fin de turno como Timedelta, columna completa. Mismo criterio que
+    `pd.to_timedelta` celda por celda: textos "HH:MM:SS", Timedelta y números; lo que
+    no se puede convertir ("DSO", "8:00", datetime.time, vacíos) queda NaT.
+    """
+    if pd.api.types.is_timedelta64_dtype(values) or (
+        pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+    ):
+        return pd.to_timedelta(values, errors="coerce")
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind in _CLOCK_KINDS:
+        return pd.to_timedelta(values.astype(object), errors="coerce")
+    # Columna mixta (ej. datetime.time junto a textos): solo se convierten los tipos válidos
+    convertible = values.map(lambda v: isinstance(v, _SCALAR_CLOCK_TYPES) and not isinstance(v, bool))
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="timedelta64[ns]")
+    if convertible.any():
+        parsed[convertible] = pd.to_timedelta(values[convertible].astype(object), errors="coerce")
+    return parsed
+
+
+def overnight_end_dates(start_dates: pd.Series, start_times: pd.Series, end_times: pd.Series) -> pd.Series:
+    """end_date = start_date, o el día siguiente si el turno cruza la medianoche (fin < inicio)."""
+    crosses_midnight = (parse_clock(end_times) < parse_clock(start_times)).to_numpy()
+    end_dates = start_dates.copy()
+    if crosses_midnight.any():
+        end_dates[crosses_midnight] = start_dates[crosses_midnight] + timedelta(days=1)
+    return end_dates
+
+
+def split_break(values: pd.Series) -> Tuple[pd.Series, pd.Series | None]:
+    """Refrigerio "HH:MM:SS - HH:MM:SS" → (inicio, fin). Sin ningún "-" en la columna, fin es None."""
+    parts = values.astype(str).str.split("-", n=1, expand=True)
+    return parts[0].str.strip(), (parts[1].str.strip() if parts.shape[1] > 1 else None)
+
+
+def timedelta_to_clock_text(values: pd.Series) -> pd.Series:
+    """Timedelta → "HH:MM:SS" (horas del día, sin los días); el resto de celdas queda igual."""
+    if pd.api.types.is_timedelta64_dtype(values):
+        components = values.dt.components
+        text = (
+            components["hours"].map("{:02.0f}".format) + ":"
+            + components["minutes"].map("{:02.0f}".format) + ":"
+            + components["seconds"].map("{:02.0f}".format)
+        )
+        return text.astype(object).where(values.notna(), values.astype(object))
+    if values.dtype != object:
+        return values
+    is_timedelta = values.map(lambda v: isinstance(v, pd.Timedelta))
+    if not is_timedelta.any():
+        return values
+    result = values.copy()
+    result[is_timedelta] = timedelta_to_clock_text(pd.to_timedelta(values[is_timedelta].astype(object))).to_numpy()
+    return result
+
+
+def to_time_or_none(values: pd.Series) -> pd.Series:
+    """Hora "HH:MM:SS" → datetime.time; lo que no es una hora válida queda None (no NaT: SQLite/Postgres)."""
+    parsed = pd.to_datetime(values, format="%H:%M:%S", errors="coerce")
+    times = parsed.dt.time.to_numpy(dtype=object)
+    times[parsed.isna().to_numpy()] = None
+    return pd.Series(times, index=values.index, name=values.name, dtype=object)
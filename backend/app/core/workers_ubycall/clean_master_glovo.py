@@ -6,6 +6,8 @@ import numpy as np
 from app.core.utils.workers_cx.columns_names import DOCUMENT, NAME, STATUS, START_DATE, SUPERVISOR, COORDINATOR, TEAM, TENURE, CHAT_CUSTOMER, CHAT_RIDER, CALL_VENDORS
 from app.core.workers_concentrix.clean_people_consultation import clean_people_consultation
 from app.core.utils.workers_cx.utils import update_column_based_on_worker
+from app.core.utils.stage_memo import StageMemo, memoized
+from app.core.utils.workers_cx.name_match_index import NameMatchIndex
 
 COLUMNS_MASTER_GLOVO = {
     "DNI": DOCUMENT,
@@ -19,39 +21,69 @@ COLUMNS_MASTER_GLOVO = {
 }
 
 
-def clean_master_glovo(data: pd.DataFrame, people_active: pd.DataFrame, people_inactive) -> pd.DataFrame:
+def _strip_title_cell(value):
+    return value.strip().title() if isinstance(value, str) else value
 
-    data_people = clean_people_consultation(people_active, people_inactive)
+
+def strip_title(values: pd.Series) -> pd.Series:
+    """
+    `x.strip().title()` en las celdas de texto (el resto queda igual), calculado una
+    vez por valor distinto: supervisores y coordinadores se repiten en miles de filas.
+    """
+    if values.dtype != object:
+        return values.apply(_strip_title_cell)
+    codes, uniques = pd.factorize(values)
+    cleaned = np.array([_strip_title_cell(v) for v in uniques], dtype=object)
+    # Las celdas vacías (código -1) conservan su valor original (None / NaN)
+    result = values.to_numpy(dtype=object, copy=True)
+    present = codes >= 0
+    result[present] = cleaned[codes[present]]
+    # Mismo dtype que inferiría el apply
+    return pd.Series(result, index=values.index, name=values.name, dtype=object).infer_objects()
+
+
+def tenure_in_months(start_dates: pd.Series, current_date: datetime) -> pd.Series:
+    """
+    Antigüedad en meses calendario desde START_DATE (vectorizado). Es 0 si empezó
+    este mes, o el mes anterior del mismo año sin haber cumplido el día. NaT → NaN.
+    """
+    if start_dates.empty:
+        return start_dates.copy()  # mismo resultado que el apply sobre una serie vacía
+    years = start_dates.dt.year
+    months = start_dates.dt.month
+    same_year = years == current_date.year
+    under_a_month = same_year & (
+        (months == current_date.month)
+        | ((current_date.month - months == 1) & (current_date.day < start_dates.dt.day))
+    )
+    tenure = ((current_date.year - years) * 12 + current_date.month - months).where(~under_a_month, 0)
+    return tenure.astype("int64") if tenure.notna().all() else tenure.astype("float64")
+
+
+def clean_master_glovo(data: pd.DataFrame, people_active: pd.DataFrame, people_inactive, memo: StageMemo | None = None, name_index: NameMatchIndex | None = None) -> pd.DataFrame:
+
+    data_people = memoized(memo, "clean_people_consultation", clean_people_consultation, people_active, people_inactive, name_index)
 
     data = data.rename(columns=COLUMNS_MASTER_GLOVO)
     # Eliminar ceros iniciales en 'DOCUMENT'
     data[DOCUMENT] = (data[DOCUMENT].astype(str).str.lstrip("0").replace({'nan': '0', '': '0'})).astype(int)
 
     # Capitalizar los nombres en 'NAME', 'SUPERVISOR', 'RESPONSABLE'
-    data[NAME] = data[NAME].apply(
-        lambda x: x.strip().title() if isinstance(x, str) else x)
-    data[SUPERVISOR] = data[SUPERVISOR].apply(
-        lambda x: x.strip().title() if isinstance(x, str) else x)
-    data[COORDINATOR] = data[COORDINATOR].apply(
-        lambda x: x.strip().title() if isinstance(x, str) else x)
+    for column in (NAME, SUPERVISOR, COORDINATOR):
+        data[column] = strip_title(data[column])
 
     # Reemplazar valores en 'TEAM'
     data[TEAM] = data[TEAM].replace(
         {'Ubycall Chat User': 'CUSTOMER TIER1', 'Ubycall Chat Glover': 'RIDER TIER1', 'Ubycall Partnercall Es': 'VENDOR CALL'})
     data = data[data[TEAM].isin(['CUSTOMER TIER1', 'RIDER TIER1', 'VENDOR CALL'])]
-    data = update_column_based_on_worker(data, data_people, SUPERVISOR, NAME)
-    data = update_column_based_on_worker(data, data_people, COORDINATOR, NAME)
+    data = update_column_based_on_worker(data, data_people, SUPERVISOR, NAME, name_index=name_index)
+    data = update_column_based_on_worker(data, data_people, COORDINATOR, NAME, name_index=name_index)
 
     data[START_DATE] = pd.to_datetime(data[START_DATE], errors='coerce')
 
     # Crear la columna 'TENURE' en meses desde la fecha de 'START_DATE'
-    current_date = datetime.now()
-    # Cálculo de TENURE con la condición de asignar 0 cuando la antigüedad es menor a un mes completo
-    data[TENURE] = data[START_DATE].apply(
-        lambda x: 0 if (current_date.year == x.year and current_date.month == x.month) or
-        (current_date.year == x.year and current_date.month - x.month == 1 and current_date.day < x.day) else
-        (current_date.year - x.year) * 12 + current_date.month - x.month
-    )
+    # (0 cuando la antigüedad es menor a un mes completo)
+    data[TENURE] = tenure_in_months(data[START_DATE], datetime.now())
     data[STATUS] = data[STATUS].str.capitalize()
     # data[api_email] = data[api_email].str.lower()
     return data[list(COLUMNS_MASTER_GLOVO.values()) + [TENURE]]
@@ -1,9 +1,8 @@
 import pandas as pd
 from datetime import datetime
-import numpy as np
 
 # Importar las variables
-from app.core.utils.workers_cx.columns_names import DOCUMENT, NAME, STATUS, START_DATE, SUPERVISOR, COORDINATOR, TEAM, TENURE, CHAT_CUSTOMER, CHAT_RIDER, CALL_VENDORS
+from app.core.utils.workers_cx.columns_names import DOCUMENT, NAME, STATUS, START_DATE, TEAM, TENURE, CHAT_CUSTOMER, CHAT_RIDER, CALL_VENDORS
 
 COLUMNS_SCHEDULING_UBYCALL = {
     "DNI": DOCUMENT,
@@ -17,13 +16,14 @@ COLUMNS_SCHEDULING_UBYCALL = {
 
 def clean_scheduling_ubycall(data: pd.DataFrame) -> pd.DataFrame:
 
-    data = data.rename(columns=COLUMNS_SCHEDULING_UBYCALL)
+    # Solo las columnas que se usan: el resto del archivo no se copia en cada paso
+    data = data[list(COLUMNS_SCHEDULING_UBYCALL)].rename(columns=COLUMNS_SCHEDULING_UBYCALL)
     # Paso 1: Limpiar la columna 'DNI' eliminando los ceros a la izquierda
     data[DOCUMENT] = (
         data[DOCUMENT]
         .astype(str)
         .str.strip()              # elimina espacios
-        .str.replace(r"\.0$", "", regex=True)  # elimina el ".0" final si existe
+        .str.removesuffix(".0")   # elimina el ".0" final si existe
         .str.lstrip("0")          # quita ceros a la izquierda
     )
     data[DOCUMENT] = pd.to_numeric(data[DOCUMENT], errors="coerce").astype("Int64")
@@ -56,8 +56,6 @@ def clean_scheduling_ubycall(data: pd.DataFrame) -> pd.DataFrame:
     #     (current_date.year - x.year) * 12 + current_date.month - x.month
     # )
 
-    data[SUPERVISOR] = np.nan
-    data[COORDINATOR] = np.nan
     #data[STATUS] = data[STATUS].str.capitalize()
 
     return data[[DOCUMENT, NAME, TEAM]]
@@ -1,21 +1,23 @@
 from app.core.workers_ubycall.clean_master_glovo import clean_master_glovo
 from app.core.workers_ubycall.clean_scheduling_ubycall import clean_scheduling_ubycall
-from app.core.utils.workers_cx.columns_names import NAME, DOCUMENT, MANAGER, CAMPAIGN, ROLE, WORK_TYPE, CONTRACT_TYPE, TERMINATION_DATE, REQUIREMENT_ID, TRAINEE, OBSERVATION_1, OBSERVATION_2, API_EMAIL, API_ID, API_NAME, PRODUCTIVE
+from app.core.utils.workers_cx.columns_names import NAME, DOCUMENT, MANAGER, CAMPAIGN, ROLE, WORK_TYPE, CONTRACT_TYPE, TERMINATION_DATE, REQUIREMENT_ID, TRAINEE, OBSERVATION_1, OBSERVATION_2, API_NAME, PRODUCTIVE
 import pandas as pd
 import numpy as np
-from app.core.workers_concentrix.merge_worker_cx import merge_by_similar_name
+from app.core.workers_concentrix.merge_worker_cx import merge_by_similar_name, clean_api_id
+from app.core.utils.stage_memo import StageMemo, memoized
+from app.core.utils.workers_cx.name_match_index import NameMatchIndex
 
-def generate_worker_uby_table(master_glovo: pd.DataFrame, scheduling_ubycall: pd.DataFrame, api_id: pd.DataFrame, people_active: pd.DataFrame, people_inactive: pd.DataFrame) -> pd.DataFrame:
+def generate_worker_uby_table(master_glovo: pd.DataFrame, scheduling_ubycall: pd.DataFrame, api_id: pd.DataFrame, people_active: pd.DataFrame, people_inactive: pd.DataFrame, memo: StageMemo | None = None, name_index: NameMatchIndex | None = None) -> pd.DataFrame:
     # Concatenar ambos DataFrames
-    master_glovo = clean_master_glovo(master_glovo, people_active, people_inactive)
+    master_glovo = clean_master_glovo(master_glovo, people_active, people_inactive, memo, name_index)
     scheduling_ubycall = clean_scheduling_ubycall(scheduling_ubycall)
     
-    api_id = api_id.rename(columns={
-        'DOCUMENT': DOCUMENT,
-        'API EMAIL': API_EMAIL,
-        'API ID': API_ID
-    })
-    api_id = api_id[[DOCUMENT, API_EMAIL, API_ID]]
+    api_id = memoized(memo, "clean_api_id", clean_api_id, api_id)
+    # El documento de api_id se lee como texto; la llave de Ubycall es numérica (Int64)
+    api_id[DOCUMENT] = pd.to_numeric(
+        api_id[DOCUMENT].astype(str).str.strip().str.removesuffix(".0"),
+        errors="coerce"
+    ).astype("Int64")
     combined_data = pd.concat([master_glovo, scheduling_ubycall])
     
     # Eliminar duplicados basados en 'DOCUMENT', manteniendo solo el primer registro
@@ -1,11 +1,13 @@
 from sqlmodel import Session, select
-from typing import List, Dict
+from typing import Any, Iterator, Dict
 import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import insert
 from app.models.contacts_with_ccr import (
     ContactsReceived,
     ContactsReceivedReason
 )
+from app.schemas.contacts_with_ccr import ContactsReceivedRead, ContactsReceivedReasonRead
+from app.utils.fast_json import iter_rows, schema_columns, streaming
 
 def upsert_contacts_with_ccr(
     session: Session,
@@ -108,3 +110,37 @@ def get_all_contacts_with_ccr(session: Session):
     stmt = select(ContactsReceived)
     results = session.exec(stmt).all()
     return results
+
+def get_all_contacts_with_ccr_rows(session: Session) -> Iterator[Dict[str, Any]]:
+    """
+    Todos los registros con sus motivos como filas planas (campos de
+    ContactsReceivedRead), en streaming: dos SELECT ordenados por el id del
+    registro y cruzados como merge join, sin un lazy load por registro ni todos
+    los motivos en memoria.
+    """
+    received_columns = [ContactsReceived.id] + schema_columns(
+        ContactsReceivedRead, ContactsReceived, {"contact_reasons": sa.null()}
+    )
+    reason_columns = [ContactsReceivedReason.contacts_received_id] + schema_columns(
+        ContactsReceivedReasonRead, ContactsReceivedReason
+    )
+
+    def merge(own_session: Session) -> Iterator[Dict[str, Any]]:
+        reasons = iter_rows(
+            own_session, reason_columns,
+            ContactsReceivedReason.contacts_received_id.is_not(None),
+            order_by=[ContactsReceivedReason.contacts_received_id, ContactsReceivedReason.id],
+        )
+        reason = next(reasons, None)
+        for row in iter_rows(own_session, received_columns, order_by=[ContactsReceived.id]):
+            received_id = row.pop("id")
+            while reason is not None and reason["contacts_received_id"] < received_id:
+                reason = next(reasons, None)
+            row["contact_reasons"] = []
+            while reason is not None and reason["contacts_received_id"] == received_id:
+                reason.pop("contacts_received_id")
+                row["contact_reasons"].append(reason)
+                reason = next(reasons, None)
+            yield row
+
+    return streaming(session, merge)
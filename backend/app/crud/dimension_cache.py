@@ -0,0 +1,126 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from pydantic import TypeAdapter
+from sqlmodel import Session, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database.database import engine
+from app.models.worker import Role, Status, Campaign, Team, WorkType, ContractType
+from app.schemas.worker import DIMENSION_NAMES_CONTEXT
+
+# Dimensiones de Worker: nombre de la relación (y prefijo de la FK <dim>_id) → modelo
+DIMENSION_MODELS = {
+    "role": Role,
+    "status": Status,
+    "campaign": Campaign,
+    "team": Team,
+    "work_type": WorkType,
+    "contract_type": ContractType,
+}
+
+
+class DimensionCache:
+    """
+    Caché de proceso de las tablas de dimensión (unas decenas de filas que casi no
+    cambian): nombre ↔ id en memoria, compartida por el upload de workers y el
+    serializador de WorkerRead.
+
+    Una dimensión se recarga entera solo cuando el upload trae nombres que no
+    conoce (después de insertarlos) o cuando el serializador encuentra un id
+    desconocido (lo creó otro proceso). Los dicts se reemplazan, no se mutan:
+    las lecturas no necesitan lock.
+    """
+
+    def __init__(self, models: Dict[str, type]):
+        self._models = dict(models)
+        self._dimension_by_model = {model: dim for dim, model in models.items()}
+        self._ids: Dict[str, Dict[str, int]] = {}
+        self._names: Dict[str, Dict[int, str]] = {}
+        self._lock = threading.Lock()
+        self.refreshes = 0
+
+    def _load(self, session: Session, dimension: str) -> None:
+        rows = session.exec(select(self._models[dimension])).all()
+        ids = {r.name: r.id for r in rows}
+        with self._lock:
+            self._ids[dimension] = ids
+            self._names[dimension] = {i: name for name, i in ids.items()}
+            self.refreshes += 1
+
+    def refresh(self, dimensions: Iterable[str] | None = None, session: Session | None = None) -> None:
+        """Recarga las dimensiones pedidas (todas por defecto), con la sesión dada o una propia."""
+        dims: List[str] = list(dimensions) if dimensions is not None else list(self._models)
+        if session is not None:
+            for dim in dims:
+                self._load(session, dim)
+            return
+        with Session(engine) as own_session:
+            for dim in dims:
+                self._load(own_session, dim)
+
+    def ensure_loaded(self, session: Session | None = None) -> None:
+        missing = [dim for dim in self._models if dim not in self._ids]
+        if missing:
+            self.refresh(missing, session)
+
+    def ids(self, dimension: str, session: Session | None = None) -> Dict[str, int]:
+        if dimension not in self._ids:
+            self.refresh([dimension], session)
+        return self._ids[dimension]
+
+    def name(self, dimension: str, dimension_id: Optional[int]) -> Optional[str]:
+        if dimension_id is None:
+            return None
+        names = self._names.get(dimension)
+        if names is None or dimension_id not in names:
+            self.refresh([dimension])
+            names = self._names[dimension]
+        return names.get(dimension_id)
+
+    def names_for(self, session: Session, rows: Sequence[Any]) -> Dict[str, Dict[int, str]]:
+        """
+        Mapas id → nombre de cada dimensión que cubren los <dim>_id de `rows`; las
+        dimensiones con ids desconocidos (creados por otro proceso) se recargan con
+        `session`.
+        """
+        self.ensure_loaded(session)
+        stale = [
+            dim for dim in self._models
+            if any(
+                (dimension_id := getattr(row, f"{dim}_id")) is not None and dimension_id not in self._names[dim]
+                for row in rows
+            )
+        ]
+        if stale:
+            self.refresh(stale, session)
+        return {dim: self._names[dim] for dim in self._models}
+
+    def upsert(self, session: Session, model: type, values: Iterable[str]) -> Dict[str, int]:
+        """
+        Mapa nombre → id de la dimensión con todos los `values` presentes. Solo va a
+        la BD si hay nombres nuevos: los inserta (ON CONFLICT DO NOTHING) y recarga
+        esa dimensión.
+        """
+        dimension = self._dimension_by_model[model]
+        known = self.ids(dimension, session)
+        unique_values = {v.strip() for v in values if v and isinstance(v, str)}
+        missing = unique_values - known.keys()
+        if not missing:
+            return known
+
+        stmt = insert(model).values([{"name": v} for v in sorted(missing)])
+        stmt = stmt.on_conflict_do_nothing(index_elements=["name"])
+        session.execute(stmt)
+        session.commit()
+        self.refresh([dimension], session)
+        print(f"🗂️ [DIM-CACHE] {dimension}: {len(missing)} nombre(s) nuevo(s), dimensión recargada")
+        return self._ids[dimension]
+
+
+dimension_cache = DimensionCache(DIMENSION_MODELS)
+
+
+def validate_with_dimensions(session: Session, adapter: TypeAdapter, rows: Sequence[Any]) -> Any:
+    """Valida objetos ORM (Worker, WorkerHistory) con `adapter`, con role/status/... desde la caché."""
+    context = {DIMENSION_NAMES_CONTEXT: dimension_cache.names_for(session, rows)}
+    return adapter.validate_python(rows, from_attributes=True, context=context)
@@ -0,0 +1,72 @@
+from typing import Dict, List, Tuple
+from datetime import datetime
+from sqlmodel import Session, select, delete
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.name_alias import NameAlias, NameRosterEntry
+
+# Llave del advisory lock que serializa los guardados del índice entre procesos
+NAME_ALIAS_LOCK_KEY = 7243101
+
+
+def load_name_aliases(session: Session) -> List[Tuple[str, str, float, datetime]]:
+    """Alias persistidos como (raw_name, canonical_name, score, resolved_at)."""
+    rows = session.exec(select(NameAlias)).all()
+    return [(a.raw_name, a.canonical_name, a.score, a.resolved_at) for a in rows]
+
+
+def load_name_roster(session: Session) -> Dict[str, datetime]:
+    """Padrón persistido: nombre normalizado → desde cuándo está presente."""
+    return {r.name: r.added_at for r in session.exec(select(NameRosterEntry)).all()}
+
+
+def save_name_aliases(
+    session: Session,
+    aliases: Dict[str, Tuple[str, float, datetime]],
+    roster: Dict[str, datetime],
+) -> int:
+    """
+    Reemplaza el padrón guardado por el vigente, inserta/actualiza los alias usados
+    en el upload (last_seen = ahora) y borra los alias cuyo nombre canónico ya no
+    está en el padrón. Los uploads de distintos procesos guardan de a uno (advisory
+    lock de la transacción), así el padrón guardado es siempre el de un solo upload.
+    """
+    now = datetime.now()
+    alias_rows = [
+        {
+            "raw_name": raw_name[:255],
+            "canonical_name": canonical_name[:255],
+            "score": score,
+            "resolved_at": resolved_at,
+            "last_seen": now,
+        }
+        for raw_name, (canonical_name, score, resolved_at) in aliases.items()
+    ]
+    roster_rows = [{"name": name[:255], "added_at": added_at} for name, added_at in roster.items()]
+
+    session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": NAME_ALIAS_LOCK_KEY})
+    session.exec(delete(NameRosterEntry))
+    if roster_rows:
+        stmt = insert(NameRosterEntry).values(roster_rows)
+        session.execute(stmt.on_conflict_do_nothing(index_elements=["name"]))
+    if alias_rows:
+        stmt = insert(NameAlias).values(alias_rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["raw_name"],
+            set_={
+                "canonical_name": stmt.excluded.canonical_name,
+                "score": stmt.excluded.score,
+                "resolved_at": stmt.excluded.resolved_at,
+                "last_seen": stmt.excluded.last_seen,
+            },
+        )
+        session.execute(stmt)
+    session.exec(
+        delete(NameAlias).where(
+            NameAlias.canonical_name != "",
+            NameAlias.canonical_name.not_in(select(NameRosterEntry.name)),
+        )
+    )
+    session.commit()
+    return len(alias_rows)
@@ -1,9 +1,10 @@
 # app/crud/real_data_view.py
-from typing import Dict, Tuple, List
+from typing import Any, Dict, Iterator, Tuple, List
 from datetime import date
 from sqlmodel import Session, select
 
 from app.models.operational_view import OperationalView
+from app.utils.fast_json import schema_columns, select_rows
 
 Key = Tuple[str, date, str]
 
@@ -29,3 +30,7 @@ def get_all_views(session: Session) -> List[OperationalView]:
     """Lee todos los registros de OperationalView."""
     stmt = select(OperationalView)
     return session.exec(stmt).all()
+
+def get_all_views_rows(session: Session) -> Iterator[Dict[str, Any]]:
+    """Todos los registros de OperationalView como filas planas (todas las columnas), leídas en streaming."""
+    return select_rows(session, schema_columns(OperationalView, OperationalView))
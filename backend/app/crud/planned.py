@@ -1,9 +1,11 @@
 # app/crud/planned.py
-from typing import Dict, Tuple, List
+from typing import Any, Dict, Iterator, Tuple, List
 from datetime import date
 from sqlmodel import Session, select
 
 from app.models.planned import Planned
+from app.schemas.planned import PlannedRead
+from app.utils.fast_json import schema_columns, select_rows
 
 Key = Tuple[str, date, str]
 
@@ -29,3 +31,7 @@ def get_all_planned(session: Session) -> List[Planned]:
     """Lee todos los registros de Planned."""
     stmt = select(Planned)
     return session.exec(stmt).all()
+
+def get_all_planned_rows(session: Session) -> Iterator[Dict[str, Any]]:
+    """Todos los registros de Planned como filas planas con los campos de PlannedRead, leídas en streaming."""
+    return select_rows(session, schema_columns(PlannedRead, Planned))
@@ -1,9 +1,12 @@
 # app/crud/planned.py
-from typing import Dict, Tuple, List
+from typing import Any, Dict, Iterator, Tuple, List
 from datetime import date
 from sqlmodel import Session, select
+from sqlalchemy import func
 
 from app.models.real_time_data import RealTimeData
+from app.schemas.real_time_data import RealTimeDataRead
+from app.utils.fast_json import schema_columns, select_rows
 
 Key = Tuple[str, date, str]
 
@@ -29,3 +32,8 @@ def get_all_real_time_data(session: Session) -> List[RealTimeData]:
     """Lee todos los registros."""
     stmt = select(RealTimeData)
     return session.exec(stmt).all()
+
+def get_all_real_time_data_rows(session: Session) -> Iterator[Dict[str, Any]]:
+    """Todos los registros como filas planas con los campos de RealTimeDataRead (tht NULL → 0.0), leídas en streaming."""
+    columns = schema_columns(RealTimeDataRead, RealTimeData, {"tht": func.coalesce(RealTimeData.tht, 0.0)})
+    return select_rows(session, columns)
@@ -0,0 +1,146 @@
+from datetime import date
+from typing import Dict, List
+from sqlmodel import Session
+from sqlalchemy import text
+import io
+import time
+
+from app.models.worker import Schedule, UbycallSchedule
+from app.crud.worker import _copy_value
+
+# Columnas que llegan en cada registro (todas menos id), en el orden de la tabla
+SCHEDULE_COLUMNS = [c.name for c in Schedule.__table__.columns if c.name != "id"]
+UBYCALL_SCHEDULE_COLUMNS = [c.name for c in UbycallSchedule.__table__.columns if c.name != "id"]
+# Campos que una nueva carga actualiza en un horario existente (end_date se conserva, como antes)
+SCHEDULE_UPDATE_COLUMNS = ["start_time", "end_time", "break_start", "break_end", "is_rest_day", "obs"]
+# Llave natural de un turno Ubycall (índice único ux_ubycallschedule_natural_key)
+UBYCALL_SCHEDULE_KEY = ["worker_document", "date", "start_time", "end_time"]
+
+
+def _copy_to_staging(session: Session, staging: str, table: str, columns: List[str], records: List[Dict]) -> None:
+    """Tabla temporal `staging` (mismos tipos que `table`, sin restricciones, se borra al commit) cargada con COPY."""
+    column_list = ", ".join(columns)
+    buffer = io.StringIO()
+    for ordinal, record in enumerate(records):
+        fields = [_copy_value(col, record.get(col)) for col in columns]
+        buffer.write("\t".join([str(ordinal), *fields]) + "\n")
+    buffer.seek(0)
+
+    session.execute(text(
+        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+        f"SELECT 0 AS ordinal, {column_list} FROM {table} WITH NO DATA"
+    ))
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {staging} (ordinal, {column_list}) FROM STDIN WITH (FORMAT text, NULL '\\N')",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def _week_start_sql(column: str) -> str:
+    """Lunes (ISO) de la semana de `column`, como date."""
+    return f"({column} - (extract(isodow FROM {column})::int - 1))"
+
+
+def bulk_upsert_schedules(
+    session: Session, records: List[Dict], start_date: date, end_date: date
+) -> Dict[date, Dict[str, int]]:
+    """
+    Horarios Concentrix/PPP de las semanas `start_date`..`end_date` por conjuntos:
+    1. COPY de los registros a una tabla temporal de staging.
+    2. Un solo INSERT ... ON CONFLICT (worker_document, start_date) DO UPDATE limitado
+       a esas fechas, que solo toca las filas con algún campo distinto
+       (IS DISTINCT FROM). No se lee la tabla schedule en Python.
+    Si un (documento, fecha) viene repetido gana la última aparición. No hace commit.
+
+    Devuelve, por lunes de cada semana con registros, {"inserted", "updated", "unchanged"}.
+    """
+    if not records:
+        return {}
+
+    t0 = time.perf_counter()
+    _copy_to_staging(session, "schedule_staging", "schedule", SCHEDULE_COLUMNS, records)
+    t_copy = time.perf_counter()
+
+    columns = ", ".join(SCHEDULE_COLUMNS)
+    assignments = ", ".join(f"{c} = EXCLUDED.{c}" for c in SCHEDULE_UPDATE_COLUMNS)
+    current = ", ".join(f"schedule.{c}" for c in SCHEDULE_UPDATE_COLUMNS)
+    incoming = ", ".join(f"EXCLUDED.{c}" for c in SCHEDULE_UPDATE_COLUMNS)
+    monday = _week_start_sql("start_date")
+    # schedule está particionada (sin xmax en el RETURNING): los que ya existían se cuentan
+    # en la misma sentencia, que ve la tabla como estaba antes del upsert
+    rows = session.execute(
+        text(
+            f"WITH incoming AS ("
+            f"SELECT DISTINCT ON (worker_document, start_date) * FROM schedule_staging "
+            f"WHERE start_date BETWEEN :start_date AND :end_date "
+            f"ORDER BY worker_document, start_date, ordinal DESC"
+            f"), upserted AS ("
+            f"INSERT INTO schedule ({columns}) SELECT {columns} FROM incoming "
+            f"ON CONFLICT (worker_document, start_date) DO UPDATE SET {assignments} "
+            f"WHERE ({current}) IS DISTINCT FROM ({incoming}) "
+            f"RETURNING start_date"
+            f"), staged AS ("
+            f"SELECT {monday} AS monday, count(*) AS n FROM incoming GROUP BY 1"
+            f"), existing AS ("
+            f"SELECT {monday} AS monday, count(*) AS n FROM incoming "
+            f"JOIN schedule USING (worker_document, start_date) GROUP BY 1"
+            f"), changed AS ("
+            f"SELECT {monday} AS monday, count(*) AS n FROM upserted GROUP BY 1"
+            f") SELECT staged.monday, staged.n, coalesce(existing.n, 0), coalesce(changed.n, 0) "
+            f"FROM staged LEFT JOIN existing USING (monday) LEFT JOIN changed USING (monday) "
+            f"ORDER BY staged.monday"
+        ),
+        {"start_date": start_date, "end_date": end_date},
+    ).all()
+
+    counts = {}
+    for week_monday, staged, existing, changed in rows:
+        inserted = staged - existing
+        counts[week_monday] = {"inserted": inserted, "updated": changed - inserted, "unchanged": staged - changed}
+
+    print(
+        f"✅ Schedules: insertados={sum(c['inserted'] for c in counts.values())} | "
+        f"actualizados={sum(c['updated'] for c in counts.values())} | "
+        f"sin cambios={sum(c['unchanged'] for c in counts.values())} | semanas={len(counts)} | "
+        f"COPY {t_copy - t0:.3f}s | upsert {time.perf_counter() - t_copy:.3f}s"
+    )
+    return counts
+
+
+def bulk_insert_ubycall_schedules(session: Session, records: List[Dict]) -> Dict[date, int]:
+    """
+    Turnos Ubycall por conjuntos: COPY a staging y un solo INSERT ... ON CONFLICT DO
+    NOTHING sobre la llave natural (documento, fecha, inicio, fin); los turnos que ya
+    existen se omiten sin leer la tabla. No hace commit. Devuelve los insertados por
+    lunes de cada semana.
+    """
+    if not records:
+        return {}
+
+    t0 = time.perf_counter()
+    _copy_to_staging(session, "ubycall_schedule_staging", "ubycallschedule", UBYCALL_SCHEDULE_COLUMNS, records)
+    t_copy = time.perf_counter()
+
+    columns = ", ".join(UBYCALL_SCHEDULE_COLUMNS)
+    key = ", ".join(UBYCALL_SCHEDULE_KEY)
+    rows = session.execute(text(
+        f"WITH inserted AS ("
+        f"INSERT INTO ubycallschedule ({columns}) "
+        f"SELECT {columns} FROM ("
+        f"SELECT DISTINCT ON ({key}) * FROM ubycall_schedule_staging ORDER BY {key}, ordinal"
+        f") s "
+        f"ON CONFLICT DO NOTHING RETURNING date"
+        f") SELECT {_week_start_sql('date')} AS monday, count(*) FROM inserted GROUP BY 1 ORDER BY 1"
+    )).all()
+    counts = {week_monday: inserted for week_monday, inserted in rows}
+
+    inserted = sum(counts.values())
+    print(
+        f"✅ Ubycall: insertados={inserted} | omitidos={len(records) - inserted} | "
+        f"COPY {t_copy - t0:.3f}s | insert {time.perf_counter() - t_copy:.3f}s"
+    )
+    return counts
@@ -1,8 +1,11 @@
-from typing import Dict, Tuple, List
+from typing import Any, Dict, Iterator, Tuple, List
 from datetime import date
 from sqlmodel import Session, select
+from sqlalchemy import func
 
 from app.models.sla_breached import SlaBreached
+from app.schemas.sla_breached import SlaBreachedRead
+from app.utils.fast_json import schema_columns, select_rows
 
 Key = Tuple[str, date, str, str]  # (team, date, interval, api_email)
 
@@ -28,3 +31,8 @@ def get_all_sla_breached_data(session: Session) -> List[SlaBreached]:
     """Lee todos los registros de sla_breached_data."""
     stmt = select(SlaBreached)
     return session.exec(stmt).all()
+
+def get_all_sla_breached_rows(session: Session) -> Iterator[Dict[str, Any]]:
+    """Todos los registros como filas planas con los campos de SlaBreachedRead (chat_breached NULL → 0), leídas en streaming."""
+    columns = schema_columns(SlaBreachedRead, SlaBreached, {"chat_breached": func.coalesce(SlaBreached.chat_breached, 0)})
+    return select_rows(session, columns)
@@ -0,0 +1,23 @@
+from datetime import datetime
+from sqlmodel import Session, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.snapshot_version import SnapshotVersion
+
+
+def get_snapshot_version(session: Session, name: str) -> int:
+    """Versión vigente del snapshot `name` (0 si nunca se subió)."""
+    version = session.exec(select(SnapshotVersion.version).where(SnapshotVersion.name == name)).first()
+    return version or 0
+
+
+def bump_snapshot_version(session: Session, name: str) -> int:
+    """Sube la versión del snapshot `name` en una sola sentencia y la devuelve."""
+    stmt = insert(SnapshotVersion).values(name=name, version=1, updated_at=datetime.now())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"version": SnapshotVersion.version + 1, "updated_at": stmt.excluded.updated_at},
+    ).returning(SnapshotVersion.version)
+    version = session.execute(stmt).scalar_one()
+    session.commit()
+    return version
@@ -1,26 +1,19 @@
 from typing import Dict, List, Optional
 from sqlmodel import Session, select
-from sqlalchemy.dialects.postgresql import insert
-import math
-from collections import Counter
+from sqlalchemy import Integer, text
+from datetime import date, datetime
+import io
 import time
 
-from app.models.worker import Role, Status, Campaign, Team, WorkType, ContractType, Worker
+from app.models.worker import Worker
+from app.crud.dimension_cache import dimension_cache
 
 def upsert_lookup_table(session: Session, Model, values: List[str]) -> Dict[str, int]:
-    unique_values = {v.strip() for v in values if v and isinstance(v, str)}
-    if not unique_values:
-        return {}
-
-    # Inserta los valores (si ya existen, ignora)
-    stmt = insert(Model).values([{"name": v} for v in unique_values])
-    stmt = stmt.on_conflict_do_nothing(index_elements=["name"])
-    session.execute(stmt)
-    session.commit()
-
-    # Retorna el mapeo actualizado
-    all_records = session.exec(select(Model)).all()
-    return {r.name: r.id for r in all_records}
+    """
+    Mapa nombre → id de la tabla de dimensión con los `values` insertados si faltaban.
+    Se resuelve desde la caché de dimensiones: solo hay INSERT/recarga si hay nombres nuevos.
+    """
+    return dimension_cache.upsert(session, Model, values)
 
 
 def upsert_worker(session: Session, data: dict) -> Worker:
@@ -43,57 +36,126 @@ def upsert_worker(session: Session, data: dict) -> Worker:
 
     return worker
 
-def bulk_upsert_workers(session: Session, workers_data: List[Dict]) -> int:
+# Columnas que llegan en cada registro de worker (todas menos id y row_hash), en el orden de la tabla
+WORKER_COLUMNS = [c.name for c in Worker.__table__.columns if c.name not in ("id", "row_hash")]
+# Campos de negocio que entran al row_hash (mismo orden que la migración que lo rellenó)
+WORKER_HASH_COLUMNS = [c for c in WORKER_COLUMNS if c != "document"]
+_INTEGER_COLUMNS = {
+    c.name for c in Worker.__table__.columns
+    if c.name != "id" and isinstance(c.type, Integer)
+}
+
+
+def _copy_value(column: str, value) -> str:
+    """Valor en formato texto de COPY (\\N = NULL; escapa \\, tab y saltos de línea)."""
+    if value is None:
+        return "\\N"
+    if column in _INTEGER_COLUMNS and isinstance(value, float):
+        value = int(value)
+    elif isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def worker_hash_sql(alias: str) -> str:
+    """md5 del ROW(...)::text de los campos de negocio (NULL y '' quedan distintos)."""
+    return f"md5(ROW({', '.join(f'{alias}.{c}' for c in WORKER_HASH_COLUMNS)})::text)"
+
+
+def bulk_upsert_workers(session: Session, workers_data: List[Dict]) -> Dict[str, int]:
     """
-    Inserta o actualiza múltiples Workers.
-    Optimizado para evitar consultas repetidas.
-    Solo actualiza si hay cambios reales.
+    Inserta o actualiza múltiples Workers en SQL, por conjuntos:
+    1. COPY de los registros entrantes a una tabla temporal de staging.
+    2. Un solo INSERT ... ON CONFLICT (document) DO UPDATE que solo toca las filas
+       cuyo row_hash cambió, sin leer la tabla en Python.
+    3. Historia (SCD2): cierra la versión abierta de cada worker insertado o
+       actualizado y abre una nueva en worker_history con la misma marca de tiempo.
+    Si un documento viene repetido gana la última aparición.
+
+    Devuelve {"inserted", "updated", "unchanged"} contado desde el RETURNING.
     """
-
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
     if not workers_data:
-        return 0
-
-    total_processed = 0
-
-    # 1. Obtener TODOS los workers existentes en un dict {document: Worker}
-    existing_workers = {
-        w.document: w
-        for w in session.exec(select(Worker)).all()
-    }
-
-    workers_to_insert = []
-
-    # 2. Recorrer cada worker entrante y decidir si actualizar o insertar
-    for worker in workers_data:
-        doc = worker["document"]
-
-        if doc in existing_workers:
-            # --- UPDATE ---
-            existing_worker = existing_workers[doc]
-            is_updated = False
-
-            for key, value in worker.items():
-                if hasattr(existing_worker, key):
-                    if getattr(existing_worker, key) != value:
-                        setattr(existing_worker, key, value)
-                        is_updated = True
-
-            if is_updated:
-                total_processed += 1
-
-        else:
-            # --- INSERT ---
-            workers_to_insert.append(worker)
-
-    # 3. Insertar todos los nuevos workers (si existen)
-    if workers_to_insert:
-        workers_objects = [Worker(**w) for w in workers_to_insert]
-        session.bulk_save_objects(workers_objects)
-        total_processed += len(workers_to_insert)
-
-    # 4. Guardar cambios
+        return counts
+
+    t0 = time.perf_counter()
+    columns = ", ".join(WORKER_COLUMNS)
+
+    buffer = io.StringIO()
+    for ordinal, worker in enumerate(workers_data):
+        fields = [_copy_value(col, worker.get(col)) for col in WORKER_COLUMNS]
+        buffer.write("\t".join([str(ordinal), *fields]) + "\n")
+    buffer.seek(0)
+
+    # Staging con los mismos tipos que worker pero sin restricciones; se borra al commit
+    session.execute(text(
+        f"CREATE TEMP TABLE worker_staging ON COMMIT DROP AS "
+        f"SELECT 0 AS ordinal, {columns} FROM worker WITH NO DATA"
+    ))
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY worker_staging (ordinal, {columns}) FROM STDIN WITH (FORMAT text, NULL '\\N')",
+            buffer,
+        )
+    finally:
+        cursor.close()
+    t_copy = time.perf_counter()
+
+    # Lo que cambió (insertado o actualizado) se guarda en otra temporal para abrir su versión
+    versioned = ["document", *WORKER_HASH_COLUMNS, "row_hash"]
+    history_columns = ", ".join(versioned)
+    assignments = ", ".join(f"{c} = EXCLUDED.{c}" for c in [*WORKER_HASH_COLUMNS, "row_hash"])
+    session.execute(text(
+        f"CREATE TEMP TABLE worker_changes ON COMMIT DROP AS "
+        f"SELECT {history_columns}, true AS inserted FROM worker WITH NO DATA"
+    ))
+    session.execute(text(
+        f"WITH upserted AS ("
+        f"INSERT INTO worker ({columns}, row_hash) "
+        f"SELECT {columns}, {worker_hash_sql('s')} FROM ("
+        f"SELECT DISTINCT ON (document) * FROM worker_staging ORDER BY document, ordinal DESC"
+        f") s "
+        f"ON CONFLICT (document) DO UPDATE SET {assignments} "
+        f"WHERE worker.row_hash IS DISTINCT FROM EXCLUDED.row_hash "
+        f"RETURNING {', '.join(f'worker.{c}' for c in versioned)}, (xmax = 0) AS inserted"
+        f") INSERT INTO worker_changes SELECT * FROM upserted"
+    ))
+
+    valid_from = datetime.now()
+    session.execute(
+        text(
+            "UPDATE worker_history h SET valid_to = :valid_from FROM worker_changes c "
+            "WHERE h.document = c.document AND h.valid_to IS NULL"
+        ),
+        {"valid_from": valid_from},
+    )
+    session.execute(
+        text(
+            f"INSERT INTO worker_history ({history_columns}, valid_from) "
+            f"SELECT {history_columns}, :valid_from FROM worker_changes"
+        ),
+        {"valid_from": valid_from},
+    )
+
+    inserted, changed = session.execute(text(
+        "SELECT count(*) FILTER (WHERE inserted), count(*) FROM worker_changes"
+    )).one()
+    staged = session.execute(text("SELECT count(DISTINCT document) FROM worker_staging")).scalar_one()
     session.commit()
 
-    print(f"✅ Total registros procesados: {total_processed}")
-    return total_processed
+    counts["inserted"] = inserted
+    counts["updated"] = changed - inserted
+    counts["unchanged"] = staged - changed
 
+    print(
+        f"✅ Workers: insertados={counts['inserted']} | actualizados={counts['updated']} | "
+        f"sin cambios={counts['unchanged']} | COPY {t_copy - t0:.3f}s | upsert {time.perf_counter() - t_copy:.3f}s"
+    )
+    return counts
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import List
+from sqlmodel import Session, select
+from sqlalchemy import DateTime, cast, func
+
+from app.models.worker import WorkerHistory
+
+
+def get_roster_as_of(session: Session, at: datetime) -> List[WorkerHistory]:
+    """Versión vigente de cada worker en `at` (usa el índice GiST ix_worker_history_validity)."""
+    validity = func.tsrange(WorkerHistory.valid_from, WorkerHistory.valid_to)
+    statement = (
+        select(WorkerHistory)
+        .where(validity.op("@>")(cast(at, DateTime)))
+        .order_by(WorkerHistory.document)
+    )
+    return session.exec(statement).all()
+
+
+def get_worker_history(session: Session, document: str) -> List[WorkerHistory]:
+    """Todas las versiones de un worker, de la más antigua a la actual."""
+    statement = (
+        select(WorkerHistory)
+        .where(WorkerHistory.document == document)
+        .order_by(WorkerHistory.valid_from)
+    )
+    return session.exec(statement).all()
@@ -0,0 +1,146 @@
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlmodel import Session, select
+
+from app.models.worker import Worker, Schedule, UbycallSchedule, Attendance
+from app.schemas.worker import WorkerRead, AttendanceRead
+from app.schemas.schedule import ScheduleRead, UbycallScheduleRead
+from app.crud.dimension_cache import DIMENSION_MODELS, dimension_cache
+
+# Ventana de asistencias de /workers/query (días, hasta la fecha final inclusive)
+ATTENDANCE_DEFAULT_DAYS = 7
+ATTENDANCE_MAX_DAYS = 31
+
+# Relación → (modelo, columna que la une al worker, columna de Worker con la llave, schema de salida)
+RELATIONS = {
+    "schedules": (Schedule, Schedule.worker_document, "document", ScheduleRead),
+    "ubycall_schedules": (UbycallSchedule, UbycallSchedule.worker_document, "document", UbycallScheduleRead),
+    "attendances": (Attendance, Attendance.api_email, "api_email", AttendanceRead),
+}
+
+# Campos proyectables: los de WorkerRead, en su orden
+WORKER_QUERY_FIELDS = list(WorkerRead.model_fields)
+SCALAR_FIELDS = [f for f in WORKER_QUERY_FIELDS if f not in DIMENSION_MODELS and f not in RELATIONS]
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """`fields=document,name,team` → campos en el orden de WorkerRead (vacío = todos)."""
+    if not fields:
+        return list(WORKER_QUERY_FIELDS)
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(WORKER_QUERY_FIELDS)
+    if unknown:
+        raise ValueError(f"Campos desconocidos: {', '.join(sorted(unknown))}")
+    return [f for f in WORKER_QUERY_FIELDS if f in requested]
+
+
+def _dimension_ids(session: Session, dimension: str, names: Iterable[str]) -> List[int]:
+    names = set(names)
+    known = dimension_cache.ids(dimension, session)
+    if not names <= known.keys():
+        # Puede ser un nombre creado por otro proceso: se recarga una vez
+        dimension_cache.refresh([dimension], session)
+        known = dimension_cache.ids(dimension, session)
+    return [known[n] for n in names if n in known]
+
+
+def _window_filter(model, schedule_days: List[date], attendance_from: date, attendance_to: date):
+    if model is Schedule:
+        return Schedule.start_date.in_(schedule_days)
+    if model is UbycallSchedule:
+        return UbycallSchedule.date.in_(schedule_days)
+    return Attendance.date.between(attendance_from, attendance_to)
+
+
+def _load_related(
+    session: Session,
+    relation: str,
+    keys: List[Any],
+    schedule_days: List[date],
+    attendance_from: date,
+    attendance_to: date,
+) -> Dict[Any, List[Dict[str, Any]]]:
+    """Filas de la relación para los workers de la página, agrupadas por llave, solo con las columnas de su schema."""
+    if not keys:
+        return {}
+    model, key_column, _, read_schema = RELATIONS[relation]
+    fields = list(read_schema.model_fields)
+    statement = (
+        select(key_column, *(getattr(model, f) for f in fields))
+        .where(key_column.in_(keys), _window_filter(model, schedule_days, attendance_from, attendance_to))
+        .order_by(key_column, model.id)
+    )
+    grouped: Dict[Any, List[Dict[str, Any]]] = {}
+    for key, *values in session.exec(statement).all():
+        grouped.setdefault(key, []).append(dict(zip(fields, values)))
+    return grouped
+
+
+def query_workers(
+    session: Session,
+    fields: List[str],
+    dimension_filters: Dict[str, List[str]],
+    supervisor: Optional[str] = None,
+    coordinator: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = 100,
+    schedule_days: List[date] = (),
+    attendance_from: Optional[date] = None,
+    attendance_to: Optional[date] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Página de workers filtrada y proyectada, ordenada por document (keyset: la
+    siguiente página empieza después de `after`). Solo se leen las columnas y
+    relaciones de `fields`; horarios de `schedule_days` y asistencias entre
+    `attendance_from` y `attendance_to`. Devuelve (filas, cursor siguiente o None).
+    """
+    relations = [f for f in fields if f in RELATIONS]
+    columns = ["document"] + [f for f in SCALAR_FIELDS if f in fields and f != "document"]
+    columns += [f"{d}_id" for d in DIMENSION_MODELS if d in fields]
+    columns += [RELATIONS[r][2] for r in relations if RELATIONS[r][2] not in columns]
+
+    statement = select(*(getattr(Worker, c) for c in columns))
+    for dimension, names in dimension_filters.items():
+        if not names:
+            continue
+        ids = _dimension_ids(session, dimension, names)
+        if not ids:
+            return [], None
+        statement = statement.where(getattr(Worker, f"{dimension}_id").in_(ids))
+    if supervisor:
+        statement = statement.where(Worker.supervisor == supervisor)
+    if coordinator:
+        statement = statement.where(Worker.coordinator == coordinator)
+    if after:
+        statement = statement.where(Worker.document > after)
+    statement = statement.order_by(Worker.document).limit(limit + 1)
+
+    rows = [dict(zip(columns, row)) for row in session.exec(statement).all()]
+    next_cursor = rows[limit - 1]["document"] if len(rows) > limit else None
+    rows = rows[:limit]
+
+    related = {
+        relation: _load_related(
+            session,
+            relation,
+            [r[RELATIONS[relation][2]] for r in rows if r[RELATIONS[relation][2]] is not None],
+            list(schedule_days),
+            attendance_from,
+            attendance_to,
+        )
+        for relation in relations
+    }
+
+    items = []
+    for row in rows:
+        item: Dict[str, Any] = {}
+        for field in fields:
+            if field in DIMENSION_MODELS:
+                name = dimension_cache.name(field, row[f"{field}_id"])
+                item[field] = {"name": name} if name is not None else None
+            elif field in RELATIONS:
+                item[field] = related[field].get(row[RELATIONS[field][2]], [])
+            else:
+                item[field] = row[field]
+        items.append(item)
+    return items, next_cursor
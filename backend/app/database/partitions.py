@@ -0,0 +1,89 @@
+import os
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+from sqlmodel import Session
+from sqlalchemy import text
+
+# Tablas particionadas por rango semanal (lunes a lunes) → columna de partición
+PARTITIONED_TABLES = {
+    "schedule": "start_date",
+    "ubycallschedule": "date",
+    "attendance": "date",
+}
+# Retención: "drop" borra la partición vencida; "detach" la separa y la deja como tabla suelta (para archivar)
+PARTITION_RETENTION_MODE = os.getenv("PARTITION_RETENTION_MODE", "drop")
+# Semanas de asistencias que se conservan (0 = sin retención: se guarda todo el histórico)
+ATTENDANCE_RETENTION_WEEKS = int(os.getenv("ATTENDANCE_RETENTION_WEEKS", "0"))
+
+
+def week_start(day: date) -> date:
+    """Lunes de la semana de `day` (límite inferior de su partición)."""
+    return day - timedelta(days=day.weekday())
+
+
+def partition_name(table: str, monday: date) -> str:
+    """Nombre de la partición semanal: schedule_p20250106 = semana del lunes 06/01/2025."""
+    return f"{table}_p{monday:%Y%m%d}"
+
+
+def list_partitions(session: Session, table: str) -> Dict[str, date]:
+    """Particiones semanales adjuntas a `table` → lunes de su semana."""
+    pattern = re.compile(rf"^{table}_p(\d{{8}})$")
+    names = session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    ).scalars()
+    return {
+        name: datetime.strptime(match.group(1), "%Y%m%d").date()
+        for name in names
+        if (match := pattern.match(name))
+    }
+
+
+def ensure_partitions(session: Session, table: str, first_day: date, last_day: date) -> List[str]:
+    """
+    Crea las particiones semanales de `table` que falten para cubrir first_day..last_day
+    (se llama antes de insertar: no hay partición por defecto). Devuelve las creadas.
+    """
+    existing = list_partitions(session, table)
+    created = []
+    monday = week_start(first_day)
+    while monday <= last_day:
+        name = partition_name(table, monday)
+        if name not in existing:
+            session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{monday.isoformat()}') TO ('{(monday + timedelta(days=7)).isoformat()}')"
+            ))
+            created.append(name)
+        monday += timedelta(days=7)
+    if created:
+        print(f"🧱 [PARTITIONS] {table}: particiones creadas {', '.join(created)}")
+    return created
+
+
+def drop_partitions_before(session: Session, table: str, cutoff: date) -> List[str]:
+    """
+    Retención por particiones: quita las semanas de `table` que terminan antes de
+    `cutoff` (equivale a DELETE ... WHERE fecha < cutoff si cutoff es lunes), sin
+    filas muertas que vaciar. Según PARTITION_RETENTION_MODE la partición se borra
+    o se separa renombrada a <partición>_detached. Devuelve las particiones quitadas.
+    """
+    removed = []
+    for name, monday in sorted(list_partitions(session, table).items(), key=lambda item: item[1]):
+        if monday + timedelta(days=7) > cutoff:
+            continue
+        if PARTITION_RETENTION_MODE == "detach":
+            session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            session.execute(text(f"ALTER TABLE {name} RENAME TO {name}_detached"))
+        else:
+            session.execute(text(f"DROP TABLE {name}"))
+        removed.append(name)
+    if removed:
+        action = "separadas" if PARTITION_RETENTION_MODE == "detach" else "borradas"
+        print(f"🧹 [PARTITIONS] {table}: particiones {action} {', '.join(removed)}")
+    return removed
@@ -1,5 +1,6 @@
 from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 from contextlib import asynccontextmanager
 from sqlmodel import Session
 import traceback
@@ -7,6 +8,9 @@ import sys
 from typing import Annotated
 from app.database.database import get_session
 from app.database.migrate import run_migrations
+from app.services.utils.upload_service import shutdown_parse_pool
+from app.services.utils.upload_jobs import job_heartbeat_loop, shutdown_job_executor
+from app.services.utils.roster_snapshot import roster_rollover_loop
 from app.routers import (
     worker,
     operational_view,
@@ -19,7 +23,9 @@ from app.routers import (
     attendance,
     real_time_data,
     sla_breached,
-    contacts_with_ccr
+    contacts_with_ccr,
+    upload_cache,
+    jobs
 )
 
 # --- Nueva forma recomendada: lifespan ---
@@ -28,8 +34,15 @@ async def lifespan(app: FastAPI):
     print("▶ Ejecutando migraciones de base de datos...")
     run_migrations()
     print("✅ Migraciones completadas.")
+    # Latido de los jobs de este proceso; también da por fallidos los de procesos caídos
+    heartbeat_task = asyncio.create_task(job_heartbeat_loop())
+    rollover_task = asyncio.create_task(roster_rollover_loop())
     yield  # Aquí inicia la app
     print("🛑 Cerrando aplicación...")  # Aquí puedes liberar recursos si deseas
+    rollover_task.cancel()
+    heartbeat_task.cancel()
+    shutdown_job_executor()
+    shutdown_parse_pool()
 
 # Crear la aplicación con lifespan
 app = FastAPI(
@@ -73,6 +86,8 @@ app.include_router(attendance.router)
 app.include_router(real_time_data.router)
 app.include_router(sla_breached.router)
 app.include_router(contacts_with_ccr.router)
+app.include_router(upload_cache.router)
+app.include_router(jobs.router)
 
 
 # Dependencia para obtener la sesión
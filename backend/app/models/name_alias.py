@@ -0,0 +1,18 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+class NameAlias(SQLModel, table=True):
+    # Nombre tal como aparece en los reportes (supervisor/coordinador/gerente), normalizado
+    raw_name: str = Field(primary_key=True, max_length=255)
+    # Nombre del padrón (normalizado) con mejor score; "" = ninguno llega a `score`
+    canonical_name: str = Field(max_length=255, index=True)
+    score: float
+    # Momento en que se resolvió: los nombres que entraron al padrón después se puntúan aparte
+    resolved_at: datetime
+    last_seen: datetime
+
+
+class NameRosterEntry(SQLModel, table=True):
+    # Nombre del padrón vigente (normalizado) y desde cuándo está presente sin interrupción
+    name: str = Field(primary_key=True, max_length=255)
+    added_at: datetime
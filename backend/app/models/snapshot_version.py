@@ -0,0 +1,9 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+class SnapshotVersion(SQLModel, table=True):
+    # Versión de un snapshot en memoria (p. ej. "roster"): cada carga que cambia sus
+    # datos la sube y los procesos que tengan una anterior lo reconstruyen
+    name: str = Field(primary_key=True, max_length=50)
+    version: int = 0
+    updated_at: datetime
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, JSON
+from sqlmodel import SQLModel, Field
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+class UploadJob(SQLModel, table=True):
+    id: str = Field(primary_key=True, max_length=32)
+    kind: str = Field(max_length=50, index=True)
+    status: str = Field(default="queued", max_length=20, index=True)  # queued | running | succeeded | failed
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    # Proceso que encoló el job y último latido: al arrancar o en el latido se dan
+    # por perdidos solo los jobs cuyo proceso dejó de latir
+    owner: Optional[str] = Field(default=None, max_length=100)
+    heartbeat_at: Optional[datetime] = None
+
+    # Segundos por etapa del servicio (lectura, limpieza, BD...) y resumen final
+    timings: Optional[Dict[str, Any]] = Field(
+        default=None,
+        sa_column=Column(JSON, nullable=True)
+    )
+    result: Optional[Dict[str, Any]] = Field(
+        default=None,
+        sa_column=Column(JSON, nullable=True)
+    )
+    error: Optional[str] = None
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, Time, cast, func, literal_column, text
 from typing import Optional, List
 from datetime import date, time
 import datetime
@@ -40,6 +41,15 @@ class ContractType(SQLModel, table=True):
     workers: List["Worker"] = Relationship(back_populates="contract_type")
 
 class Worker(SQLModel, table=True):
+    __table_args__ = (
+        # Filtros de /workers/query; document al final para la paginación por keyset
+        Index("ix_worker_team_document", "team_id", "document"),
+        Index("ix_worker_status_document", "status_id", "document"),
+        Index("ix_worker_campaign_document", "campaign_id", "document"),
+        Index("ix_worker_supervisor_document", "supervisor", "document"),
+        Index("ix_worker_coordinator_document", "coordinator", "document"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     document: str = Field(unique=True, max_length=10)
     name: str = Field(max_length=100)
@@ -63,6 +73,8 @@ class Worker(SQLModel, table=True):
     tenure: Optional[int] = Field(default=None)
     trainee: Optional[str] = Field(default=None, max_length=20)
     productive: Optional[str] = Field(default='No')
+    # md5 de los campos de negocio (todo menos id y document): detectar cambios es una comparación
+    row_hash: Optional[str] = Field(default=None, max_length=32)
 
     # Relación uno a muchos con Role
     role: "Role" = Relationship(back_populates="workers")
@@ -89,10 +101,68 @@ class Worker(SQLModel, table=True):
 
     attendances: List["Attendance"] = Relationship(back_populates="worker")
 
-class UbycallSchedule(SQLModel, table=True):
+class WorkerHistory(SQLModel, table=True):
+    """
+    Versiones de cada worker (SCD2): una fila por versión que realmente cambió,
+    vigente en [valid_from, valid_to). valid_to NULL = versión actual.
+    Sin FK a worker para conservar la historia aunque el worker se borre.
+    """
+    __tablename__ = "worker_history"
+    __table_args__ = (
+        # Una sola versión abierta por documento
+        Index("ix_worker_history_current", "document", unique=True, postgresql_where=text("valid_to IS NULL")),
+        # Historia de un worker
+        Index("ix_worker_history_document_valid_from", "document", "valid_from"),
+        # Padrón a una fecha: tsrange(valid_from, valid_to) @> :fecha
+        Index("ix_worker_history_validity", func.tsrange(text("valid_from"), text("valid_to")), postgresql_using="gist"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
+    document: str = Field(max_length=10)
+    name: str = Field(max_length=100)
+    role_id: Optional[int] = Field(default=None)
+    status_id: Optional[int] = Field(default=None)
+    campaign_id: Optional[int] = Field(default=None)
+    team_id: Optional[int] = Field(default=None)
+    manager: Optional[str] = Field(default=None, max_length=100)
+    supervisor: Optional[str] = Field(default=None, max_length=100)
+    coordinator: Optional[str] = Field(default=None, max_length=100)
+    work_type_id: Optional[int] = Field(default=None)
+    start_date: Optional[date] = Field(default=None)
+    termination_date: Optional[date] = Field(default=None)
+    contract_type_id: Optional[int] = Field(default=None)
+    requirement_id: Optional[str] = Field(default=None, max_length=15)
+    api_id: Optional[str] = Field(default=None, max_length=40)
+    api_name: Optional[str] = Field(default=None, max_length=100)
+    api_email: Optional[str] = Field(default=None, max_length=100)
+    observation_1: Optional[str] = Field(default=None, max_length=100)
+    observation_2: Optional[str] = Field(default=None, max_length=100)
+    tenure: Optional[int] = Field(default=None)
+    trainee: Optional[str] = Field(default=None, max_length=20)
+    productive: Optional[str] = Field(default=None)
+    row_hash: str = Field(max_length=32)
+    valid_from: datetime.datetime
+    valid_to: Optional[datetime.datetime] = Field(default=None)
+
+class UbycallSchedule(SQLModel, table=True):
+    __table_args__ = (
+        # Llave natural de un turno; '24:00' (que datetime.time no representa) hace que las horas NULL también choquen
+        Index(
+            "ux_ubycallschedule_natural_key",
+            "worker_document",
+            "date",
+            func.coalesce(text("start_time"), cast(literal_column("'24:00'"), Time)),
+            func.coalesce(text("end_time"), cast(literal_column("'24:00'"), Time)),
+            unique=True,
+        ),
+        # Particiones semanales por fecha (app/database/partitions.py)
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+    # La llave primaria incluye la columna de partición
+    id: Optional[int] = Field(default=None, primary_key=True, sa_column_kwargs={"autoincrement": True})
     worker_document: str = Field(foreign_key="worker.document")
-    date: date
+    date: datetime.date = Field(primary_key=True)
     day: str
     start_time: Optional[time] = None
     end_time: Optional[time] = None
@@ -101,9 +171,17 @@ class UbycallSchedule(SQLModel, table=True):
     worker: Worker = Relationship(back_populates="ubycall_schedules")
 
 class Schedule(SQLModel, table=True):
-    id: Optional[int] = Field(default=None, primary_key=True)
+    __table_args__ = (
+        # Un solo horario por worker y día (las cargas actualizan en lugar de duplicar)
+        Index("ux_schedule_worker_document_start_date", "worker_document", "start_date", unique=True),
+        # Particiones semanales por fecha de inicio (app/database/partitions.py)
+        {"postgresql_partition_by": "RANGE (start_date)"},
+    )
+
+    # La llave primaria incluye la columna de partición
+    id: Optional[int] = Field(default=None, primary_key=True, sa_column_kwargs={"autoincrement": True})
     worker_document: str = Field(foreign_key="worker.document")
-    start_date: Optional[date] = None
+    start_date: date = Field(primary_key=True)
     end_date: Optional[date] = None
     start_time: Optional[time] = None
     end_time: Optional[time] = None
@@ -122,10 +200,18 @@ class Attendance(SQLModel, table=True):
     - Si asistió o no al turno planificado.
     - Observaciones de puntualidad, faltas, etc.    
     """
-    id: Optional[int] = Field(default=None, primary_key=True)
+    __table_args__ = (
+        # Ventana de asistencias por worker
+        Index("ix_attendance_api_email_date", "api_email", "date"),
+        # Particiones semanales por fecha (app/database/partitions.py)
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+    # La llave primaria incluye la columna de partición
+    id: Optional[int] = Field(default=None, primary_key=True, sa_column_kwargs={"autoincrement": True})
     api_email: str = Field(foreign_key="worker.api_email")
 
-    date: date
+    date: datetime.date = Field(primary_key=True)
     check_in: Optional[time] = None
     check_out: Optional[time] = None
     status: str = Field(default="absent")  
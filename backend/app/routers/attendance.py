@@ -1,12 +1,13 @@
 from typing import List, Dict
 from datetime import date
-from fastapi import APIRouter, UploadFile, Depends, File, Form
+from fastapi import APIRouter, UploadFile, Depends, File, Form, Query
 from sqlmodel import Session, select
 import traceback
 
 from app.database.database import get_session
 from app.services.attendance_service import process_and_persist_attendance
 from app.models.worker import Attendance, Schedule, Worker
+from app.services.utils.upload_jobs import run_upload_job, snapshot_uploads
 
 # Configurar logging básico
 router = APIRouter(tags=["attendance"])
@@ -16,7 +17,7 @@ router = APIRouter(tags=["attendance"])
 async def upload_attendance(
     file: UploadFile = File(...),
     target_date: date | None = Form(None),
-    session: Session = Depends(get_session),
+    background: bool = Query(True, description="Encola la carga y responde 202 con el job_id; false espera el resultado"),
 ):
     """
     - Recibe un Excel con conexiones (HeroCare u otro).
@@ -24,25 +25,29 @@ async def upload_attendance(
     - Valida contra los schedules cargados para asignar status (present, absent, late).
     - Inserta registros de Attendance vinculados a Worker.
     """
-    
-    try:
+    if background:
+        file = (await snapshot_uploads([file]))[0]
 
-        result = await process_and_persist_attendance(
-            file=file,
-            session=session,
-            target_date=target_date
-        )
+    async def job(session: Session):
+        try:
 
-        return {
-            "message": f"Se insertaron {result['inserted']} registros de asistencia.",
-            "missing_workers": result["missing_workers"]
-        }
+            result = await process_and_persist_attendance(
+                file=file,
+                session=session,
+                target_date=target_date
+            )
 
-    except Exception as e:
-        import traceback
-        print("❌ ERROR EN ENDPOINT:")
-        print(traceback.format_exc())
-        raise e 
+            return {
+                "message": f"Se insertaron {result['inserted']} registros de asistencia.",
+                "missing_workers": result["missing_workers"]
+            }
+
+        except Exception as e:
+            print("❌ ERROR EN ENDPOINT:")
+            print(traceback.format_exc())
+            raise e
+
+    return await run_upload_job("attendance", job, background)
 
 
 @router.get("/attendance/today", summary="Obtiene la asistencia de hoy")
@@ -7,7 +7,8 @@ from sqlalchemy import text
 from app.database.database import get_session
 from app.services.contacts_with_ccr import contacts_with_ccr_service
 from app.schemas.contacts_with_ccr import ContactsReceivedRead
-from app.crud.contacts_with_ccr import get_all_contacts_with_ccr
+from app.crud.contacts_with_ccr import get_all_contacts_with_ccr, get_all_contacts_with_ccr_rows
+from app.utils.fast_json import FAST_JSON_ENABLED, JSONArrayResponse
 
 router = APIRouter(tags=["contacts-with-ccr"])
 
@@ -35,6 +36,8 @@ def read_contacts_with_ccr(
     session: Session = Depends(get_session),
 ):
     try:
+        if FAST_JSON_ENABLED:
+            return JSONArrayResponse(get_all_contacts_with_ccr_rows(session))
         result = get_all_contacts_with_ccr(session)
         return result
 
@@ -0,0 +1,27 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+
+from app.database.database import get_session
+from app.schemas.upload_job import UploadJobRead
+from app.services.utils.upload_jobs import get_job, list_jobs
+
+router = APIRouter(tags=["jobs"])
+
+
+@router.get("/jobs/", response_model=List[UploadJobRead], summary="Últimos jobs de carga")
+def read_jobs(
+    kind: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200),
+    session: Session = Depends(get_session),
+):
+    return list_jobs(session, kind=kind, limit=limit)
+
+
+@router.get("/jobs/{job_id}", response_model=UploadJobRead, summary="Estado de un job de carga")
+def read_job(job_id: str, session: Session = Depends(get_session)):
+    """Estado, tiempos por etapa y resultado (o error) de una carga encolada."""
+    job = get_job(session, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No existe el job {job_id}")
+    return job
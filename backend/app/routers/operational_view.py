@@ -5,7 +5,8 @@ from sqlmodel import Session
 
 from app.database.database import get_session
 from app.services.operational_view_service import process_and_persist_operational_view
-from app.crud.operational_view import get_all_views
+from app.crud.operational_view import get_all_views, get_all_views_rows
+from app.utils.fast_json import FAST_JSON_ENABLED, JSONArrayResponse
 from app.models.operational_view import OperationalView
 
 router = APIRouter(tags=["operational-view"])
@@ -30,4 +31,6 @@ async def upload_real_data_view(
 def read_operational_view(
     session: Session = Depends(get_session)
 ):
+    if FAST_JSON_ENABLED:
+        return JSONArrayResponse(get_all_views_rows(session))
     return get_all_views(session)
@@ -7,7 +7,8 @@ from sqlmodel import Session
 from app.database.database import get_session
 from app.services.planned_service import planned_service
 from app.models.planned import Planned
-from app.crud.planned import get_all_planned
+from app.crud.planned import get_all_planned, get_all_planned_rows
+from app.utils.fast_json import FAST_JSON_ENABLED, JSONArrayResponse
 from app.schemas.planned import PlannedRead
 
 router = APIRouter(tags=["planned-data"])
@@ -33,4 +34,6 @@ async def upload_planned_data(
 def read_planned_data(
     session: Session = Depends(get_session)
 ):
+    if FAST_JSON_ENABLED:
+        return JSONArrayResponse(get_all_planned_rows(session))
     return get_all_planned(session)
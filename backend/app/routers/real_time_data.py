@@ -5,7 +5,8 @@ from sqlmodel import Session
 from app.database.database import get_session
 from app.services.real_time_data_service import real_time_data_service
 from app.schemas.real_time_data import RealTimeDataRead
-from app.crud.real_time_data import get_all_real_time_data
+from app.crud.real_time_data import get_all_real_time_data, get_all_real_time_data_rows
+from app.utils.fast_json import FAST_JSON_ENABLED, JSONArrayResponse
 from fastapi import HTTPException
 from typing import List
 from sqlalchemy.exc import SQLAlchemyError  # Importar para manejar errores de SQLAlchemy
@@ -36,6 +37,8 @@ def read_real_time_data(
     session: Session = Depends(get_session)
 ):
     try:
+        if FAST_JSON_ENABLED:
+            return JSONArrayResponse(get_all_real_time_data_rows(session))
         data = get_all_real_time_data(session)
         
         # Manejar valores None en el campo 'tht'
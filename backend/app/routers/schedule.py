@@ -1,40 +1,52 @@
 from typing import List, Dict
 from datetime import date
-from fastapi import APIRouter, UploadFile, Depends, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, Depends, File, Form, HTTPException, Query
 from sqlmodel import Session, select
 
 from app.database.database import get_session
 from app.services.schedule_service import process_and_persist_schedules
 from app.models.worker import Schedule, UbycallSchedule
-from app.routers.utils.google_drive_utils import get_public_drive_files, download_drive_file
+from app.routers.utils.google_drive_utils import get_public_drive_files, download_drive_file, find_drive_file
+from app.services.utils.upload_jobs import run_upload_job, snapshot_uploads
 
 router = APIRouter(tags=["schedules"])
 
 @router.post("/upload-schedules/", summary="Carga y persiste horarios desde Excel")
 async def upload_schedules(
     files: List[UploadFile] = File(...),
-    week: int = Form(...),                 # 👈 obligatorio, viene del form-data
+    week: int = Form(...),                 # 👈 obligatorio, viene del form-data (primera semana)
     year: int | None = Form(None),         # 👈 opcional, también del form-data
-    session: Session = Depends(get_session),
+    weeks: int | None = Form(None),        # 👈 opcional: cantidad de semanas (= archivos schedule_concentrix)
+    background: bool = Query(True, description="Encola la carga y responde 202 con el job_id; false espera el resultado"),
 ):
     """
-    - Recibe dos Excel (concentrix y ubycall).
-    - Inserta sólo los schedules cuyos DOCUMENT existen en Worker.
-    - Devuelve cuántos se insertaron y lista de documentos faltantes.
+    - Recibe los Excel de Concentrix (uno por semana, en orden desde `week`), people_obs,
+      PPP y Ubycall (uno o varios que cubran el rango).
+    - Inserta o actualiza sólo los schedules cuyos DOCUMENT existen en Worker.
+    - Devuelve cuántos se insertaron por semana y lista de documentos faltantes.
     """
-    result = await process_and_persist_schedules(
-        files=files,
-        session=session,
-        week=week,
-        year=year,
-    )
-    return {
-        "message": (
-            f"Se insertaron {result['inserted_concentrix']} horarios Concentrix "
-            f"y {result['inserted_ubycall']} horarios Ubycall."
-        ),
-        "missing_worker_documents": result["missing_workers"]
-    }
+    if background:
+        files = await snapshot_uploads(files)
+
+    async def job(session: Session):
+        result = await process_and_persist_schedules(
+            files=files,
+            session=session,
+            week=week,
+            year=year,
+            weeks=weeks,
+        )
+        return {
+            "message": (
+                f"Se insertaron {result['inserted_concentrix']} horarios Concentrix "
+                f"y {result['inserted_ubycall']} horarios Ubycall "
+                f"en {len(result['weeks'])} semana(s)."
+            ),
+            "weeks": result["weeks"],
+            "missing_worker_documents": result["missing_workers"]
+        }
+
+    return await run_upload_job("schedules", job, background)
 
 @router.get(
     "/schedules/today",
@@ -73,12 +85,18 @@ REQUIRED_SCHEDULES = [
 
 
 @router.post("/auto-upload-schedules/")
-async def auto_upload_schedules(session: Session = Depends(get_session)):
+async def auto_upload_schedules(
+    background: bool = Query(True, description="Encola la carga y responde 202 con el job_id; false espera el resultado"),
+):
     """
     Descarga automáticamente los horarios desde Google Drive (carpeta pública),
     detecta los 3 archivos esperados por nombre y los procesa.
     La semana/año se calculan dentro de process_and_persist_schedules.
     """
+    return await run_upload_job("auto_schedules", _auto_upload_schedules_job, background)
+
+
+async def _auto_upload_schedules_job(session: Session):
     import time
     start_total = time.perf_counter()
     print("\n⚙️ [AUTO-UPLOAD] Iniciando proceso automático de carga de horarios desde Drive...")
@@ -95,10 +113,7 @@ async def auto_upload_schedules(session: Session = Depends(get_session)):
         t2 = time.perf_counter()
 
         for meta in REQUIRED_SCHEDULES:
-            found = next(
-                (f for f in files if meta["expectedPart"].lower() in f["name"].lower()),
-                None,
-            )
+            found = find_drive_file(files, meta["expectedPart"])
             if not found:
                 raise HTTPException(
                     status_code=404,
@@ -135,6 +150,7 @@ async def auto_upload_schedules(session: Session = Depends(get_session)):
                 f"Se insertaron {result['inserted_concentrix']} horarios Concentrix "
                 f"y {result['inserted_ubycall']} horarios Ubycall."
             ),
+            "weeks": result["weeks"],
             "missing_worker_documents": result["missing_workers"],
             "timing": {
                 "drive_query_s": round(time.perf_counter() - t1, 3),
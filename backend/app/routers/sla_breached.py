@@ -5,7 +5,8 @@ from sqlmodel import Session
 from app.database.database import get_session
 from app.services.sla_breached_service import sla_breached_service
 from app.schemas.sla_breached import SlaBreachedRead
-from app.crud.sla_breached import get_all_sla_breached_data
+from app.crud.sla_breached import get_all_sla_breached_data, get_all_sla_breached_rows
+from app.utils.fast_json import FAST_JSON_ENABLED, JSONArrayResponse
 from fastapi import HTTPException
 from sqlalchemy.exc import SQLAlchemyError  # Importar para manejar errores de SQLAlchemy
 
@@ -36,6 +37,8 @@ def read_sla_breached_data(
     session: Session = Depends(get_session)
 ):
     try:
+        if FAST_JSON_ENABLED:
+            return JSONArrayResponse(get_all_sla_breached_rows(session))
         data = get_all_sla_breached_data(session)
         
         # Manejar valores None en el campo 'chat_breached'
@@ -0,0 +1,15 @@
+# app/routers/upload_cache.py
+
+from fastapi import APIRouter
+
+from app.services.utils.upload_cache import get_cache_stats
+
+router = APIRouter(tags=["upload-cache"])
+
+@router.get("/upload-cache/stats", summary="Estado y contadores del caché de archivos parseados")
+def read_upload_cache_stats():
+    """
+    Devuelve hits/misses del caché de uploads (desde el arranque del proceso),
+    cantidad de entradas y tamaño ocupado en disco frente al tope configurado.
+    """
+    return get_cache_stats()
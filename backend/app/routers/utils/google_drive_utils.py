@@ -1,6 +1,6 @@
 from fastapi import UploadFile, HTTPException
 import requests
-from io import BytesIO
+import tempfile
 import re
 from bs4 import BeautifulSoup
 
@@ -51,16 +51,50 @@ def get_public_drive_files(folder_id: str):
 
     return files
 
+# Si la carpeta trae el mismo archivo en varios formatos, se prefiere el columnar
+DRIVE_FORMAT_PREFERENCE = ('.parquet', '.arrow', '.feather', '.xlsx', '.csv')
+
+def find_drive_file(files: list, expected_part: str):
+    """
+    Primer archivo cuyo nombre contiene `expected_part`, prefiriendo Parquet/Arrow
+    sobre Excel/CSV. Devuelve None si no hay ninguno.
+    """
+    matches = [f for f in files if expected_part.lower() in f["name"].lower()]
+    if not matches:
+        return None
+
+    def rank(f):
+        name = f["name"].lower()
+        for i, ext in enumerate(DRIVE_FORMAT_PREFERENCE):
+            if name.endswith(ext):
+                return i
+        return len(DRIVE_FORMAT_PREFERENCE)
+
+    return min(matches, key=rank)
+
+# Igual que Starlette con los form-data: hasta 1 MB en memoria, luego a disco
+DOWNLOAD_SPOOL_MAX_SIZE = 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 def download_drive_file(file_id: str, filename: str) -> UploadFile:
-    """Descarga un archivo público de Google Drive y lo devuelve como UploadFile."""
+    """
+    Descarga un archivo público de Google Drive por bloques a un
+    SpooledTemporaryFile y lo devuelve como UploadFile.
+    """
     url = f"https://drive.google.com/uc?export=download&id={file_id}"
-    res = requests.get(url)
 
-    if res.status_code != 200:
-        raise HTTPException(status_code=500, detail=f"No se pudo descargar el archivo {filename}")
+    with requests.get(url, stream=True) as res:
+        if res.status_code != 200:
+            raise HTTPException(status_code=500, detail=f"No se pudo descargar el archivo {filename}")
+
+        spooled = tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_MAX_SIZE)
+        for chunk in res.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            if chunk:
+                spooled.write(chunk)
+        spooled.seek(0)
 
     # Importante: no pasar content_type si tu UploadFile no lo soporta
     return UploadFile(
         filename=filename,
-        file=BytesIO(res.content),
+        file=spooled,
     )
\ No newline at end of file
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, UploadFile, Depends, File, HTTPException
-from sqlmodel import Session, select
-from sqlalchemy.orm import selectinload, with_loader_criteria
-from typing import List
+from fastapi import APIRouter, UploadFile, Depends, File, HTTPException, Query, Header, Response
+from pydantic import TypeAdapter
+from sqlmodel import Session
+from typing import List, Optional
 import requests
 from io import BytesIO
 import re
@@ -9,73 +9,138 @@ from bs4 import BeautifulSoup
 
 from app.database.database import get_session
 from app.services.workers_service import process_and_persist_workers
-from app.models.worker import Worker
-from app.schemas.worker import WorkerRead
-from app.models.worker import Schedule, UbycallSchedule
+from app.schemas.worker import WorkerRead, WorkerHistoryRead
+from app.crud.worker_history import get_roster_as_of, get_worker_history
+from app.crud.worker_query import ATTENDANCE_DEFAULT_DAYS, ATTENDANCE_MAX_DAYS, parse_fields, query_workers
+from app.crud.dimension_cache import validate_with_dimensions
+from app.services.utils.roster_snapshot import get_roster_snapshot, peru_today
+from app.utils import fast_json
+from app.utils.fast_json import FAST_JSON_ENABLED
 from app.routers.protected import get_current_user
 from app.models.user import User
 import pytz
-from datetime import datetime, timedelta, timezone
-from app.routers.utils.google_drive_utils import get_public_drive_files, download_drive_file
+from datetime import date, datetime, timedelta
+from app.routers.utils.google_drive_utils import get_public_drive_files, download_drive_file, find_drive_file
+from app.services.utils.upload_jobs import run_upload_job, snapshot_uploads
 
 router = APIRouter()
 
+_history_adapter = TypeAdapter(List[WorkerHistoryRead])
+
 @router.post("/upload-workers/")
 async def upload_workers(
     files: List[UploadFile] = File(...),
-    session: Session = Depends(get_session)
+    background: bool = Query(True, description="Encola la carga y responde 202 con el job_id; false espera el resultado"),
 ):
-    count = await process_and_persist_workers(
-        files,
-        session
-    )
-    return {"message": f"Se insertaron {count} trabajadores correctamente."}
+    if background:
+        files = await snapshot_uploads(files)
+
+    async def job(session: Session):
+        counts = await process_and_persist_workers(
+            files,
+            session
+        )
+        count = counts["inserted"] + counts["updated"]
+        return {"message": f"Se insertaron {count} trabajadores correctamente.", "counts": counts}
+
+    return await run_upload_job("workers", job, background)
 
 @router.get(
     "/workers/",
     response_model=List[WorkerRead],
     summary="Lista todos los trabajadores con sus horarios"
 )
-def read_workers(session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    # Cargamos role, status, campaign, etc. y además schedules y ubycall_schedules
+def read_workers(
+    if_none_match: Optional[str] = Header(None),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    # El padrón se materializa después de cada carga de workers/horarios/asistencias
+    # y al cambiar el día de Perú: aquí solo se sirven los bytes ya serializados
+    snapshot = get_roster_snapshot(session)
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if if_none_match and snapshot.etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
 
+@router.get(
+    "/workers/query/",
+    summary="Workers filtrados, con proyección de campos y paginación por document"
+)
+def query_workers_page(
+    team: Optional[List[str]] = Query(None, description="Nombre(s) de team"),
+    status: Optional[List[str]] = Query(None, description="Nombre(s) de status"),
+    campaign: Optional[List[str]] = Query(None, description="Nombre(s) de campaña"),
+    role: Optional[List[str]] = Query(None, description="Nombre(s) de rol"),
+    supervisor: Optional[str] = Query(None),
+    coordinator: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Campos separados por coma (por defecto, todos los de WorkerRead)"),
+    after: Optional[str] = Query(None, description="Cursor: next_cursor de la página anterior"),
+    limit: int = Query(100, ge=1, le=1000),
+    attendance_from: Optional[date] = Query(None, description=f"Por defecto, {ATTENDANCE_DEFAULT_DAYS} días hasta attendance_to"),
+    attendance_to: Optional[date] = Query(None, description="Por defecto, hoy (hora de Perú)"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
     try:
-        print('xd')
-        peru_tz = timezone(timedelta(hours=-5))
-        current_day = datetime.now(peru_tz).date()
-        previous_day = current_day - timedelta(days=1)
-        statement = (
-            select(Worker)
-            .options(
-                selectinload(Worker.role),
-                selectinload(Worker.status),
-                selectinload(Worker.campaign),
-                selectinload(Worker.team),
-                selectinload(Worker.work_type),
-                selectinload(Worker.contract_type),
-                selectinload(Worker.schedules),
-                selectinload(Worker.ubycall_schedules),
-                selectinload(Worker.attendances),
-                with_loader_criteria(
-                    Schedule,
-                    Schedule.start_date.in_([current_day, previous_day])
-                ),
-                with_loader_criteria(
-                    UbycallSchedule,
-                    UbycallSchedule.date.in_([current_day, previous_day])
-                ),
-            )
+        selected = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    current_day = peru_today()
+    attendance_to = attendance_to or current_day
+    attendance_from = attendance_from or attendance_to - timedelta(days=ATTENDANCE_DEFAULT_DAYS - 1)
+    window_days = (attendance_to - attendance_from).days + 1
+    if not 1 <= window_days <= ATTENDANCE_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"La ventana de asistencias debe ser de 1 a {ATTENDANCE_MAX_DAYS} días (pedida: {window_days})",
         )
-        workers = session.exec(statement).all()
 
-        # for w in workers:
-        #     w.schedules = [s for s in w.schedules if s.date == current_day]
-        #     w.ubycall_schedules = [u for u in w.ubycall_schedules if u.date == current_day]
-        return workers
-    except Exception as e:
-        print('xd')
-        print(e)
-        print('xd')
+    items, next_cursor = query_workers(
+        session,
+        selected,
+        {"team": team, "status": status, "campaign": campaign, "role": role},
+        supervisor=supervisor,
+        coordinator=coordinator,
+        after=after,
+        limit=limit,
+        schedule_days=[current_day, current_day - timedelta(days=1)],
+        attendance_from=attendance_from,
+        attendance_to=attendance_to,
+    )
+    page = {"items": items, "next_cursor": next_cursor, "count": len(items)}
+    if FAST_JSON_ENABLED:
+        return Response(content=fast_json.dumps(page), media_type="application/json")
+    return page
+
+@router.get(
+    "/workers/as-of/",
+    response_model=List[WorkerHistoryRead],
+    summary="Padrón de trabajadores vigente en una fecha (historia SCD2)"
+)
+def read_workers_as_of(
+    at: datetime = Query(..., description="Fecha y hora (hora local) a consultar"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    roster = get_roster_as_of(session, at.replace(tzinfo=None))
+    return validate_with_dimensions(session, _history_adapter, roster)
+
+@router.get(
+    "/workers/{document}/history/",
+    response_model=List[WorkerHistoryRead],
+    summary="Versiones de un trabajador (solo las que cambiaron)"
+)
+def read_worker_history(
+    document: str,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    versions = get_worker_history(session, document)
+    if not versions:
+        raise HTTPException(status_code=404, detail=f"No hay historia para el documento {document}")
+    return validate_with_dimensions(session, _history_adapter, versions)
 
 # ==============================================================
 # CONFIGURACIÓN
@@ -95,12 +160,18 @@ REQUIRED_FILES = [
 ]
 
 @router.post("/auto-upload-workers/")
-async def auto_upload_workers(session: Session = Depends(get_session)):
+async def auto_upload_workers(
+    background: bool = Query(True, description="Encola la carga y responde 202 con el job_id; false espera el resultado"),
+):
     """
     Descarga automáticamente los archivos desde Google Drive
     buscándolos por nombre dentro de una carpeta pública y
     procesa/actualiza los trabajadores.
     """
+    return await run_upload_job("auto_workers", _auto_upload_workers_job, background)
+
+
+async def _auto_upload_workers_job(session: Session):
     import time
     start_total = time.perf_counter()
     print("\n⚙️ [WORKERS AUTO] Iniciando carga automática de workers desde Drive...")
@@ -117,10 +188,7 @@ async def auto_upload_workers(session: Session = Depends(get_session)):
         t2 = time.perf_counter()
 
         for meta in REQUIRED_FILES:
-            found = next(
-                (f for f in files if meta["expectedPart"].lower() in f["name"].lower()),
-                None,
-            )
+            found = find_drive_file(files, meta["expectedPart"])
             if not found:
                 msg = f"No se encontró el archivo requerido: {meta['label']}"
                 print(f"❌ [W-STEP 2] {msg}")
@@ -138,7 +206,8 @@ async def auto_upload_workers(session: Session = Depends(get_session)):
         # 3️⃣ Procesar e insertar/actualizar workers
         t3 = time.perf_counter()
         print("🚀 [W-STEP 3] Ejecutando process_and_persist_workers()...")
-        total_processed = await process_and_persist_workers(files_to_process, session)
+        counts = await process_and_persist_workers(files_to_process, session)
+        total_processed = counts["inserted"] + counts["updated"]
         process_time = time.perf_counter() - t3
         print(f"✅ [W-STEP 3] Proceso de persistencia completado en {process_time:.3f}s")
 
@@ -148,6 +217,7 @@ async def auto_upload_workers(session: Session = Depends(get_session)):
 
         return {
             "message": f"✅ Se insertaron/actualizaron {total_processed} trabajadores correctamente.",
+            "counts": counts,
             "timing": {
                 "drive_list_s": round(time.perf_counter() - t1, 3),
                 "download_s": round(time.perf_counter() - t2, 3),
@@ -0,0 +1,16 @@
+from typing import Optional, Dict, Any
+from datetime import datetime
+from sqlmodel import SQLModel
+
+
+class UploadJobRead(SQLModel):
+    id: str
+    kind: str
+    status: str
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    heartbeat_at: Optional[datetime]
+    timings: Optional[Dict[str, Any]]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
@@ -1,8 +1,13 @@
-from typing import Optional, List
-from datetime import date, time
+from typing import Any, Optional, List
+from datetime import date, datetime, time
+from pydantic import ValidationInfo, model_validator
 from sqlmodel import SQLModel
 from app.schemas.schedule import ScheduleRead, UbycallScheduleRead
 
+# Clave del contexto de validación con los nombres de las dimensiones
+# ({dimensión: {id: nombre}}); la arma la capa crud (DimensionCache.names_for)
+DIMENSION_NAMES_CONTEXT = "dimension_names"
+
 class RoleRead(SQLModel):
     name: str
 
@@ -30,6 +35,26 @@ class AttendanceRead(SQLModel):
     status: str
     out_of_adherence: Optional[float] = None
     offline_minutes: Optional[float] = None
+
+def with_dimension_names(cls, data: Any, info: ValidationInfo) -> Any:
+    """
+    Desde un objeto ORM: role/status/... salen del mapa id → nombre del contexto de
+    validación, por su *_id (sin joins ni lazy loads). Sin el mapa se valida el
+    objeto tal cual.
+    """
+    names = (info.context or {}).get(DIMENSION_NAMES_CONTEXT)
+    if names is None or isinstance(data, dict):
+        return data
+    values = {
+        field: getattr(data, field)
+        for field in cls.model_fields
+        if field not in names
+    }
+    for dimension, names_by_id in names.items():
+        name = names_by_id.get(getattr(data, f"{dimension}_id"))
+        values[dimension] = {"name": name} if name is not None else None
+    return values
+
 # ----------------------
 # Worker schema principal
 # ----------------------
@@ -62,4 +87,47 @@ class WorkerRead(SQLModel):
     # Relaciones anidadas
     schedules:         List[ScheduleRead]        = []
     ubycall_schedules: List[UbycallScheduleRead] = []
-    attendances:       List[AttendanceRead]      = []
\ No newline at end of file
+    attendances:       List[AttendanceRead]      = []
+
+    @model_validator(mode="before")
+    @classmethod
+    def _dimensions_from_context(cls, data: Any, info: ValidationInfo) -> Any:
+        return with_dimension_names(cls, data, info)
+
+# ----------------------
+# Historia de workers (SCD2)
+# ----------------------
+class WorkerHistoryRead(SQLModel):
+    document: str
+    name: str
+
+    role: Optional[RoleRead]
+    status: Optional[StatusRead]
+    campaign: Optional[CampaignRead]
+    team: Optional[TeamRead]
+    work_type: Optional[WorkTypeRead]
+    contract_type: Optional[ContractTypeRead]
+
+    manager: Optional[str]
+    supervisor: Optional[str]
+    coordinator: Optional[str]
+    start_date: Optional[date]
+    termination_date: Optional[date]
+    requirement_id: Optional[str]
+    api_id: Optional[str]
+    api_name: Optional[str]
+    api_email: Optional[str]
+    observation_1: Optional[str]
+    observation_2: Optional[str]
+    tenure: Optional[int]
+    trainee: Optional[str]
+    productive: Optional[str]
+
+    row_hash: str
+    valid_from: datetime
+    valid_to: Optional[datetime]
+
+    @model_validator(mode="before")
+    @classmethod
+    def _dimensions_from_context(cls, data: Any, info: ValidationInfo) -> Any:
+        return with_dimension_names(cls, data, info)
@@ -8,6 +8,9 @@ import io
 from sqlalchemy import text
 
 from app.services.utils.upload_service import handle_file_upload_generic
+from app.services.utils.upload_jobs import record_stage
+from app.services.utils.roster_snapshot import refresh_roster_snapshot
+from app.database.partitions import ATTENDANCE_RETENTION_WEEKS, ensure_partitions, drop_partitions_before, week_start
 from app.utils.validators.validate_excel_attendance import validate_excel_attendance
 from app.core.workers_attendance.attendance import clean_attendance
 from app.models.worker import Worker, Schedule, Attendance
@@ -37,6 +40,7 @@ async def process_and_persist_attendance(
             traceback.print_exc()
             raise HTTPException(status_code=400, detail=f"Error al leer archivo: {e}")
         print(f"✅ [ATT-STEP 1] Lectura completada en {time_mod.perf_counter() - t1:.3f}s")
+        record_stage("read", time_mod.perf_counter() - t1)
 
         # 2️⃣ Limpieza
         t2 = time_mod.perf_counter()
@@ -50,6 +54,7 @@ async def process_and_persist_attendance(
             traceback.print_exc()
             raise HTTPException(status_code=400, detail=f"Error al limpiar data: {e}")
         print(f"✅ [ATT-STEP 2] Limpieza completada en {time_mod.perf_counter() - t2:.3f}s")
+        record_stage("clean", time_mod.perf_counter() - t2)
         print(f"ℹ️ [ATT] Registros procesados: {len(df_attendance)}")
 
         # 3️⃣ target_date
@@ -57,13 +62,18 @@ async def process_and_persist_attendance(
             target_date = df_attendance["date"].iloc[0]
         print(f"📅 [ATT-STEP 3] target_date={target_date}")
 
-        # 4️⃣ DELETE optimizado (RAW SQL → ~100ms)
+        # 4️⃣ DELETE del día (solo toca la partición de su semana) + retención por particiones
         t4 = time_mod.perf_counter()
         session.exec(
             text("DELETE FROM attendance WHERE date = :d").bindparams(d=target_date)
         )
+        if ATTENDANCE_RETENTION_WEEKS > 0:
+            drop_partitions_before(
+                session, "attendance", week_start(target_date) - timedelta(weeks=ATTENDANCE_RETENTION_WEEKS)
+            )
         session.commit()
         print(f"🧹 [ATT-STEP 4] Purga completada en {time_mod.perf_counter() - t4:.3f}s")
+        record_stage("purge", time_mod.perf_counter() - t4)
 
         # 5️⃣ Precarga
         t5a = time_mod.perf_counter()
@@ -81,6 +91,7 @@ async def process_and_persist_attendance(
         ).all()
         schedule_map = {(s.worker_document, s.start_date): s for s in schedules}
         print(f"🗓️ [ATT-STEP 5.2] Schedules cargados: {len(schedule_map)} | Tiempo precarga: {time_mod.perf_counter() - t5a:.3f}s")
+        record_stage("preload", time_mod.perf_counter() - t5a)
 
         # 6️⃣ Loop principal
         t6 = time_mod.perf_counter()
@@ -184,6 +195,7 @@ async def process_and_persist_attendance(
                 inserted += 1
 
         loop_time = time_mod.perf_counter() - t6
+        record_stage("build", loop_time)
         print(
             f"✅ [ATT-STEP 6] Loop completado en {loop_time:.3f}s | "
             f"Insertados={inserted} | MissingWorkers={len(missing_workers)} | "
@@ -194,6 +206,9 @@ async def process_and_persist_attendance(
         t7 = time_mod.perf_counter()
 
         if records:
+            record_dates = [r[1] for r in records]
+            ensure_partitions(session, "attendance", min(record_dates), max(record_dates))
+
             buffer = io.StringIO()
             for r in records:
                 co_value = r[3] if r[3] else "\\N"
@@ -216,6 +231,8 @@ async def process_and_persist_attendance(
             cursor.close()
 
         print(f"💾 [ATT-STEP 7] COPY insert completado en {time_mod.perf_counter() - t7:.3f}s")
+        record_stage("insert", time_mod.perf_counter() - t7)
+        refresh_roster_snapshot("carga de asistencias")
 
         total_time = time_mod.perf_counter() - start_total
         print(f"🏁 [ATT] Proceso completo OK | Insertados={inserted} | Tiempo total={total_time:.3f}s\n")
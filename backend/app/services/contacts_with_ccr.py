@@ -1,6 +1,7 @@
 from fastapi import UploadFile, HTTPException
-from app.services.utils.upload_service import handle_file_upload_generic
-from app.core.contacts_with_ccr.clean_contacts_with_ccr import clean_contacts_with_ccr
+from app.services.utils.upload_service import handle_file_upload_chunked
+from app.services.utils.upload_schemas import UploadSchemaError
+from app.core.contacts_with_ccr.clean_contacts_with_ccr import clean_contacts_with_ccr_chunks
 from app.models.real_time_data import RealTimeData
 from datetime import date, datetime
 from sqlmodel import Session, delete, select
@@ -11,12 +12,13 @@ from app.crud.contacts_with_ccr import upsert_contacts_with_ccr
 
 async def contacts_with_ccr_service(file1: UploadFile, session: Session):
     try:
-        df_received, df_reason = await handle_file_upload_generic(
+        # Export leído por chunks: se filtra y agrega por partes sin cargarlo completo
+        df_received, df_reason = await handle_file_upload_chunked(
             files=[file1],
             validator=validate_excel_contacts_with_ccr,
             keyword_to_slot=CONTACTS_MAPPING,
             required_slots=list(CONTACTS_MAPPING.values()),
-            post_process=clean_contacts_with_ccr
+            post_process=clean_contacts_with_ccr_chunks
         )
 
         df_received = df_received.where(pd.notnull(df_received), None)
@@ -34,6 +36,8 @@ async def contacts_with_ccr_service(file1: UploadFile, session: Session):
         return result
 
 
+    except UploadSchemaError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"❌ Error inesperado en contacts_with_ccr_service: {e}")
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
@@ -1,6 +1,6 @@
 from fastapi import UploadFile, HTTPException
-from app.services.utils.upload_service import handle_file_upload_generic
-from app.core.real_time_data.clean_real_time_data import clean_real_time_data
+from app.services.utils.upload_service import handle_file_upload_chunked
+from app.core.real_time_data.clean_real_time_data import clean_real_time_data_chunks
 from app.models.real_time_data import RealTimeData
 from datetime import date, datetime
 from sqlmodel import Session, delete, select
@@ -39,12 +39,13 @@ async def real_time_data_service(file1: UploadFile, session: Session):
     print("🟢 Iniciando procesamiento del archivo:", file1.filename)
 
     try:
-        df = await handle_file_upload_generic(
+        # Export leído por chunks: sumas parciales por (team, date, interval)
+        df = await handle_file_upload_chunked(
             files=[file1],
             validator=validate_excel_real_time_data,
             keyword_to_slot=_KPI_SLOTS,
             required_slots=_REQUIRED_KPI,
-            post_process=lambda real_time_data, **kw: clean_real_time_data(real_time_data),
+            post_process=lambda real_time_data, **kw: clean_real_time_data_chunks(real_time_data),
         )
         print("✅ Archivo procesado correctamente. Columnas:", df.columns.tolist())
         print("✅ Filas:", len(df))
@@ -1,18 +1,27 @@
 import pandas as pd
 from fastapi import HTTPException, UploadFile
 from typing import List
-from datetime import date, timedelta
-from sqlmodel import Session, select, delete, and_, func
+from datetime import timedelta
+from sqlmodel import Session, select
+import os
 import time
 import datetime
 
 from app.services.utils.upload_service import handle_file_upload_generic
+from app.services.utils.upload_schemas import UploadSchemaError
+from app.services.utils.upload_jobs import record_stage
+from app.services.utils.roster_snapshot import refresh_roster_snapshot
 from app.utils.validators.validate_excel_schedule import validate_excel_schedule
-from app.core.workers_schedule.schedule_concentrix import schedule_concentrix
+from app.core.workers_schedule.schedule_concentrix import schedule_concentrix_weeks
 from app.core.workers_schedule.schedule_ubycall import schedule_ubycall
 from app.core.workers_schedule.schedule_concentrix_ppp import schedule_ppp
-from app.models.worker import Worker, Schedule, UbycallSchedule
-from app.core.utils.workers_cx.columns_names import DOCUMENT, DATE, START_TIME, END_TIME, DAY, BREAK_START, BREAK_END, REST_DAY
+from app.models.worker import Worker
+from app.crud.schedule import bulk_upsert_schedules, bulk_insert_ubycall_schedules
+from app.database.partitions import ensure_partitions, drop_partitions_before
+from app.core.utils.workers_cx.columns_names import DOCUMENT, DATE, START_DATE, START_TIME, END_TIME, DAY, BREAK_START, BREAK_END, REST_DAY
+
+# Semanas (archivos schedule_concentrix) que se aceptan en una sola carga
+SCHEDULE_MAX_WEEKS = int(os.getenv("SCHEDULE_MAX_WEEKS", "8"))
 
 def merge_schedule_concentrix(df_conc, df_ppp):
     # Asegurar mismo tipo
@@ -66,20 +75,39 @@ def merge_schedule_concentrix(df_conc, df_ppp):
     print(df_merged[df_merged['document'] == '76122968'])
     return df_merged
 
-# Función para dividir los registros en lotes de un tamaño determinado (por defecto, 2000 registros)
-def chunked(iterable, size=2000):
-    for i in range(0, len(iterable), size):
-        yield iterable[i:i + size]
-
 async def process_and_persist_schedules(
     files: List[UploadFile],
     session: Session,
     week: int | None = None,
     year: int | None = None,
+    weeks: int | None = None,
 ) -> dict:
+    """
+    Carga de horarios de una o varias semanas seguidas en una sola subida: cada archivo
+    schedule_concentrix es una semana, en el orden de subida, empezando en `week`/`year`
+    (`weeks`, si llega, debe coincidir con la cantidad). PPP y Ubycall pueden venir en
+    uno o varios archivos que cubran el rango y people_obs en uno con todas sus fechas.
+    Todo se limpia junto y se persiste en una transacción; el resumen trae conteos por semana.
+    """
     start_total = time.perf_counter()
     print("\n📂 [SCHEDULES] Iniciando process_and_persist_schedules (multi-horario Ubycall)")
 
+    # Semanas = archivos Concentrix (se valida antes de parsear nada)
+    conc_files = [
+        f.filename for f in files
+        if "schedule_concentrix" in validate_excel_schedule(f.filename).lower()
+    ]
+    if weeks is not None and weeks != len(conc_files):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Se indicaron {weeks} semanas pero llegaron {len(conc_files)} archivos schedule_concentrix",
+        )
+    if len(conc_files) > SCHEDULE_MAX_WEEKS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Máximo {SCHEDULE_MAX_WEEKS} semanas por carga (llegaron {len(conc_files)})",
+        )
+
     old_autoflush = session.autoflush
     old_expire_on_commit = session.expire_on_commit
     session.autoflush = False
@@ -88,7 +116,7 @@ async def process_and_persist_schedules(
     try:
         # Tiempo 1: Lectura de archivos
         t1 = time.perf_counter()
-        df_conc_raw, people_obs_raw, df_uby_raw, df_ppp_raw = await handle_file_upload_generic(
+        conc_frames, people_obs_raw, uby_frames, ppp_frames = await handle_file_upload_generic(
             files=files,
             validator=validate_excel_schedule,
             keyword_to_slot={
@@ -99,11 +127,13 @@ async def process_and_persist_schedules(
             },
             required_slots=["schedule_concentrix", "people_obs", "schedule_ubycall", "schedule_ppp"],
             post_process=lambda conc, people, uby, ppp: (conc, people, uby, ppp),
+            multi_slots=("schedule_concentrix", "schedule_ubycall", "schedule_ppp"),
         )
         t2 = time.perf_counter()
         print(f"⏳ Tiempo 1 (Lectura de archivos): {t2 - t1:.4f} segundos")
+        record_stage("read", t2 - t1)
 
-        # Tiempo 2: Cálculo de semana
+        # Tiempo 2: Cálculo de semanas
         t3 = time.perf_counter()
         today = datetime.date.today()
         iso_year, iso_week, _ = today.isocalendar()
@@ -112,55 +142,30 @@ async def process_and_persist_schedules(
         week = week or iso_week
 
         monday_curr = datetime.date.fromisocalendar(year, week, 1)
-        sunday_curr = monday_curr + timedelta(days=6)
+        mondays = [monday_curr + timedelta(weeks=i) for i in range(len(conc_frames))]
+        sunday_last = mondays[-1] + timedelta(days=6)
         monday_prev = monday_curr - timedelta(days=7)
 
         t4 = time.perf_counter()
-        print(f"⏳ Tiempo 2 (Cálculo de semana): {t4 - t3:.4f} segundos")
+        print(f"⏳ Tiempo 2 (Cálculo de semanas): {t4 - t3:.4f} segundos")
+        record_stage("week", t4 - t3)
         print(today)
-        print(monday_curr)
-        # Tiempo 3: Purga histórica
-        t5 = time.perf_counter()
-        session.exec(delete(Schedule).where(Schedule.start_date < monday_prev))
-        session.exec(delete(UbycallSchedule).where(UbycallSchedule.date < monday_prev))
-        t6 = time.perf_counter()
-        print(f"⏳ Tiempo 3 (Purga histórica): {t6 - t5:.4f} segundos")
-
-        # Tiempo 4: Purga histórica de duplicados
-        t7 = time.perf_counter()
-        duplicated_schedules = session.exec(
-            select(Schedule.worker_document, Schedule.start_date)
-            .group_by(Schedule.worker_document, Schedule.start_date)
-            .having(func.count(Schedule.id) > 1)
-        ).all()
-
-        for doc, date in duplicated_schedules:
-            duplicate_records = session.exec(
-                select(Schedule).where(
-                    and_(Schedule.worker_document == doc, Schedule.start_date == date)
-                )
-            ).all()
-
-            duplicate_records_sorted = sorted(duplicate_records, key=lambda x: x.id)
-            records_to_delete = duplicate_records_sorted[:-1]
-
-            if records_to_delete:
-                for record in records_to_delete:
-                    session.delete(record)
-        session.commit()
-        t8 = time.perf_counter()
-        print(f"⏳ Tiempo 4 (Purga histórica de duplicados): {t8 - t7:.4f} segundos")
-
-        # Tiempo 5: Procesar dataframes
+        for name, monday in zip(conc_files, mondays):
+            print(f"🗓️ [SCHEDULES] {name} → semana del {monday}")
+        # Tiempo 4: Procesar dataframes
         t9 = time.perf_counter()
-        df_conc = schedule_concentrix(df_conc_raw, people_obs_raw, week=week, year=year)
-        df_ppp = schedule_ppp(df_ppp_raw)
+        df_conc = schedule_concentrix_weeks(list(zip(conc_frames, mondays)), people_obs_raw)
+        df_ppp = pd.concat([schedule_ppp(frame) for frame in ppp_frames], ignore_index=True)
+        if len(ppp_frames) > 1:
+            # Archivos PPP que se solapan: gana el último subido
+            df_ppp = df_ppp.drop_duplicates(subset=[DOCUMENT, START_DATE], keep="last")
         df_conc = merge_schedule_concentrix(df_conc, df_ppp)
-        df_uby = schedule_ubycall(df_uby_raw)
+        df_uby = schedule_ubycall(pd.concat(uby_frames, ignore_index=True))
         t10 = time.perf_counter()
-        print(f"⏳ Tiempo 5 (Procesar dataframes): {t10 - t9:.4f} segundos")
+        print(f"⏳ Tiempo 4 (Procesar dataframes): {t10 - t9:.4f} segundos")
+        record_stage("clean", t10 - t9)
 
-        # Tiempo 6: Calcular documentos existentes
+        # Tiempo 5: Calcular documentos existentes
         t11 = time.perf_counter()
         conc_docs = set(df_conc[DOCUMENT].astype(str).str.strip())
         uby_docs = set(df_uby[DOCUMENT].astype(str).str.strip())
@@ -168,93 +173,34 @@ async def process_and_persist_schedules(
         existing_docs = set(session.exec(select(Worker.document).where(Worker.document.in_(all_docs))).all())
         missing_docs = sorted(all_docs - existing_docs)
         t12 = time.perf_counter()
-        print(f"⏳ Tiempo 6 (Calcular documentos existentes): {t12 - t11:.4f} segundos")
+        print(f"⏳ Tiempo 5 (Calcular documentos existentes): {t12 - t11:.4f} segundos")
+        record_stage("existing_documents", t12 - t11)
 
-        # Tiempo 7: Comparar y construir (optimizado)
+        # Tiempo 6: Construir registros (solo documentos existentes)
         t13 = time.perf_counter()
 
         conc_records = []
-        uby_records = []
-        inserted_conc = inserted_uby = 0
-
-        # ============================================================
-        # 1. Cargar TODOS los schedules existentes en memoria
-        # ============================================================
-
-        existing_conc = {
-            (s.worker_document, s.start_date): s
-            for s in session.exec(select(Schedule)).all()
-        }
-
-        existing_uby = {
-            (s.worker_document, s.date, s.start_time, s.end_time): True
-            for s in session.exec(select(UbycallSchedule)).all()
-        }
-
-        # ============================================================
-        # 2. Procesar Concentrix en memoria (sin consultas en bucle)
-        # ============================================================
-
         for row in df_conc.itertuples(index=False):
             doc = str(row.document).strip()
-
             if doc not in existing_docs:
                 continue
-            
-            key = (doc, row.start_date)
-
-            existing = existing_conc.get(key)
-
-            if existing:
-                # UPDATE rápido sin queries
-                changed = False
-
-                # Campos directos
-                fields = [
-                    ("start_time", row.start_time),
-                    ("end_time", row.end_time),
-                    ("break_start", getattr(row, "break_start", None)),
-                    ("break_end", getattr(row, "break_end", None)),
-                    ("is_rest_day", bool(getattr(row, "rest_day", False))),
-                    ("obs", getattr(row, "obs", None)),
-                ]
-
-                for attr, new_value in fields:
-                    if getattr(existing, attr) != new_value:
-                        setattr(existing, attr, new_value)
-                        changed = True
-
-                if changed:
-                    session.add(existing)
-
-            else:
-                conc_records.append({
-                    "worker_document": doc,
-                    "start_date": row.start_date,
-                    "end_date": row.end_date,
-                    "start_time": row.start_time,
-                    "end_time": row.end_time,
-                    "break_start": getattr(row, "break_start", None),
-                    "break_end": getattr(row, "break_end", None),
-                    "is_rest_day": bool(getattr(row, "rest_day", False)),
-                    "obs": getattr(row, "obs", None),
-                })
-
-        # ============================================================
-        # 3. Procesar Ubycall (evita queries y duplicados)
-        # ============================================================
+            conc_records.append({
+                "worker_document": doc,
+                "start_date": row.start_date,
+                "end_date": row.end_date,
+                "start_time": row.start_time,
+                "end_time": row.end_time,
+                "break_start": getattr(row, "break_start", None),
+                "break_end": getattr(row, "break_end", None),
+                "is_rest_day": bool(getattr(row, "rest_day", False)),
+                "obs": getattr(row, "obs", None),
+            })
 
+        uby_records = []
         for row in df_uby.itertuples(index=False):
             doc = str(row.document).strip()
-
             if doc not in existing_docs:
                 continue
-
-            key = (doc, row.date, row.start_time, row.end_time)
-
-            if key in existing_uby:
-                continue  # Ya existe en DB
-
             uby_records.append({
                 "worker_document": doc,
                 "date": row.date,
@@ -264,33 +210,73 @@ async def process_and_persist_schedules(
             })
 
         t14 = time.perf_counter()
-        print(f"⏳ Tiempo 7 (Comparar y construir optimizado): {t14 - t13:.4f} segundos")
+        print(f"⏳ Tiempo 6 (Construir registros): {t14 - t13:.4f} segundos")
+        record_stage("build", t14 - t13)
 
-
-        # Tiempo 8: Inserciones por lotes
+        # Tiempo 7: COPY a staging + upsert de las semanas, una transacción (sin leer el histórico en Python)
         t15 = time.perf_counter()
-        if conc_records or uby_records:
-            for batch in chunked(conc_records, 2000):
-                session.bulk_insert_mappings(Schedule, batch)
-                inserted_conc += len(batch)
-            for batch in chunked(uby_records, 2000):
-                session.bulk_insert_mappings(UbycallSchedule, batch)
-                inserted_uby += len(batch)
-        session.flush()
+        ensure_partitions(session, "schedule", monday_curr, sunday_last)
+        if uby_records:
+            uby_dates = [r["date"] for r in uby_records]
+            ensure_partitions(session, "ubycallschedule", min(uby_dates), max(uby_dates))
+        conc_counts = bulk_upsert_schedules(session, conc_records, monday_curr, sunday_last)
+        uby_counts = bulk_insert_ubycall_schedules(session, uby_records)
         session.commit()
         t16 = time.perf_counter()
-        print(f"⏳ Tiempo 8 (Inserciones por lotes): {t16 - t15:.4f} segundos")
+        print(f"⏳ Tiempo 7 (COPY + upsert): {t16 - t15:.4f} segundos")
+        record_stage("insert", t16 - t15)
+
+        # Tiempo 8: Purga histórica (retención por particiones semanales, sin DELETE).
+        # Solo después de un upsert confirmado: si la carga falla, el histórico queda
+        # intacto. Va en su propia transacción corta (quitar particiones bloquea la
+        # tabla padre hasta el commit); si falla, la carga ya está guardada y la
+        # próxima carga vuelve a intentarlo
+        t5 = time.perf_counter()
+        try:
+            drop_partitions_before(session, "schedule", monday_prev)
+            drop_partitions_before(session, "ubycallschedule", monday_prev)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            print(f"⚠️ [SCHEDULES] No se pudo aplicar la retención de particiones: {e}")
+        t6 = time.perf_counter()
+        print(f"⏳ Tiempo 8 (Purga histórica): {t6 - t5:.4f} segundos")
+        record_stage("purge", t6 - t5)
+        refresh_roster_snapshot("carga de horarios")
 
         # Tiempo total
         end_total = time.perf_counter()
         print(f"🕒 Tiempo total: {end_total - start_total:.4f} segundos")
 
+        # Resumen por semana: las de Concentrix y las que solo trajo Ubycall
+        week_files = dict(zip(mondays, conc_files))
+        summary = []
+        for monday in sorted(set(mondays) | set(uby_counts)):
+            counts = conc_counts.get(monday, {})
+            iso = monday.isocalendar()
+            summary.append({
+                "year": iso[0],
+                "week": iso[1],
+                "start_date": monday.isoformat(),
+                "file": week_files.get(monday),
+                "inserted_concentrix": counts.get("inserted", 0),
+                "updated_concentrix": counts.get("updated", 0),
+                "unchanged_concentrix": counts.get("unchanged", 0),
+                "inserted_ubycall": uby_counts.get(monday, 0),
+            })
+
         return {
-            "inserted_concentrix": inserted_conc,
-            "inserted_ubycall": inserted_uby,
+            "inserted_concentrix": sum(w["inserted_concentrix"] for w in summary),
+            "updated_concentrix": sum(w["updated_concentrix"] for w in summary),
+            "inserted_ubycall": sum(w["inserted_ubycall"] for w in summary),
+            "weeks": summary,
             "missing_workers": missing_docs
         }
 
+    except HTTPException:
+        raise
+    except UploadSchemaError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         session.rollback()
         print("❌ [SCHEDULES] Error inesperado en process_and_persist_schedules:")
@@ -0,0 +1,147 @@
+import os
+import time
+import asyncio
+import hashlib
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+from pydantic import TypeAdapter
+from sqlmodel import Session, select
+from sqlalchemy.orm import selectinload, with_loader_criteria
+
+from app.database.database import engine
+from app.models.worker import Worker, Schedule, UbycallSchedule
+from app.schemas.worker import WorkerRead
+from app.crud.dimension_cache import validate_with_dimensions
+from app.crud.snapshot_version import bump_snapshot_version, get_snapshot_version
+
+# El "día" del padrón (horarios de hoy y ayer) es el de Perú
+PERU_TZ = timezone(timedelta(hours=-5))
+# Tope de antigüedad del snapshot: respaldo para cambios que no pasan por las cargas
+# (las cargas de cualquier proceso suben la versión en SnapshotVersion)
+ROSTER_SNAPSHOT_MAX_AGE_S = float(os.getenv("ROSTER_SNAPSHOT_MAX_AGE_S", "300"))
+# Nombre del snapshot en SnapshotVersion
+ROSTER_SNAPSHOT_NAME = "roster"
+
+_workers_adapter = TypeAdapter(List[WorkerRead])
+
+
+@dataclass(frozen=True)
+class RosterSnapshot:
+    body: bytes       # JSON ya serializado de List[WorkerRead]
+    etag: str
+    day: date         # día de Perú con el que se filtraron los horarios
+    version: int      # SnapshotVersion leída antes de consultar los datos
+    built_at: float   # time.monotonic()
+    workers: int
+
+
+_snapshot: Optional[RosterSnapshot] = None
+_build_lock = threading.Lock()
+
+
+def peru_today() -> date:
+    return datetime.now(PERU_TZ).date()
+
+
+def build_roster_snapshot(session: Session) -> RosterSnapshot:
+    """
+    Serializa el padrón completo como lo devolvía GET /workers/: workers con sus
+    horarios (Concentrix y Ubycall) de hoy y ayer y sus asistencias.
+    """
+    # La versión se lee antes que los datos: si una carga la sube mientras tanto,
+    # el snapshot queda con la anterior y se reconstruye en el próximo GET
+    version = get_snapshot_version(session, ROSTER_SNAPSHOT_NAME)
+    current_day = peru_today()
+    previous_day = current_day - timedelta(days=1)
+    statement = (
+        select(Worker)
+        .options(
+            selectinload(Worker.schedules),
+            selectinload(Worker.ubycall_schedules),
+            selectinload(Worker.attendances),
+            with_loader_criteria(
+                Schedule,
+                Schedule.start_date.in_([current_day, previous_day])
+            ),
+            with_loader_criteria(
+                UbycallSchedule,
+                UbycallSchedule.date.in_([current_day, previous_day])
+            ),
+        )
+    )
+    workers = session.exec(statement).all()
+
+    body = _workers_adapter.dump_json(validate_with_dimensions(session, _workers_adapter, workers))
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    return RosterSnapshot(
+        body=body, etag=etag, day=current_day, version=version, built_at=time.monotonic(), workers=len(workers)
+    )
+
+
+def refresh_roster_snapshot(reason: str, data_changed: bool = True) -> Optional[RosterSnapshot]:
+    """
+    Reconstruye el snapshot con una sesión propia (después del commit de una carga,
+    o al cambiar el día). Si cambiaron los datos sube antes la versión en la BD, así
+    los demás procesos descartan el suyo en el próximo GET. Best-effort: si falla
+    se descarta el actual y el próximo GET lo reconstruye.
+    """
+    global _snapshot
+    t0 = time.perf_counter()
+    try:
+        with _build_lock, Session(engine) as session:
+            if data_changed:
+                bump_snapshot_version(session, ROSTER_SNAPSHOT_NAME)
+            snapshot = build_roster_snapshot(session)
+            _snapshot = snapshot
+    except Exception as e:
+        _snapshot = None
+        print(f"⚠️ [ROSTER] No se pudo reconstruir el snapshot ({reason}): {e}")
+        return None
+    print(
+        f"📸 [ROSTER] Snapshot reconstruido ({reason}): {snapshot.workers} workers, "
+        f"{len(snapshot.body) / 1024:.0f} KB en {time.perf_counter() - t0:.3f}s"
+    )
+    return snapshot
+
+
+def _is_fresh(snapshot: Optional[RosterSnapshot], version: int) -> bool:
+    return (
+        snapshot is not None
+        and snapshot.version >= version  # otro hilo pudo construirlo con una más nueva
+        and snapshot.day == peru_today()
+        and time.monotonic() - snapshot.built_at < ROSTER_SNAPSHOT_MAX_AGE_S
+    )
+
+
+def get_roster_snapshot(session: Session) -> RosterSnapshot:
+    """
+    Snapshot vigente. En cada GET solo se lee la versión en la BD (una fila); el
+    padrón se reconstruye si no hay snapshot, otra carga (de cualquier proceso)
+    subió la versión, cambió el día de Perú o venció. Con el lock, requests
+    concurrentes sobre un snapshot vencido lo construyen una vez.
+    """
+    global _snapshot
+    version = get_snapshot_version(session, ROSTER_SNAPSHOT_NAME)
+    snapshot = _snapshot
+    if _is_fresh(snapshot, version):
+        return snapshot
+    with _build_lock:
+        if not _is_fresh(_snapshot, version):
+            _snapshot = build_roster_snapshot(session)
+        return _snapshot
+
+
+def _seconds_until_next_peru_day() -> float:
+    now = datetime.now(PERU_TZ)
+    tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=PERU_TZ)
+    return (tomorrow - now).total_seconds()
+
+
+async def roster_rollover_loop() -> None:
+    """Tarea del lifespan: reconstruye el snapshot justo después de la medianoche de Perú."""
+    while True:
+        await asyncio.sleep(_seconds_until_next_peru_day() + 1)
+        await asyncio.to_thread(refresh_roster_snapshot, "cambio de día", False)
@@ -0,0 +1,285 @@
+import os
+import json
+import hashlib
+import tempfile
+import pandas as pd
+from datetime import date, datetime, time
+from typing import Any, BinaryIO, Dict, Optional
+
+try:
+    import pyarrow as pa
+except ImportError:  # sin pyarrow no hay caché (solo se guarda en Arrow IPC)
+    pa = None
+
+# Caché en disco de DataFrames ya parseados, direccionado por contenido:
+# clave = sha256(bytes del archivo) + config de lectura + versión del lector.
+# Guarda datos de personal (documentos, nombres): el directorio es propio de la app
+# (modo 0700, no el temporal compartido) y solo se escribe Arrow IPC + JSON, nunca pickle.
+UPLOAD_CACHE_ENABLED = os.getenv("UPLOAD_CACHE_ENABLED", "1") == "1"
+UPLOAD_CACHE_DIR = os.getenv(
+    "UPLOAD_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "gtr_upload_cache")
+)
+UPLOAD_CACHE_MAX_MB = float(os.getenv("UPLOAD_CACHE_MAX_MB", "512"))
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+_ARROW_EXT = ".arrow"
+_COLUMNS_META_KEY = b"gtr_columns"
+_DIR_MODE = 0o700
+_dir_ready: Optional[bool] = None
+
+# Contadores del proceso principal (los workers del pool devuelven el resultado en sus stats)
+CACHE_STATS: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0}
+
+
+def hash_stream(file_stream: BinaryIO) -> str:
+    """sha256 del contenido recorriendo el handle por bloques; lo deja al inicio."""
+    digest = hashlib.sha256()
+    file_stream.seek(0)
+    while True:
+        chunk = file_stream.read(_HASH_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+    file_stream.seek(0)
+    return digest.hexdigest()
+
+
+def make_key(content_hash: str, keyword: str, params: Dict[str, Any], reader_version: int) -> str:
+    """Combina hash del contenido con la config de lectura: misma data + otra config = otra entrada."""
+    config = json.dumps(
+        {"keyword": keyword, "params": params, "reader_version": reader_version},
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(f"{content_hash}:{config}".encode()).hexdigest()
+
+
+def _cache_dir_ready() -> bool:
+    """
+    Crea el directorio del caché con modo 0700 y comprueba que sea del usuario del
+    proceso y que nadie más pueda escribir en él; si no, el caché queda apagado.
+    Se evalúa una vez por proceso.
+    """
+    global _dir_ready
+    if _dir_ready is not None:
+        return _dir_ready
+    try:
+        os.makedirs(UPLOAD_CACHE_DIR, mode=_DIR_MODE, exist_ok=True)
+        st = os.lstat(UPLOAD_CACHE_DIR)
+        if not os.path.isdir(UPLOAD_CACHE_DIR) or os.path.islink(UPLOAD_CACHE_DIR):
+            raise PermissionError("no es un directorio")
+        if hasattr(os, "getuid"):
+            if st.st_uid != os.getuid():
+                raise PermissionError("pertenece a otro usuario")
+            if st.st_mode & 0o077:
+                os.chmod(UPLOAD_CACHE_DIR, _DIR_MODE)
+        _dir_ready = True
+    except OSError as e:
+        print(f"⚠️ [UPLOAD-CACHE] Caché desactivado, directorio {UPLOAD_CACHE_DIR} no utilizable: {e}")
+        _dir_ready = False
+    return _dir_ready
+
+
+def _entry_path(key: str) -> str:
+    return os.path.join(UPLOAD_CACHE_DIR, key + _ARROW_EXT)
+
+
+def load(key: str) -> Optional[pd.DataFrame]:
+    """Devuelve el DataFrame cacheado (Arrow mapeado en memoria) o None."""
+    if pa is None or not _cache_dir_ready():
+        return None
+    path = _entry_path(key)
+    try:
+        if not os.path.exists(path):
+            return None
+        df = _load_arrow(path)
+        os.utime(path)  # marca de uso para el LRU
+        return df
+    except Exception as e:
+        # Entrada corrupta o borrada por otro proceso a mitad de lectura: se trata como miss
+        print(f"⚠️ [UPLOAD-CACHE] No se pudo leer la entrada {key[:12]}: {e}")
+        return None
+
+
+def _encode_label(value: Any) -> Any:
+    """Nombre de columna → valor JSON; tuplas, fechas y horas van etiquetadas para volver con su tipo."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, tuple):
+        return {"tuple": [_encode_label(v) for v in value]}
+    if isinstance(value, pd.Timestamp):
+        return {"timestamp": value.isoformat()}
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    if isinstance(value, time):
+        return {"time": value.isoformat()}
+    raise TypeError(f"nombre de columna no serializable: {type(value).__name__}")
+
+
+def _decode_label(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    (kind, raw), = value.items()
+    if kind == "tuple":
+        return tuple(_decode_label(v) for v in raw)
+    if kind == "timestamp":
+        return pd.Timestamp(raw)
+    if kind == "datetime":
+        return datetime.fromisoformat(raw)
+    if kind == "date":
+        return date.fromisoformat(raw)
+    if kind == "time":
+        return time.fromisoformat(raw)
+    raise ValueError(f"etiqueta desconocida: {kind}")
+
+
+def _encode_columns(columns: pd.Index) -> Dict[str, Any]:
+    """Encabezados (Index o MultiIndex, con nombres y dtype) en JSON."""
+    return {
+        "multi": isinstance(columns, pd.MultiIndex),
+        "dtype": str(columns.dtype),
+        "names": [_encode_label(name) for name in columns.names],
+        "labels": [_encode_label(label) for label in columns],
+    }
+
+
+def _decode_columns(meta: Dict[str, Any]) -> pd.Index:
+    names = [_decode_label(name) for name in meta["names"]]
+    labels = [_decode_label(label) for label in meta["labels"]]
+    if meta["multi"]:
+        return pd.MultiIndex.from_tuples(labels, names=names)
+    return pd.Index(labels, dtype=meta["dtype"], name=names[0])
+
+
+def _load_arrow(path: str) -> pd.DataFrame:
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    columns = _decode_columns(json.loads(table.schema.metadata[_COLUMNS_META_KEY]))
+    df = table.to_pandas()
+    df.columns = columns
+    # Arrow devuelve None donde pandas tenía NaN en columnas object
+    for i, dtype in enumerate(df.dtypes):
+        if dtype == object:
+            col = df.iloc[:, i]
+            if col.isna().any():
+                df.isetitem(i, col.where(col.notna(), float("nan")))
+    return df
+
+
+def _to_arrow_table(df: pd.DataFrame):
+    """
+    Convierte a Arrow solo si la vuelta a pandas es exacta. Los nombres de columna
+    (MultiIndex, fechas, duplicados) se guardan aparte como JSON en la metadata del
+    esquema y las columnas se renombran por posición; si algún dtype o nombre no
+    sobrevive la ida y vuelta devuelve None (el DataFrame no se cachea).
+    """
+    if pa is None:
+        return None
+    try:
+        columns_meta = _encode_columns(df.columns)
+        if _encode_columns(_decode_columns(columns_meta)) != columns_meta:
+            return None
+    except (TypeError, ValueError):
+        return None
+    positional = df.copy(deep=False)
+    positional.columns = [f"c{i}" for i in range(df.shape[1])]
+    try:
+        table = pa.Table.from_pandas(positional)
+        back = table.slice(0, 0).to_pandas()
+    except Exception:
+        return None
+    if not back.dtypes.reset_index(drop=True).equals(df.dtypes.reset_index(drop=True)):
+        return None
+    if not back.index.equals(df.index[:0]) or type(back.index) is not type(df.index):
+        return None
+    metadata = dict(table.schema.metadata or {})
+    metadata[_COLUMNS_META_KEY] = json.dumps(columns_meta).encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def store(key: str, df: pd.DataFrame) -> bool:
+    """Guarda el DataFrame en Arrow IPC (si la conversión es fiel) y aplica el tope de tamaño."""
+    if not _cache_dir_ready():
+        return False
+    try:
+        table = _to_arrow_table(df)
+        if table is None:
+            return False
+
+        # Escritura atómica: otro proceso nunca ve una entrada a medias
+        fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, _entry_path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    except Exception as e:
+        print(f"⚠️ [UPLOAD-CACHE] No se pudo guardar la entrada {key[:12]}: {e}")
+        return False
+
+    evict()
+    return True
+
+
+def _entries():
+    if not os.path.isdir(UPLOAD_CACHE_DIR):
+        return []
+    entries = []
+    for name in os.listdir(UPLOAD_CACHE_DIR):
+        if not name.endswith(_ARROW_EXT):
+            continue
+        path = os.path.join(UPLOAD_CACHE_DIR, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    return entries
+
+
+def evict() -> int:
+    """Borra las entradas menos usadas (mtime más antiguo) hasta quedar bajo UPLOAD_CACHE_MAX_MB."""
+    entries = sorted(_entries())
+    total = sum(size for _, size, _ in entries)
+    limit = UPLOAD_CACHE_MAX_MB * 1024 ** 2
+    removed = 0
+    for _, size, path in entries:
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+    return removed
+
+
+def record_result(result: Optional[str]) -> None:
+    """Actualiza los contadores con el resultado que trae el stats de una lectura."""
+    if result == "hit":
+        CACHE_STATS["hits"] += 1
+    elif result in ("miss", "stored"):
+        CACHE_STATS["misses"] += 1
+        if result == "stored":
+            CACHE_STATS["stores"] += 1
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    entries = _entries()
+    lookups = CACHE_STATS["hits"] + CACHE_STATS["misses"]
+    return {
+        "enabled": UPLOAD_CACHE_ENABLED,
+        "directory": UPLOAD_CACHE_DIR,
+        "max_mb": UPLOAD_CACHE_MAX_MB,
+        "size_mb": round(sum(size for _, size, _ in entries) / 1024 ** 2, 2),
+        "entries": len(entries),
+        **CACHE_STATS,
+        "hit_rate": round(CACHE_STATS["hits"] / lookups, 3) if lookups else None,
+    }
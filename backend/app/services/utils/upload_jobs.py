@@ -0,0 +1,246 @@
+import os
+import time
+import uuid
+import shutil
+import socket
+import asyncio
+import tempfile
+import traceback
+import contextvars
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlmodel import Session, select, or_
+
+from app.database.database import engine
+from app.models.upload_job import UploadJob
+
+# Cola de cargas: el parseo/limpieza/persistencia corre en hilos propios, fuera del
+# event loop del servidor. Con 1 worker las cargas se serializan y no compiten por la BD.
+UPLOAD_JOB_WORKERS = int(os.getenv("UPLOAD_JOB_WORKERS", "1"))
+UPLOAD_JOB_SPOOL_MAX_SIZE = 1024 * 1024
+# Cada proceso marca sus jobs en cola/corriendo cada HEARTBEAT segundos; un job sin
+# latido por más de STALE segundos quedó huérfano (su proceso murió o se reinició)
+UPLOAD_JOB_HEARTBEAT_SECONDS = int(os.getenv("UPLOAD_JOB_HEARTBEAT_SECONDS", "30"))
+UPLOAD_JOB_STALE_SECONDS = int(os.getenv("UPLOAD_JOB_STALE_SECONDS", "120"))
+
+# Identifica a este proceso (con varios workers de uvicorn hay uno por worker)
+JOB_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"[-100:]
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+JobFn = Callable[[Session], Awaitable[Dict[str, Any]]]
+
+_job_executor: Optional[ThreadPoolExecutor] = None
+
+# Job en curso dentro del hilo: los servicios reportan etapas sin recibir el id
+_current_job_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("upload_job_id", default=None)
+_current_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("upload_job_timings", default=None)
+
+
+def get_job_executor() -> ThreadPoolExecutor:
+    global _job_executor
+    if _job_executor is None:
+        _job_executor = ThreadPoolExecutor(max_workers=UPLOAD_JOB_WORKERS, thread_name_prefix="upload-job")
+    return _job_executor
+
+
+def shutdown_job_executor() -> None:
+    global _job_executor
+    if _job_executor is not None:
+        _job_executor.shutdown(wait=False, cancel_futures=True)
+        _job_executor = None
+
+
+def _update_job(job_id: str, **fields) -> None:
+    # Sesión corta propia: el estado del job se guarda aunque la carga haga rollback
+    with Session(engine) as session:
+        job = session.get(UploadJob, job_id)
+        if job is None:
+            return
+        for name, value in fields.items():
+            setattr(job, name, value)
+        session.add(job)
+        session.commit()
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """
+    Registra la duración de una etapa en el job en curso. Fuera de un job
+    (scripts, llamadas directas al servicio) no hace nada.
+    """
+    job_id = _current_job_id.get()
+    timings = _current_timings.get()
+    if job_id is None or timings is None:
+        return
+    timings[stage] = round(seconds, 4)
+    try:
+        _update_job(job_id, timings=dict(timings))
+    except Exception as e:
+        print(f"⚠️ [UPLOAD-JOB] No se pudo registrar la etapa '{stage}' del job {job_id}: {e}")
+
+
+def _copy_upload(upload: UploadFile) -> UploadFile:
+    spooled = tempfile.SpooledTemporaryFile(max_size=UPLOAD_JOB_SPOOL_MAX_SIZE)
+    upload.file.seek(0)
+    shutil.copyfileobj(upload.file, spooled)
+    spooled.seek(0)
+    return UploadFile(filename=upload.filename, file=spooled)
+
+
+async def snapshot_uploads(files: List[UploadFile]) -> List[UploadFile]:
+    """
+    Copia los UploadFile del request a archivos temporales propios: Starlette
+    cierra los originales al responder y el job en segundo plano los necesita después.
+    La copia (lectura/escritura de disco) corre en el threadpool, fuera del event loop.
+    """
+    return [await run_in_threadpool(_copy_upload, upload) for upload in files]
+
+
+def _run_job(job_id: str, kind: str, job_fn: JobFn) -> Dict[str, Any]:
+    timings: Dict[str, float] = {}
+    _current_job_id.set(job_id)
+    _current_timings.set(timings)
+    _update_job(job_id, status=JOB_RUNNING, started_at=datetime.now())
+    print(f"🚀 [UPLOAD-JOB] Iniciando job {job_id} ({kind})")
+
+    start = time.perf_counter()
+    try:
+        with Session(engine) as session:
+            result = asyncio.run(job_fn(session))
+    except HTTPException as e:
+        timings["total_s"] = round(time.perf_counter() - start, 4)
+        _update_job(
+            job_id,
+            status=JOB_FAILED,
+            finished_at=datetime.now(),
+            timings=timings,
+            result={"status_code": e.status_code},
+            error=str(e.detail),
+        )
+        print(f"❌ [UPLOAD-JOB] Job {job_id} ({kind}) falló: {e.detail}")
+        raise
+    except Exception as e:
+        timings["total_s"] = round(time.perf_counter() - start, 4)
+        _update_job(
+            job_id,
+            status=JOB_FAILED,
+            finished_at=datetime.now(),
+            timings=timings,
+            error=str(e),
+        )
+        print(f"❌ [UPLOAD-JOB] Job {job_id} ({kind}) falló: {e}")
+        print(traceback.format_exc())
+        raise
+
+    timings["total_s"] = round(time.perf_counter() - start, 4)
+    _update_job(
+        job_id,
+        status=JOB_SUCCEEDED,
+        finished_at=datetime.now(),
+        timings=timings,
+        result=jsonable_encoder(result),
+    )
+    print(f"✅ [UPLOAD-JOB] Job {job_id} ({kind}) completado en {timings['total_s']:.3f}s")
+    return result
+
+
+def submit_upload_job(kind: str, job_fn: JobFn):
+    """Crea el registro del job y lo encola. Devuelve (job_id, future)."""
+    job_id = uuid.uuid4().hex
+    now = datetime.now()
+    with Session(engine) as session:
+        session.add(UploadJob(
+            id=job_id, kind=kind, status=JOB_QUEUED, created_at=now, owner=JOB_OWNER, heartbeat_at=now
+        ))
+        session.commit()
+    future = get_job_executor().submit(_run_job, job_id, kind, job_fn)
+    return job_id, future
+
+
+async def run_upload_job(kind: str, job_fn: JobFn, background: bool = True):
+    """
+    Ejecuta la carga en la cola de jobs.
+    - background=True (por defecto): responde 202 de inmediato con el id para consultar /jobs/{id}.
+    - background=False: espera el resultado (sin bloquear el event loop) y lo
+      devuelve igual que antes, más el job_id.
+    """
+    job_id, future = submit_upload_job(kind, job_fn)
+    if background:
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"job_id": job_id, "status": JOB_QUEUED, "status_url": f"/jobs/{job_id}"},
+        )
+    result = await asyncio.wrap_future(future)
+    return {**result, "job_id": job_id}
+
+
+def get_job(session: Session, job_id: str) -> Optional[UploadJob]:
+    return session.get(UploadJob, job_id)
+
+
+def list_jobs(session: Session, kind: Optional[str] = None, limit: int = 20) -> List[UploadJob]:
+    statement = select(UploadJob).order_by(UploadJob.created_at.desc()).limit(limit)
+    if kind:
+        statement = statement.where(UploadJob.kind == kind)
+    return session.exec(statement).all()
+
+
+def touch_owned_jobs() -> int:
+    """Latido: renueva heartbeat_at de los jobs en cola o corriendo de este proceso."""
+    with Session(engine) as session:
+        jobs = session.exec(
+            select(UploadJob).where(
+                UploadJob.owner == JOB_OWNER,
+                UploadJob.status.in_([JOB_QUEUED, JOB_RUNNING]),
+            )
+        ).all()
+        now = datetime.now()
+        for job in jobs:
+            job.heartbeat_at = now
+            session.add(job)
+        session.commit()
+    return len(jobs)
+
+
+def mark_stale_jobs() -> int:
+    """
+    Marca como fallidos los jobs en cola o corriendo cuyo proceso dejó de latir
+    hace más de UPLOAD_JOB_STALE_SECONDS. Los de otros workers vivos no se tocan.
+    """
+    limit = datetime.now() - timedelta(seconds=UPLOAD_JOB_STALE_SECONDS)
+    with Session(engine) as session:
+        jobs = session.exec(
+            select(UploadJob).where(
+                UploadJob.status.in_([JOB_QUEUED, JOB_RUNNING]),
+                or_(UploadJob.heartbeat_at.is_(None), UploadJob.heartbeat_at < limit),
+            )
+        ).all()
+        for job in jobs:
+            job.status = JOB_FAILED
+            job.finished_at = datetime.now()
+            job.error = "Interrumpido: el proceso que corría la carga dejó de responder (reinicio o caída)."
+            session.add(job)
+        session.commit()
+    if jobs:
+        print(f"⚠️ [UPLOAD-JOB] {len(jobs)} jobs sin latido marcados como fallidos")
+    return len(jobs)
+
+
+async def job_heartbeat_loop() -> None:
+    """Tarea del lifespan: latido de los jobs propios y limpieza de los huérfanos."""
+    while True:
+        try:
+            await asyncio.to_thread(touch_owned_jobs)
+            await asyncio.to_thread(mark_stale_jobs)
+        except Exception as e:
+            print(f"⚠️ [UPLOAD-JOB] Falló el latido de jobs: {e}")
+        await asyncio.sleep(UPLOAD_JOB_HEARTBEAT_SECONDS)
@@ -0,0 +1,85 @@
+from typing import Any, Dict, List
+from app.core.workers_concentrix.clean_people_consultation import COLUMNS_PEOPLE_CONSULTATION
+from app.core.workers_concentrix.clean_scheduling_ppp import REQUIRED_COLUMNS as SCHEDULING_PPP_REQUIRED
+from app.core.workers_concentrix.merge_worker_cx import COLUMNS_MASTER, COLUMNS_API_ID
+from app.core.workers_ubycall.clean_master_glovo import COLUMNS_MASTER_GLOVO
+from app.core.workers_ubycall.clean_scheduling_ubycall import COLUMNS_SCHEDULING_UBYCALL
+from app.core.workers_schedule.schedule_concentrix import (
+    SCHEDULE_CONCENTRIX_COLUMNS, SCHEDULE_CONCENTRIX_DAY_PREFIXES, SCHEDULE_CONCENTRIX_DAYS
+)
+from app.core.workers_schedule.schedule_ubycall import SCHEDULE_UBYCALL_COLUMNS
+from app.core.workers_attendance.attendance import ATTENDANCE_SOURCE_COLUMNS
+from app.core.planned.clean_planned_data import COLUMNS_PLANNED_DATA
+from app.core.operational_view.clean_planned_data import COLUMNS_PLANNED_DATA as COLUMNS_PLANNED_DATA_VIEW
+from app.core.sla_breached.clean_sla_breached import SLA_SOURCE_COLUMNS
+from app.core.contacts_with_ccr.clean_contacts_with_ccr import CCR_SOURCE_COLUMNS
+from app.core.real_time_data.clean_real_time_data import RTD_SOURCE_COLUMNS
+
+# Registro de encabezados obligatorios por slot (misma keyword que EXCEL_READ_CONFIGS /
+# CSV_READ_CONFIGS). El pre-vuelo de upload_service lee solo las filas de encabezado
+# con la config de lectura del slot y compara contra "required" (nombres sin espacios
+# a los extremos). "level" indica el nivel del MultiIndex donde buscar (schedule_ppp).
+# Se derivan de los mapas de columnas de cada limpiador para no duplicar listas.
+
+_PEOPLE_SCHEMA = {"required": list(COLUMNS_PEOPLE_CONSULTATION)}
+
+UPLOAD_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    # Trabajadores
+    "people_consultation": _PEOPLE_SCHEMA,
+    "people_active": _PEOPLE_SCHEMA,
+    "people_inactive": _PEOPLE_SCHEMA,
+    "scheduling_ppp": {"required": SCHEDULING_PPP_REQUIRED},
+    "api_id": {"required": list(COLUMNS_API_ID)},
+    "master_concentrix": {"required": list(COLUMNS_MASTER)},
+    "master_ubycall": {"required": list(COLUMNS_MASTER_GLOVO)},
+    "scheduling_ubycall": {"required": list(COLUMNS_SCHEDULING_UBYCALL)},
+
+    # Horarios
+    "schedule_ppp": {"required": ["DNI"], "level": 1},
+    "schedule_concentrix": {
+        "required": [
+            *SCHEDULE_CONCENTRIX_COLUMNS,
+            *(f"{prefix}{day.upper()}" for day in SCHEDULE_CONCENTRIX_DAYS for prefix in SCHEDULE_CONCENTRIX_DAY_PREFIXES),
+        ],
+    },
+    "people_obs": {"required": ["NRO_DOCUMENTO"]},
+    "schedule_ubycall": {"required": list(SCHEDULE_UBYCALL_COLUMNS)},
+
+    # Asistencia y KPIs
+    "attendance": {"required": ATTENDANCE_SOURCE_COLUMNS},
+    # planned y la vista operacional leen el mismo archivo con mapas distintos:
+    # solo se exige lo que usan ambos
+    "planned_data": {
+        "required": [col for col in COLUMNS_PLANNED_DATA if col in COLUMNS_PLANNED_DATA_VIEW],
+    },
+    "sla_breached": {"required": SLA_SOURCE_COLUMNS},
+    "contacts_with_ccr": {"required": CCR_SOURCE_COLUMNS},
+    "real_time_data": {"required": RTD_SOURCE_COLUMNS},
+}
+
+
+class UploadSchemaError(ValueError):
+    """Archivos con hojas o columnas obligatorias faltantes (detectado en el pre-vuelo)."""
+
+
+def get_upload_schema(filename: str) -> Dict[str, Any] | None:
+    """Esquema del slot cuya keyword aparece en el nombre (la más larga gana), o None."""
+    lower = filename.lower()
+    for keyword in sorted(UPLOAD_SCHEMAS, key=len, reverse=True):
+        if keyword in lower:
+            return UPLOAD_SCHEMAS[keyword]
+    return None
+
+
+def find_missing_columns(columns: Any, schema: Dict[str, Any]) -> List[str]:
+    """Columnas obligatorias del esquema que no están entre los encabezados leídos."""
+    level = schema.get("level")
+    if level is None:
+        present = {str(col).strip() for col in columns}
+    else:
+        present = {
+            str(col[level]).strip()
+            for col in columns
+            if isinstance(col, tuple) and len(col) > level
+        }
+    return [col for col in schema["required"] if str(col).strip() not in present]
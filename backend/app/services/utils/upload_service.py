@@ -1,108 +1,901 @@
 import io
+import csv
+import os
+import time
+import asyncio
+import re
+import hashlib
+import importlib.util
+import tempfile
+import tracemalloc
+import multiprocessing
+import numpy as np
 import pandas as pd
-import chardet
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from chardet.universaldetector import UniversalDetector
+from contextlib import contextmanager
 from fastapi import UploadFile, HTTPException
-from typing import Mapping, List, Tuple, Callable, Any, Dict
+from typing import Mapping, List, Tuple, Callable, Any, Dict, BinaryIO, Iterator, Collection
 from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES, TYPE_ERROR, TYPE_NUMERIC
 
-# 1) Config centralizada de lectura según keyword
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from pyarrow import feather
+except ImportError:  # sin pyarrow no se aceptan uploads columnares
+    pa = pq = feather = None
+from app.services.utils import upload_cache
+from app.services.utils.upload_schemas import UploadSchemaError, get_upload_schema, find_missing_columns
+from app.core.workers_concentrix.clean_people_consultation import COLUMNS_PEOPLE_CONSULTATION
+from app.core.workers_concentrix.clean_scheduling_ppp import COLUMNS_SCHEDULING_PPP
+from app.core.workers_concentrix.merge_worker_cx import COLUMNS_MASTER, COLUMNS_API_ID
+from app.core.workers_ubycall.clean_master_glovo import COLUMNS_MASTER_GLOVO
+from app.core.workers_ubycall.clean_scheduling_ubycall import COLUMNS_SCHEDULING_UBYCALL
+from app.core.workers_schedule.schedule_concentrix import SCHEDULE_CONCENTRIX_COLUMNS, SCHEDULE_CONCENTRIX_DAY_PREFIXES
+from app.core.workers_schedule.schedule_ubycall import SCHEDULE_UBYCALL_COLUMNS
+from app.core.planned.clean_planned_data import COLUMNS_PLANNED_DATA
+from app.core.operational_view.clean_planned_data import COLUMNS_PLANNED_DATA as COLUMNS_PLANNED_DATA_VIEW
+from app.core.contacts_with_ccr.clean_contacts_with_ccr import CCR_SOURCE_COLUMNS
+from app.core.real_time_data.clean_real_time_data import RTD_SOURCE_COLUMNS
+
+# Tamaño de bloque para recorrer archivos subidos sin cargarlos completos en RAM
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Reporte de pico de memoria por archivo (tracemalloc). Activar con UPLOAD_TRACK_MEMORY=1:
+# tracemalloc multiplica varias veces el tiempo de parseo de openpyxl, solo para diagnóstico.
+UPLOAD_TRACK_MEMORY = os.getenv("UPLOAD_TRACK_MEMORY", "0") == "1"
+
+# Bytes que se miran para detectar codificación/dialecto de un CSV
+UPLOAD_CSV_SAMPLE_BYTES = int(os.getenv("UPLOAD_CSV_SAMPLE_BYTES", str(256 * 1024)))
+
+# Filas por chunk al leer CSV por partes (iter_file_chunks)
+UPLOAD_CSV_CHUNK_ROWS = int(os.getenv("UPLOAD_CSV_CHUNK_ROWS", "100000"))
+
+# Procesos para parsear en paralelo los uploads multi-archivo (1 = secuencial)
+UPLOAD_PARSE_WORKERS = int(os.getenv("UPLOAD_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_parse_pool: ProcessPoolExecutor | None = None
+
+# Pre-vuelo: validar encabezados/hojas contra UPLOAD_SCHEMAS antes de parsear
+UPLOAD_PREFLIGHT_ENABLED = os.getenv("UPLOAD_PREFLIGHT_ENABLED", "1") == "1"
+
+# Versión del lector: forma parte de la clave del caché de uploads. Subirla cuando
+# cambie cómo read_file_safely interpreta un archivo (invalida lo ya cacheado).
+UPLOAD_READER_VERSION = 3
+
+# Formatos columnares (Parquet / Arrow IPC): usan la misma config del slot, pero
+# solo usecols (proyección de columnas) y dtype; hoja/encabezado no aplican.
+COLUMNAR_EXTENSIONS = ('.parquet', '.arrow', '.feather')
+
+# Motores de lectura Excel en orden de preferencia; si uno falla se prueba el siguiente.
+# "calamine" solo se usa si python-calamine está instalado (UPLOAD_EXCEL_ENGINES=calamine,openpyxl_values,openpyxl).
+UPLOAD_EXCEL_ENGINES = [
+    e.strip() for e in os.getenv("UPLOAD_EXCEL_ENGINES", "openpyxl_values,openpyxl").split(",") if e.strip()
+]
+
+class ColumnSelector:
+    """
+    `usecols` para pandas: conserva solo las columnas cuyo nombre (sin espacios
+    a los extremos) está en `names` o empieza por alguno de `prefixes`.
+    Es una clase y no un lambda para poder enviarla al pool de procesos y para
+    que su repr sea estable (forma parte de la clave del caché de uploads).
+    """
+
+    def __init__(self, names=(), prefixes=()):
+        self.names = frozenset(str(name).strip() for name in names)
+        self.prefixes = tuple(sorted(prefixes))
+
+    def __call__(self, column: Any) -> bool:
+        name = str(column).strip()
+        return name in self.names or name.startswith(self.prefixes)
+
+    def __repr__(self) -> str:
+        return f"ColumnSelector(names={sorted(self.names)}, prefixes={list(self.prefixes)})"
+
+
+# Columnas que usan los limpiadores de trabajadores (personal activo/inactivo)
+_PEOPLE_READ = {
+    "usecols": ColumnSelector(COLUMNS_PEOPLE_CONSULTATION),
+    "dtype": {"NRO. DOCUMENTO": str},
+}
+
+# 1) Config centralizada de lectura según keyword (kwargs de pandas; "engines" fija
+#    el orden de motores solo para ese slot). `usecols` se deriva de los mapas de
+#    columnas de cada limpiador para no materializar columnas que se descartan;
+#    los documentos se leen como texto porque los limpiadores los tratan como str.
 EXCEL_READ_CONFIGS: Dict[str, Dict[str, Any]] = {
-    "people_consultation": {},  # default: lee hoja por defecto
+    "people_consultation": _PEOPLE_READ,
+    "people_active": _PEOPLE_READ,
+    "people_inactive": _PEOPLE_READ,
     "scheduling_ppp":  {
         "sheet_name": "RESUMEN",
         "header": 2,
         "skiprows": 3,
-        "engine": "openpyxl",
+        "usecols": ColumnSelector(COLUMNS_SCHEDULING_PPP),
     },
     "schedule_ppp":  {
         "sheet_name": "RESUMEN",
         "skiprows": 4,
         "header": [0, 1],
-        "engine": "openpyxl",
     },
-    "api_id": {},      # si necesita algo especial, lo pones aquí
+    "schedule_concentrix": {
+        "usecols": ColumnSelector(SCHEDULE_CONCENTRIX_COLUMNS, SCHEDULE_CONCENTRIX_DAY_PREFIXES),
+        "dtype": {"NRO_DOCUMENTO": str},
+    },
+    "schedule_ubycall": {
+        "usecols": ColumnSelector(SCHEDULE_UBYCALL_COLUMNS),
+        "dtype": {"DNI": str},
+    },
+    "api_id": {
+        "usecols": ColumnSelector(COLUMNS_API_ID),
+        "dtype": {"DOCUMENT": str},
+    },
     "master_concentrix": {
         "sheet_name": "AGENTES_UBY",
-        "engine": "openpyxl",
+        "usecols": ColumnSelector(COLUMNS_MASTER),
+        "dtype": {"DNI": str},
     },
     "master_ubycall": {
         "sheet_name": "AGENTES_GLOVO",
-        "engine": "openpyxl",
+        "usecols": ColumnSelector(COLUMNS_MASTER_GLOVO),
+        "dtype": {"DNI": str},
+    },
+    "scheduling_ubycall": {
+        "usecols": ColumnSelector(COLUMNS_SCHEDULING_UBYCALL),
+        "dtype": {"DNI": str},
+    },
+    # El mismo archivo alimenta planned y la vista operacional: unión de ambos mapas
+    "planned_data":    {
+        "sheet_name": "DDPP",
+        "usecols": ColumnSelector([*COLUMNS_PLANNED_DATA, *COLUMNS_PLANNED_DATA_VIEW]),
     },
-    "scheduling_ubycall": {},   # idem
-    "planned_data":    {"sheet_name": "DDPP", "engine": "openpyxl"},
 }
 
+# Overrides por slot para CSV: engine ("c" por defecto, "pyarrow" o "python" = camino
+# original), sep (None → se detecta del encabezado), encoding (None → muestra),
+# drop_last_row (descarta la última línea, que los exports traen cortada).
 CSV_READ_CONFIGS = {
     "contacts_with_ccr": {
-        "engine": "python",
+        "engine": "c",
         "drop_last_row": True,
-    }
+        "usecols": ColumnSelector(CCR_SOURCE_COLUMNS),
+        # texto fijo: al leer por chunks un chunk sin valores no debe cambiar el tipo
+        "dtype": {"ticket_id": str, "queue_name": str, "country": str, "cr_l1": str, "cr_l2": str, "cr_l3": str},
+    },
+    "real_time_data": {
+        "engine": "c",
+        "drop_last_row": True,
+        "usecols": ColumnSelector(RTD_SOURCE_COLUMNS),
+        "dtype": {"queue_name": str},
+    },
 }
 
 
-def read_file_safely(file_stream: io.BytesIO, filename: str) -> pd.DataFrame:
+def detect_encoding(file_stream: BinaryIO, sample_size: int | None = None) -> str:
     """
-    Lee un archivo Excel (.xlsx) o CSV (.csv) con detección de codificación.
-    Aplica configuraciones específicas definidas en EXCEL_READ_CONFIGS.
+    Detecta la codificación recorriendo el archivo por bloques (sin copiarlo
+    completo a memoria) y deja el stream posicionado al inicio. Con
+    `sample_size` solo mira los primeros bytes; "ascii" se toma como utf-8
+    porque más adelante puede haber caracteres acentuados.
     """
+    detector = UniversalDetector()
     file_stream.seek(0)
-    lower = filename.lower()
+    remaining = sample_size
+    while not detector.done and (remaining is None or remaining > 0):
+        chunk = file_stream.read(UPLOAD_CHUNK_SIZE if remaining is None else min(UPLOAD_CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        detector.feed(chunk)
+        if remaining is not None:
+            remaining -= len(chunk)
+    detector.close()
+    file_stream.seek(0)
+    encoding = detector.result.get("encoding") or "utf-8"
+    return "utf-8" if encoding.lower() == "ascii" else encoding
 
-    # === Excel ===
+
+def sniff_csv_dialect(file_stream: BinaryIO, encoding: str):
+    """
+    Detecta el dialecto (separador, comillas) solo con la línea de encabezado,
+    igual que hace pandas con sep=None. Devuelve None si no se puede deducir.
+    """
+    file_stream.seek(0)
+    first_line = file_stream.readline(UPLOAD_CHUNK_SIZE)
+    file_stream.seek(0)
+    header = first_line.decode(encoding, errors="ignore").lstrip("\ufeff").splitlines()
+    if not header:
+        return None
+    try:
+        return csv.Sniffer().sniff(header[0])
+    except csv.Error:
+        return None
+
+
+def find_last_line_offset(file_stream: BinaryIO) -> int:
+    """
+    Posición en bytes donde empieza la última línea con contenido, buscando el
+    salto de línea desde el final del archivo (sin leerlo completo). Si el archivo
+    tiene una sola línea devuelve su largo.
+    """
+    file_stream.seek(0, io.SEEK_END)
+    size = file_stream.tell()
+    block = 64 * 1024
+    while True:
+        start = max(0, size - block)
+        file_stream.seek(start)
+        tail = file_stream.read(size - start)
+        # Solo el terminador de la última línea: las líneas en blanco al final cuentan
+        # como última línea, igual que con skipfooter=1
+        for terminator in (b"\r\n", b"\n", b"\r"):
+            if tail.endswith(terminator):
+                tail = tail[:-len(terminator)]
+                break
+        cut = max(tail.rfind(b"\n"), tail.rfind(b"\r"))
+        if cut >= 0:
+            file_stream.seek(0)
+            return start + cut + 1
+        if start == 0:
+            file_stream.seek(0)
+            return size
+        block *= 2
+
+
+class BoundedReader(io.RawIOBase):
+    """Vista de solo lectura de los primeros `limit` bytes de un stream."""
+
+    def __init__(self, raw: BinaryIO, limit: int):
+        self._raw = raw
+        self._remaining = limit
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._remaining <= 0:
+            return 0
+        data = self._raw.read(min(len(buffer), self._remaining))
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+def _csv_fast_source(file_stream: BinaryIO, params: Dict[str, Any]) -> Tuple[BinaryIO, Dict[str, Any]]:
+    """
+    Prepara el camino rápido: codificación por muestra, dialecto del encabezado y
+    la última línea descartada limitando los bytes que ve el parser. Devuelve el
+    stream acotado y los kwargs de pd.read_csv.
+    """
+    encoding = params.get("encoding") or detect_encoding(file_stream, UPLOAD_CSV_SAMPLE_BYTES)
+    if encoding.lower().replace("-", "").startswith(("utf16", "utf32")):
+        raise ValueError(f"codificación {encoding} no soportada por el camino rápido")
+
+    sep = params.get("sep")
+    dialect = None if sep else sniff_csv_dialect(file_stream, encoding)
+    if sep is None and dialect is None:
+        sep = ","
+
+    limit = find_last_line_offset(file_stream) if params.get("drop_last_row", True) else None
+    file_stream.seek(0)
+    source = BoundedReader(file_stream, limit) if limit is not None else file_stream
+
+    kwargs: Dict[str, Any] = {
+        "engine": params.get("engine", "c"),
+        "encoding": encoding,
+        "encoding_errors": "ignore",
+        "usecols": params.get("usecols"),
+        "dtype": params.get("dtype"),
+        "on_bad_lines": "skip",
+    }
+    if kwargs["engine"] == "c":
+        kwargs["float_precision"] = "round_trip"  # mismos floats que el motor python
+    if dialect is not None:
+        kwargs["dialect"] = dialect
+    else:
+        kwargs["sep"] = sep
+    return source, kwargs
+
+
+def _read_csv_fast(file_stream: BinaryIO, params: Dict[str, Any]) -> pd.DataFrame:
+    """Camino rápido: motor C (o pyarrow) sin decodificar ni partir el texto completo."""
+    source, kwargs = _csv_fast_source(file_stream, params)
+    return pd.read_csv(source, **kwargs)
+
+
+def iter_file_chunks(
+    file_stream: BinaryIO, filename: str, chunksize: int | None = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Generador que entrega el archivo en DataFrames de a lo más `chunksize` filas
+    (UPLOAD_CSV_CHUNK_ROWS por defecto), con la misma config de lectura que
+    read_file_safely. Solo hay un chunk en memoria a la vez. Parquet se lee por
+    lotes (iter_batches); los Excel no se pueden leer por partes: se entregan
+    como un único chunk.
+    """
+    keyword, params = get_read_config(filename)
     if filename.endswith('.xlsx'):
+        yield read_file_safely(file_stream, filename)
+        return
+
+    if filename.endswith(COLUMNAR_EXTENSIONS):
+        _require_pyarrow(filename)
+        chunks = rows = 0
+        t0 = time.perf_counter()
+        for batch in _iter_columnar_batches(file_stream, filename, params, chunksize or UPLOAD_CSV_CHUNK_ROWS):
+            chunks += 1
+            rows += batch.num_rows
+            yield _apply_dtypes(batch.to_pandas(), params.get("dtype"))
+        print(f"📈 [UPLOAD] {filename}: {rows} filas en {chunks} chunks ({time.perf_counter() - t0:.3f}s)")
+        return
+
+    # El motor python no admite skipfooter al iterar: los chunks siempre van por el camino rápido
+    chunk_params = dict(params)
+    if chunk_params.get("engine") == "python":
+        chunk_params["engine"] = "c"
+    try:
+        source, kwargs = _csv_fast_source(file_stream, chunk_params)
+        reader = pd.read_csv(source, chunksize=chunksize or UPLOAD_CSV_CHUNK_ROWS, **kwargs)
+    except Exception as e:
+        raise ValueError(f"Error leyendo CSV '{filename}': {e}")
+
+    chunks = rows = 0
+    t0 = time.perf_counter()
+    with reader:
+        for chunk in reader:
+            chunks += 1
+            rows += len(chunk)
+            yield chunk
+    print(f"📈 [UPLOAD] {filename}: {rows} filas en {chunks} chunks ({time.perf_counter() - t0:.3f}s)")
+
+
+def _read_csv_python(file_stream: BinaryIO, params: Dict[str, Any]) -> pd.DataFrame:
+    """Camino original (motor python, sep autodetectado, skipfooter). Respaldo del rápido."""
+    text_stream = None
+    try:
+        encoding = params.get("encoding") or detect_encoding(file_stream)
+
+        # Decodificación en streaming sobre el mismo handle (sin copiar el texto)
+        text_stream = io.TextIOWrapper(
+            file_stream, encoding=encoding, errors="ignore", newline=""
+        )
+
+        return pd.read_csv(
+            text_stream,
+            engine="python",
+            usecols=params.get("usecols"),
+            dtype=params.get("dtype"),
+            sep=params.get("sep"),  # None → autodetecta
+            on_bad_lines="skip",    # extra seguridad
+            skipfooter=1 if params.get("drop_last_row", True) else 0,
+        )
+    finally:
+        # Soltar el wrapper sin cerrar el archivo subyacente
+        if text_stream is not None:
+            text_stream.detach()
+
+
+# ValuesOnlyOpenpyxlReader extiende un lector privado de pandas
+# (pandas.io.excel._openpyxl): solo se registra en las versiones de pandas probadas
+# [desde, hasta); con otras, "openpyxl_values" queda no disponible y se usa engine="openpyxl"
+VALUES_ONLY_PANDAS_VERSIONS = ((2, 0), (3, 0))
+
+
+def _pandas_version() -> Tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r"\d+", pd.__version__)[:2])
+
+
+try:
+    from pandas.io.excel._openpyxl import OpenpyxlReader
+except ImportError:
+    OpenpyxlReader = None
+
+VALUES_ONLY_AVAILABLE = (
+    OpenpyxlReader is not None
+    and hasattr(OpenpyxlReader, "get_sheet_data")
+    and VALUES_ONLY_PANDAS_VERSIONS[0] <= _pandas_version() < VALUES_ONLY_PANDAS_VERSIONS[1]
+)
+
+
+class _ErrorCodeText(Exception):
+    """Un valor con forma de código de error: solo el tipo de la celda dice si lo es."""
+
+
+def _convert_excel_value(value: Any) -> Any:
+    """Mismo criterio que OpenpyxlReader._convert_cell de pandas, pero sobre el valor crudo."""
+    if value is None:
+        return ""  # compat con xlrd, igual que pandas
+    if isinstance(value, str):
+        # values_only entrega las celdas de error como su código (#N/A, #REF!, ...),
+        # igual que un texto literal "#N/A": hay que mirar el tipo de celda
+        if value in ERROR_CODES:
+            raise _ErrorCodeText(value)
+        return value
+    if isinstance(value, float):
+        as_int = int(value)
+        return as_int if as_int == value else value
+    return value
 
-        # 2) Buscar la primera keyword en el nombre
+
+def _convert_excel_cell(cell) -> Any:
+    """OpenpyxlReader._convert_cell de pandas: solo las celdas de tipo error pasan a NaN."""
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        as_int = int(cell.value)
+        return as_int if as_int == cell.value else float(cell.value)
+    return cell.value
+
+
+def _sheet_rows(rows: Iterator[Tuple[Any, ...]], convert: Callable[[Any], Any], file_rows_needed: int | None) -> List[List[Any]]:
+    data: List[List[Any]] = []
+    last_row_with_data = -1
+    for row_number, row in enumerate(rows):
+        converted_row = [convert(value) for value in row]
+        while converted_row and converted_row[-1] == "":
+            converted_row.pop()
+        if converted_row:
+            last_row_with_data = row_number
+        data.append(converted_row)
+        if file_rows_needed is not None and len(data) >= file_rows_needed:
+            break
+
+    # Quitar filas vacías finales y completar anchos, como pandas
+    data = data[: last_row_with_data + 1]
+    if data:
+        max_width = max(len(data_row) for data_row in data)
+        if min(len(data_row) for data_row in data) < max_width:
+            data = [data_row + [""] * (max_width - len(data_row)) for data_row in data]
+    return data
+
+
+if VALUES_ONLY_AVAILABLE:
+    class ValuesOnlyOpenpyxlReader(OpenpyxlReader):
+        """
+        Lector openpyxl de pandas (read_only=True, data_only=True) que recorre las
+        filas con values_only=True: no crea un objeto celda por cada celda. El
+        parseo de encabezados (header/skiprows/MultiIndex) sigue siendo el de pandas,
+        así que el DataFrame resultante es el mismo que con engine="openpyxl".
+        Si la hoja tiene algún texto con forma de código de error se relee con
+        celdas para distinguir las de error (NaN) de los textos literales.
+        """
+
+        def get_sheet_data(self, sheet, file_rows_needed: int | None = None) -> List[List[Any]]:
+            sheet.reset_dimensions()
+            try:
+                return _sheet_rows(sheet.iter_rows(values_only=True), _convert_excel_value, file_rows_needed)
+            except _ErrorCodeText:
+                return _sheet_rows(sheet.iter_rows(), _convert_excel_cell, file_rows_needed)
+
+
+def _read_excel_values_only(file_stream: BinaryIO, params: Dict[str, Any]) -> pd.DataFrame:
+    reader = ValuesOnlyOpenpyxlReader(file_stream, engine_kwargs={})
+    try:
+        return reader.parse(**params)
+    finally:
+        reader.close()
+
+
+def _read_excel_pandas(engine: str) -> Callable[[BinaryIO, Dict[str, Any]], pd.DataFrame]:
+    def read(file_stream: BinaryIO, params: Dict[str, Any]) -> pd.DataFrame:
+        return pd.read_excel(file_stream, engine=engine, **params)
+    return read
+
+
+# Registro de motores: nombre → (disponible, lector)
+EXCEL_ENGINES: Dict[str, Tuple[bool, Callable[[BinaryIO, Dict[str, Any]], pd.DataFrame]]] = {
+    "calamine": (importlib.util.find_spec("python_calamine") is not None, _read_excel_pandas("calamine")),
+    "openpyxl_values": (VALUES_ONLY_AVAILABLE, _read_excel_values_only),
+    "openpyxl": (True, _read_excel_pandas("openpyxl")),
+}
+
+
+def read_excel_with_fallback(file_stream: BinaryIO, filename: str, params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Lee el Excel con el primer motor disponible del slot (o de UPLOAD_EXCEL_ENGINES);
+    si falla, reintenta con el siguiente. Si todos fallan relanza el último error.
+    """
+    kwargs = {k: v for k, v in params.items() if k != "engines"}
+    engines = [
+        name for name in params.get("engines", UPLOAD_EXCEL_ENGINES)
+        if name in EXCEL_ENGINES and EXCEL_ENGINES[name][0]
+    ] or ["openpyxl"]
+
+    last_error: Exception | None = None
+    for name in engines:
+        file_stream.seek(0)
+        try:
+            return EXCEL_ENGINES[name][1](file_stream, kwargs)
+        except Exception as e:
+            last_error = e
+            if name != engines[-1]:
+                print(f"⚠️ [UPLOAD] {filename}: motor '{name}' falló ({e}), probando el siguiente...")
+    raise last_error
+
+
+def get_read_config(filename: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Devuelve (keyword, params) de lectura para el archivo: la primera keyword de
+    EXCEL_READ_CONFIGS / CSV_READ_CONFIGS contenida en el nombre, o "default".
+    """
+    lower = filename.lower()
+    if filename.endswith('.xlsx'):
         for kw, params in EXCEL_READ_CONFIGS.items():
             if kw in lower:
-                try:
-                    return pd.read_excel(file_stream, **params)
-                except Exception as e:
-                    raise ValueError(
-                        f"Error leyendo Excel '{filename}' (config '{kw}'): {e}")
-        # 3) Default si no hubo match
+                return kw, params
+        return "default", {}
+    if filename.endswith('.csv'):
+        for kw, cfg in CSV_READ_CONFIGS.items():
+            if kw in lower:
+                return kw, cfg
+        return "default", {}
+    if filename.endswith(COLUMNAR_EXTENSIONS):
+        for kw, cfg in {**EXCEL_READ_CONFIGS, **CSV_READ_CONFIGS}.items():
+            if kw in lower:
+                return kw, {k: v for k, v in cfg.items() if k in ("usecols", "dtype")}
+        return "default", {}
+    raise ValueError(f"Formato no soportado: '{filename}'")
+
+
+def _require_pyarrow(filename: str) -> None:
+    if pa is None:
+        raise ValueError(f"No se puede leer '{filename}': pyarrow no está instalado")
+
+
+def read_columnar_schema(file_stream: BinaryIO, filename: str) -> List[str]:
+    """Nombres de columna de un Parquet / Arrow leyendo solo los metadatos."""
+    _require_pyarrow(filename)
+    file_stream.seek(0)
+    try:
+        if filename.endswith('.parquet'):
+            return pq.ParquetFile(file_stream).schema_arrow.names
+        try:
+            return pa.ipc.open_file(file_stream).schema.names
+        except pa.ArrowInvalid:
+            # Formato stream de Arrow (sin footer)
+            file_stream.seek(0)
+            return pa.ipc.open_stream(file_stream).schema.names
+    finally:
+        file_stream.seek(0)
+
+
+def _project_columns(names: List[str], usecols: Any) -> List[str] | None:
+    """Traduce `usecols` (lista o ColumnSelector) a la lista de columnas a leer."""
+    if usecols is None:
+        return None
+    if callable(usecols):
+        return [name for name in names if usecols(name)]
+    wanted = set(usecols)
+    return [name for name in names if name in wanted]
+
+
+def _apply_dtypes(df: pd.DataFrame, dtype: Mapping[str, Any] | None) -> pd.DataFrame:
+    """
+    Aplica el `dtype` del slot como lo haría read_csv/read_excel: con str los
+    valores pasan a texto pero los nulos siguen siendo NaN.
+    """
+    for col, target in (dtype or {}).items():
+        if col not in df.columns:
+            continue
+        if target is str:
+            values = df[col]
+            # Un entero con nulos llega como float: 123.0 → "123", como en el texto original
+            if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+                values = values.astype("Int64")
+            df[col] = values.astype(str).astype(object).where(values.notna(), np.nan)
+        else:
+            df[col] = df[col].astype(target)
+    return df
+
+
+def _read_columnar_table(file_stream: BinaryIO, filename: str, columns: List[str] | None):
+    """Tabla Arrow completa (solo `columns`) de un Parquet, Arrow IPC (file) o Arrow stream."""
+    file_stream.seek(0)
+    if filename.endswith('.parquet'):
+        return pq.read_table(file_stream, columns=columns)
+    try:
+        return feather.read_table(file_stream, columns=columns, memory_map=False)
+    except pa.ArrowInvalid:
+        file_stream.seek(0)
+        table = pa.ipc.open_stream(file_stream).read_all()
+        return table.select(columns) if columns is not None else table
+
+
+def _iter_columnar_batches(
+    file_stream: BinaryIO, filename: str, params: Dict[str, Any], batch_size: int
+) -> Iterator[Any]:
+    """RecordBatches de a lo más `batch_size` filas con la proyección de columnas del slot."""
+    columns = _project_columns(read_columnar_schema(file_stream, filename), params.get("usecols"))
+    if filename.endswith('.parquet'):
+        # Parquet se puede leer por lotes sin cargar el archivo completo
+        yield from pq.ParquetFile(file_stream).iter_batches(batch_size=batch_size, columns=columns)
+        return
+    yield from _read_columnar_table(file_stream, filename, columns).to_batches(max_chunksize=batch_size)
+
+
+def _read_columnar(file_stream: BinaryIO, filename: str, params: Dict[str, Any]) -> pd.DataFrame:
+    """Parquet / Arrow IPC → DataFrame leyendo solo las columnas que usa el limpiador."""
+    _require_pyarrow(filename)
+    columns = _project_columns(read_columnar_schema(file_stream, filename), params.get("usecols"))
+    table = _read_columnar_table(file_stream, filename, columns)
+    return _apply_dtypes(table.to_pandas(), params.get("dtype"))
+
+
+def read_file_safely(file_stream: BinaryIO, filename: str) -> pd.DataFrame:
+    """
+    Lee un archivo Excel (.xlsx), CSV (.csv) con detección de codificación, o
+    Parquet / Arrow (.parquet, .arrow, .feather) con proyección de columnas.
+    Aplica configuraciones específicas definidas en EXCEL_READ_CONFIGS.
+    `file_stream` puede ser cualquier handle binario con seek (BytesIO,
+    SpooledTemporaryFile, archivo en disco); se lee directamente, sin copias.
+    """
+    file_stream.seek(0)
+    keyword, params = get_read_config(filename)
+
+    # === Excel ===
+    if filename.endswith('.xlsx'):
         try:
-            return pd.read_excel(file_stream, engine='openpyxl')
+            return read_excel_with_fallback(file_stream, filename, params)
         except Exception as e:
+            label = f"config '{keyword}'" if keyword in EXCEL_READ_CONFIGS else "default"
             raise ValueError(
-                f"Error leyendo Excel '{filename}' (default): {e}")
+                f"Error leyendo Excel '{filename}' ({label}): {e}")
 
     # === CSV ===
     elif filename.endswith('.csv'):
+        if params.get("engine", "c") != "python":
+            try:
+                return _read_csv_fast(file_stream, params)
+            except Exception as e:
+                print(f"⚠️ [UPLOAD] {filename}: lectura CSV rápida falló ({e}), usando motor python...")
+                file_stream.seek(0)
         try:
-            raw = file_stream.read()
-            encoding = chardet.detect(raw).get("encoding", "utf-8")
-            file_stream.seek(0)
+            return _read_csv_python(file_stream, params)
+        except Exception as e:
+            raise ValueError(f"Error leyendo CSV '{filename}': {e}")
+
+    # === Parquet / Arrow ===
+    elif filename.endswith(COLUMNAR_EXTENSIONS):
+        try:
+            return _read_columnar(file_stream, filename, params)
+        except Exception as e:
+            raise ValueError(f"Error leyendo '{filename}': {e}")
+
+    else:
+        raise ValueError(f"Formato no soportado: '{filename}'")
 
-            text = raw.decode(encoding, errors="ignore")
 
-            # 🔥 eliminar última línea corrupta ANTES del parseo
-            lines = text.splitlines()
-            if len(lines) > 1:
-                text = "\n".join(lines[:-1])
+def read_upload_headers(file_stream: BinaryIO, filename: str) -> Tuple[List[str] | None, Any]:
+    """
+    Lee solo los encabezados con la misma config (hoja, header, skiprows) que
+    read_file_safely. Devuelve (hojas, columnas); hojas es None en CSV y
+    columnas es None si la hoja configurada no existe en el libro.
+    """
+    file_stream.seek(0)
+    _, params = get_read_config(filename)
+    if filename.endswith(COLUMNAR_EXTENSIONS):
+        return None, pd.Index(read_columnar_schema(file_stream, filename))
+    try:
+        if filename.endswith('.xlsx'):
+            reader = ValuesOnlyOpenpyxlReader(file_stream, engine_kwargs={})
+            try:
+                sheets = reader.sheet_names
+                sheet_name = params.get("sheet_name", 0)
+                if isinstance(sheet_name, str) and sheet_name not in sheets:
+                    return sheets, None
+                df = reader.parse(
+                    sheet_name=sheet_name,
+                    header=params.get("header", 0),
+                    skiprows=params.get("skiprows"),
+                    nrows=0,
+                )
+                return sheets, df.columns
+            finally:
+                reader.close()
 
-            cleaned_stream = io.StringIO(text)
+        header_params = {k: v for k, v in params.items() if k not in ("usecols", "dtype")}
+        header_params["drop_last_row"] = False
+        if header_params.get("engine") == "python":
+            header_params["engine"] = "c"
+        source, kwargs = _csv_fast_source(file_stream, header_params)
+        return None, pd.read_csv(source, nrows=0, **kwargs).columns
+    finally:
+        file_stream.seek(0)
 
-            # buscar config
-            csv_config = None
-            for kw, cfg in CSV_READ_CONFIGS.items():
-                if kw in lower:
-                    csv_config = cfg
-                    break
 
-            df = pd.read_csv(
-                cleaned_stream,
-                engine=csv_config.get("engine") if csv_config else "python",
-                sep=None,               # autodetecta
-                on_bad_lines="skip",    # extra seguridad
-            )
+def preflight_uploads(named_files: List[Tuple[BinaryIO, str]]) -> None:
+    """
+    Valida la estructura de todos los archivos leyendo solo sus encabezados
+    (milisegundos) antes de parsear o tocar la BD. Junta todos los problemas
+    (hojas y columnas faltantes de cada archivo) y los reporta en un único UploadSchemaError.
+    """
+    if not UPLOAD_PREFLIGHT_ENABLED:
+        return
 
-            return df
+    t0 = time.perf_counter()
+    problems: List[str] = []
+    for file_stream, safe_name in named_files:
+        schema = get_upload_schema(safe_name)
+        if schema is None:
+            continue
+        try:
+            sheets, columns = read_upload_headers(file_stream, safe_name)
         except Exception as e:
-            raise ValueError(f"Error leyendo CSV '{filename}': {e}")
+            problems.append(f"{safe_name}: no se pudo leer el encabezado ({e})")
+            continue
+
+        if columns is None:
+            _, params = get_read_config(safe_name)
+            problems.append(f"{safe_name}: no existe la hoja '{params['sheet_name']}' (hojas: {sheets})")
+            continue
+
+        missing = find_missing_columns(columns, schema)
+        if missing:
+            problems.append(f"{safe_name}: faltan columnas {missing}")
+
+    elapsed = time.perf_counter() - t0
+    if problems:
+        print(f"❌ [UPLOAD] Pre-vuelo rechazó {len(problems)} archivo(s) en {elapsed:.3f}s")
+        raise UploadSchemaError("Estructura de archivo inválida. " + " | ".join(problems))
+    print(f"🔎 [UPLOAD] Pre-vuelo OK: {len(named_files)} archivo(s) en {elapsed:.3f}s")
+
+
+@contextmanager
+def track_upload_read(filename: str):
+    """
+    Mide tiempo y pico de memoria (tracemalloc) de la lectura de un archivo
+    subido, lo reporta por consola y lo deja en el dict que se entrega.
+    """
+    stats: Dict[str, Any] = {"filename": filename}
+    started_here = False
+    if UPLOAD_TRACK_MEMORY:
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+            started_here = True
+
+    t0 = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats["seconds"] = time.perf_counter() - t0
+        cache = f" | caché {stats['cache']}" if stats.get("cache") else ""
+        if UPLOAD_TRACK_MEMORY:
+            _, peak = tracemalloc.get_traced_memory()
+            if started_here:
+                tracemalloc.stop()
+            stats["peak_mb"] = peak / 1024 ** 2
+            print(f"📈 [UPLOAD] {filename}: lectura {stats['seconds']:.3f}s | pico de memoria {stats['peak_mb']:.1f} MB{cache}")
+        else:
+            print(f"📈 [UPLOAD] {filename}: lectura {stats['seconds']:.3f}s{cache}")
 
-    else:
-        raise ValueError(f"Formato no soportado: '{filename}'")
+
+def read_upload(
+    file_stream: BinaryIO, filename: str, content_hash: str | None = None
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Lee un archivo pasando por el caché de uploads: si el mismo contenido ya se
+    parseó con la misma config, devuelve el DataFrame guardado sin re-parsear.
+    En stats["cache"] queda "hit", "stored", "miss" o None (caché apagado).
+    """
+    with track_upload_read(filename) as stats:
+        stats["cache"] = None
+        # Parquet / Arrow ya se leen tan rápido como el caché: no se duplican en disco
+        if not upload_cache.UPLOAD_CACHE_ENABLED or filename.endswith(COLUMNAR_EXTENSIONS):
+            return read_file_safely(file_stream, filename), stats
+
+        keyword, params = get_read_config(filename)
+        key = upload_cache.make_key(
+            content_hash or upload_cache.hash_stream(file_stream),
+            keyword, params, UPLOAD_READER_VERSION,
+        )
+        df = upload_cache.load(key)
+        if df is not None:
+            stats["cache"] = "hit"
+            return df, stats
+
+        df = read_file_safely(file_stream, filename)
+        stats["cache"] = "stored" if upload_cache.store(key, df) else "miss"
+        return df, stats
+
+
+def read_file_from_path(path: str, filename: str, content_hash: str | None = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Lee un archivo ya volcado a disco. Es la unidad de trabajo que corre en el
+    pool de procesos, por eso recibe una ruta y no un UploadFile.
+    """
+    with open(path, "rb") as fh:
+        return read_upload(fh, filename, content_hash)
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Pool de procesos compartido (se crea en el primer upload multi-archivo)."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=UPLOAD_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+async def spool_upload_to_disk(file: UploadFile, filename: str) -> Tuple[str, str]:
+    """
+    Vuelca el UploadFile por bloques a un archivo temporal y devuelve su ruta
+    junto con el sha256 del contenido (calculado en la misma pasada, para el caché).
+    """
+    suffix = os.path.splitext(filename)[1]
+    tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+    digest = hashlib.sha256()
+    try:
+        await file.seek(0)
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            tmp.write(chunk)
+    finally:
+        tmp.close()
+    return tmp.name, digest.hexdigest()
+
+
+async def read_files_parallel(named_files: List[Tuple[UploadFile, str]]) -> List[pd.DataFrame]:
+    """
+    Parsea varios archivos a la vez en el pool de procesos y devuelve los
+    DataFrames en el mismo orden de entrada.
+    """
+    paths: List[str] = []
+    hashes: List[str] = []
+    try:
+        for file, safe_name in named_files:
+            path, content_hash = await spool_upload_to_disk(file, safe_name)
+            paths.append(path)
+            hashes.append(content_hash)
+
+        t0 = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            pool = get_parse_pool()
+            results = await asyncio.gather(*(
+                loop.run_in_executor(pool, read_file_from_path, path, safe_name, content_hash)
+                for path, content_hash, (_, safe_name) in zip(paths, hashes, named_files)
+            ))
+        except BrokenProcessPool:
+            print("⚠️ [UPLOAD] Pool de procesos caído, leyendo en secuencial...")
+            shutdown_parse_pool()
+            results = [
+                read_file_from_path(path, safe_name, content_hash)
+                for path, content_hash, (_, safe_name) in zip(paths, hashes, named_files)
+            ]
+        elapsed = time.perf_counter() - t0
+
+        # Los contadores del caché viven en este proceso, no en los workers
+        for _, stats in results:
+            upload_cache.record_result(stats["cache"])
+
+        sequential = sum(stats["seconds"] for _, stats in results)
+        print(
+            f"⚡ [UPLOAD] {len(results)} archivos parseados en paralelo "
+            f"({UPLOAD_PARSE_WORKERS} procesos) en {elapsed:.3f}s | suma por archivo {sequential:.3f}s"
+        )
+        return [df for df, _ in results]
+    finally:
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
 
 
 async def handle_file_upload_generic(
@@ -110,7 +903,8 @@ async def handle_file_upload_generic(
     validator: Callable[[str], str],
     keyword_to_slot: Mapping[str, str],
     required_slots: List[str],
-    post_process: Callable[..., Any]
+    post_process: Callable[..., Any],
+    multi_slots: Collection[str] = (),
 ) -> Any:
     """
     - files: lista de UploadFile
@@ -118,26 +912,44 @@ async def handle_file_upload_generic(
     - keyword_to_slot: dict donde clave es keyword en filename validado, valor es nombre de atributo para guardar el DataFrame
     - required_slots: lista de slots obligatorios
     - post_process: función que recibe los DataFrames en orden de required_slots + opcionales, y retorna el resultado final
+    - multi_slots: slots que aceptan varios archivos; reciben la lista de DataFrames en el orden de subida
     """
 
-    # Inicializar slots en None
-    slot_data = {slot: None for slot in keyword_to_slot.values()}
+    # Inicializar slots en None (lista vacía los que aceptan varios archivos)
+    slot_data = {slot: [] if slot in multi_slots else None for slot in keyword_to_slot.values()}
+
+    # Validar todos los nombres antes de leer nada
+    named_files = [(file, validator(file.filename)) for file in files]
 
-    # Procesar cada archivo
-    for file in files:
-        safe_name = validator(file.filename)
-        content = await file.read()
-        df = read_file_safely(io.BytesIO(content), safe_name)
+    # Y la estructura (hojas/encabezados) antes de parsear completo
+    preflight_uploads([(file.file, safe_name) for file, safe_name in named_files])
 
+    # Varios archivos → parseo concurrente en el pool de procesos
+    if len(named_files) > 1 and UPLOAD_PARSE_WORKERS > 1:
+        frames = await read_files_parallel(named_files)
+    else:
+        frames = []
+        for file, safe_name in named_files:
+            # UploadFile ya llega como SpooledTemporaryFile (memoria → disco por bloques):
+            # el parser lee directamente de ese handle, sin file.read() ni BytesIO extra.
+            await file.seek(0)
+            df, stats = read_upload(file.file, safe_name)
+            upload_cache.record_result(stats["cache"])
+            frames.append(df)
+
+    for (_, safe_name), df in zip(named_files, frames):
         # Buscar a qué slot va
         lower = safe_name.lower()
         for kw, slot in keyword_to_slot.items():
-            if kw in safe_name.lower():
-                slot_data[slot] = df
+            if kw in lower:
+                if slot in multi_slots:
+                    slot_data[slot].append(df)
+                else:
+                    slot_data[slot] = df
                 break
 
     # Verificar faltantes
-    missing = [s for s in required_slots if slot_data.get(s) is None]
+    missing = [s for s in required_slots if slot_data.get(s) is None or (s in multi_slots and not slot_data[s])]
     if missing:
         raise ValueError(f"Faltan archivos requeridos: {', '.join(missing)}")
 
@@ -151,3 +963,44 @@ async def handle_file_upload_generic(
         if slot not in required_slots
     }
     return post_process(*dfs_required, **optional_slots)
+
+
+async def handle_file_upload_chunked(
+    files: List[UploadFile],
+    validator: Callable[[str], str],
+    keyword_to_slot: Mapping[str, str],
+    required_slots: List[str],
+    post_process: Callable[..., Any],
+    chunksize: int | None = None,
+) -> Any:
+    """
+    Igual que handle_file_upload_generic, pero post_process recibe por cada slot
+    un iterador de DataFrames (iter_file_chunks) en vez del archivo completo.
+    Pensado para exports grandes que se filtran y agregan por partes; no usa
+    el caché ni el pool de procesos porque la idea es no materializar el archivo.
+    """
+    slot_data = {slot: None for slot in keyword_to_slot.values()}
+
+    # Validar todos los nombres antes de leer nada
+    named_files = [(file, validator(file.filename)) for file in files]
+    preflight_uploads([(file.file, safe_name) for file, safe_name in named_files])
+
+    for file, safe_name in named_files:
+        await file.seek(0)
+        lower = safe_name.lower()
+        for kw, slot in keyword_to_slot.items():
+            if kw in lower:
+                slot_data[slot] = iter_file_chunks(file.file, safe_name, chunksize)
+                break
+
+    missing = [s for s in required_slots if slot_data.get(s) is None]
+    if missing:
+        raise ValueError(f"Faltan archivos requeridos: {', '.join(missing)}")
+
+    chunks_required = [slot_data[s] for s in required_slots]
+    optional_slots = {
+        slot: chunks
+        for slot, chunks in slot_data.items()
+        if slot not in required_slots
+    }
+    return post_process(*chunks_required, **optional_slots)
@@ -9,10 +9,16 @@ import math
 from collections import Counter
 
 from app.services.utils.upload_service import handle_file_upload_generic
+from app.services.utils.upload_schemas import UploadSchemaError
+from app.services.utils.upload_jobs import record_stage
+from app.services.utils.roster_snapshot import refresh_roster_snapshot
 from app.utils.validators.validate_excel_workers import validate_excel_workers
 from app.core.workers_concentrix.merge_worker_cx import generate_worker_cx_table
 from app.core.workers_ubycall.merge_worker_ubycall import generate_worker_uby_table
 from app.crud.worker import upsert_lookup_table, bulk_upsert_workers
+from app.core.utils.stage_memo import StageMemo
+from app.core.utils.workers_cx.name_match_index import NameMatchIndex
+from app.crud.name_alias import load_name_aliases, load_name_roster, save_name_aliases
 from app.models.worker import Role, Status, Campaign, Team, WorkType, ContractType, Worker
 from app.services.utils.files_name import FILES_WORKER_SERVICE
 
@@ -28,10 +34,38 @@ def safe_date(value):
         return None
 
 
+# Índice de alias de nombres (supervisor/coordinador/gerente → worker). Se carga de
+# NameAlias/NameRosterEntry en cada upload: la BD es la única copia, así un upload
+# ve los alias que guardaron los demás procesos de uvicorn (un índice por proceso
+# quedaría desactualizado). Cada upload usa su propia instancia.
+def load_name_index(session: Session) -> NameMatchIndex:
+    name_index = NameMatchIndex(load_name_aliases(session), load_name_roster(session))
+    print(f"🔤 [NAME-MATCH] Índice cargado con {name_index.alias_count} alias | padrón de {len(name_index.roster)} nombres")
+    return name_index
+
+
+def persist_name_index(session: Session, name_index: NameMatchIndex) -> None:
+    """Reporta el hit rate del upload y persiste los alias usados junto con el padrón vigente."""
+    rate = name_index.hit_rate()
+    rate_txt = f"{rate:.1%}" if rate is not None else "n/a"
+    print(
+        f"🔤 [NAME-MATCH] Hit rate {rate_txt} | desde índice={name_index.hits} "
+        f"(re-puntuados contra nombres nuevos={name_index.rescored}) | resueltos con rapidfuzz={name_index.misses}"
+    )
+    if not name_index.touched:
+        return
+    try:
+        save_name_aliases(session, name_index.touched, name_index.roster)
+    except Exception as e:
+        # El índice es una optimización: si no se puede guardar, el upload sigue
+        session.rollback()
+        print(f"⚠️ [NAME-MATCH] No se pudieron guardar los alias: {e}")
+
+
 async def process_and_persist_workers(
     files: List[UploadFile],
     session: Session
-) -> int:
+) -> Dict[str, int]:
     try:
         """Procesa los archivos Excel de trabajadores y persiste la información en BD con métricas de tiempo."""
         
@@ -50,9 +84,19 @@ async def process_and_persist_workers(
         )
         t2 = time.perf_counter()
         print(f"⏳ Tiempo 1 (Lectura y concatenación): {t2 - t1:.4f} segundos")
+        record_stage("read", t2 - t1)
 
-        df_concentrix = generate_worker_cx_table(people_active, people_inactive, scheduling_ppp, api_id, master_glovo_cx)
-        df_ubycall = generate_worker_uby_table(master_glovo_uby, scheduling_ubycall, api_id, people_active, people_inactive)
+        # 🕒 Tiempo 2: Limpieza y cruce (etapas compartidas entre Concentrix y Ubycall se calculan una vez)
+        t_clean = time.perf_counter()
+        memo = StageMemo("workers")
+        name_index = load_name_index(session)
+        df_concentrix = generate_worker_cx_table(people_active, people_inactive, scheduling_ppp, api_id, master_glovo_cx, memo, name_index)
+        df_ubycall = generate_worker_uby_table(master_glovo_uby, scheduling_ubycall, api_id, people_active, people_inactive, memo, name_index)
+        persist_name_index(session, name_index)
+        memo.report()
+        t_clean_end = time.perf_counter()
+        print(f"⏳ Tiempo 2 (Limpieza y cruce): {t_clean_end - t_clean:.4f} segundos | ahorro memo ~{memo.saved_seconds():.4f} segundos")
+        record_stage("clean", t_clean_end - t_clean)
 
         df = pd.concat([df_concentrix, df_ubycall], ignore_index=True)
         df = df.where(pd.notnull(df), None)
@@ -101,19 +145,24 @@ async def process_and_persist_workers(
             })
         t4 = time.perf_counter()
         print(f"⏳ Tiempo 3 (Preparación de registros): {t4 - t3:.4f} segundos")
+        record_stage("prepare", t4 - t3)
 
         # 🕒 Tiempo 4: Procesar e insertar o actualizar en base de datos
         t5 = time.perf_counter()
-        total_processed = bulk_upsert_workers(session, workers_data)
+        counts = bulk_upsert_workers(session, workers_data)
         t6 = time.perf_counter()
         print(f"⏳ Tiempo 4 (Insertar o actualizar en BD): {t6 - t5:.4f} segundos")
+        record_stage("persist", t6 - t5)
+        refresh_roster_snapshot("carga de workers")
 
         # Medición de tiempo total
         end_total = time.perf_counter()
         print(f"🕒 Tiempo total: {end_total - start_total:.4f} segundos")
 
-        return total_processed
+        return counts
 
+    except UploadSchemaError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print("❌ Error inesperado en process_and_persist_schedules:")
         print(traceback.format_exc())
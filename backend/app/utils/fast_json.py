@@ -0,0 +1,111 @@
+import os
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, select
+
+try:
+    import orjson
+except ImportError:  # sin orjson se usa json de la librería estándar (más lento, mismo resultado)
+    orjson = None
+
+# Respuestas de listas grandes sin pasar por response_model (opt-in): con
+# FAST_JSON_ENABLED=1 se sirven en streaming desde tuplas de SQL; por defecto se
+# mantiene el camino ORM + pydantic de siempre, que valida con response_model
+FAST_JSON_ENABLED = os.getenv("FAST_JSON_ENABLED", "0") == "1"
+# Filas por fragmento del arreglo en streaming (y por lectura del cursor en la BD)
+FAST_JSON_CHUNK_ROWS = int(os.getenv("FAST_JSON_CHUNK_ROWS", "2000"))
+
+T = TypeVar("T")
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def dumps(value: Any) -> bytes:
+    """JSON compacto en bytes; fechas y horas en ISO 8601 como las serializa pydantic."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def iter_json_array(items: Iterable[Dict[str, Any]], chunk_rows: int = FAST_JSON_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Arreglo JSON por fragmentos de `chunk_rows` filas, consumiendo `items` a medida
+    que se envía: con un generador nunca se arma el cuerpo (ni las filas) completo
+    en memoria.
+    """
+    yield b"["
+    rows = iter(items)
+    first = True
+    while chunk := list(islice(rows, chunk_rows)):
+        body = dumps(chunk)[1:-1]
+        yield body if first else b"," + body
+        first = False
+    yield b"]"
+
+
+class JSONArrayResponse(StreamingResponse):
+    """
+    Respuesta para endpoints de listas: recibe filas ya proyectadas (dicts desde
+    tuplas de SQL, idealmente el generador de select_rows) y las codifica en
+    streaming, sin validar con pydantic.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, items: Iterable[Dict[str, Any]], status_code: int = 200, headers: Optional[Dict[str, str]] = None):
+        super().__init__(iter_json_array(items), status_code=status_code, headers=headers, media_type=self.media_type)
+
+
+def schema_columns(schema: type, model: type, overrides: Optional[Dict[str, Any]] = None) -> List[Any]:
+    """Columnas de `model` con los campos de `schema` (en su orden); `overrides` reemplaza expresiones (ej. coalesce)."""
+    overrides = overrides or {}
+    return [overrides.get(f, getattr(model, f)).label(f) for f in schema.model_fields]
+
+
+def iter_rows(session: Session, columns: List[Any], *criteria: Any, order_by: Iterable[Any] = ()) -> Iterator[Dict[str, Any]]:
+    """
+    Filas como dicts directamente de las tuplas del SELECT (sin instanciar modelos
+    ORM), leídas de a FAST_JSON_CHUNK_ROWS con yield_per (cursor del lado del
+    servidor en Postgres). Usa `session` tal cual: debe seguir abierta mientras se consume.
+    """
+    statement = select(*columns)
+    if criteria:
+        statement = statement.where(*criteria)
+    order_by = list(order_by)
+    if order_by:
+        statement = statement.order_by(*order_by)
+    result = session.exec(statement.execution_options(yield_per=FAST_JSON_CHUNK_ROWS))
+    for row in result:
+        yield row._asdict()
+
+
+def streaming(session: Session, produce: Callable[[Session], Iterator[T]]) -> Iterator[T]:
+    """
+    Generador con sesión propia sobre el mismo engine que `session`: se abre al
+    pedir la primera fila y se cierra al agotarse o al cortarse la respuesta. La
+    sesión de la request se cierra antes de que se termine de enviar el cuerpo de
+    un StreamingResponse, así que no sirve para leer en streaming.
+    """
+    bind = session.get_bind()
+
+    def rows() -> Iterator[T]:
+        with Session(bind) as own_session:
+            yield from produce(own_session)
+
+    return rows()
+
+
+def select_rows(session: Session, columns: List[Any], *criteria: Any, order_by: Iterable[Any] = ()) -> Iterator[Dict[str, Any]]:
+    """Como iter_rows, en su propia sesión (ver `streaming`): para pasar directo a JSONArrayResponse."""
+    return streaming(session, lambda own_session: iter_rows(own_session, columns, *criteria, order_by=order_by))
@@ -1,15 +1,20 @@
 from fastapi import HTTPException
 from typing import Mapping
 
+# Formatos de upload aceptados: Excel, CSV y columnares (Parquet / Arrow IPC)
+UPLOAD_EXTENSIONS = ('.xlsx', '.csv', '.parquet', '.arrow', '.feather')
+
 def validate_and_map_filename(
     file_name: str,
     name_mapping: Mapping[str, str],
     error_detail_no_keyword: str = "El archivo debe tener un nombre válido.",
-    error_detail_bad_ext: str = "El archivo debe ser un archivo Excel (.xlsx) o CSV (.csv)."
+    error_detail_bad_ext: str = (
+        "El archivo debe ser Excel (.xlsx), CSV (.csv), Parquet (.parquet) o Arrow (.arrow/.feather)."
+    )
 ) -> str:
     """
     Valida que `file_name` contenga alguna de las claves de name_mapping
-    y que termine en .xlsx o .csv. Luego renombra según name_mapping
+    y que tenga una extensión de UPLOAD_EXTENSIONS. Luego renombra según name_mapping
     y sustituye espacios por '_'.
     """
     # 1) Debe contener al menos una clave
@@ -17,7 +22,7 @@ def validate_and_map_filename(
         raise HTTPException(status_code=400, detail=error_detail_no_keyword)
 
     # 2) Extensión válida
-    if not (file_name.endswith('.xlsx') or file_name.endswith('.csv')):
+    if not file_name.endswith(UPLOAD_EXTENSIONS):
         raise HTTPException(status_code=400, detail=error_detail_bad_ext)
 
     # 3) Reemplazar usando el mapeo (keywords más largas primero para evitar solapamientos)
@@ -0,0 +1,96 @@
+"""
+Compara los motores de lectura Excel de upload_service sobre archivos reales o,
+si no se pasan rutas, sobre libros sintéticos con la forma de los uploads
+(RESUMEN con encabezado doble tipo schedule_ppp, hoja plana tipo people_consultation).
+
+Uso (desde backend/):
+    python -m benchmarks.bench_excel_engines [archivo.xlsx ...] [--rows 20000] [--repeat 3]
+
+Para cada archivo usa la config de EXCEL_READ_CONFIGS que corresponda a su nombre,
+mide cada motor disponible y verifica que el DataFrame sea idéntico al de openpyxl.
+"""
+import io
+import sys
+import time
+import argparse
+import datetime as dt
+import pandas as pd
+from openpyxl import Workbook
+
+from app.services.utils.upload_service import EXCEL_ENGINES, get_read_config
+
+
+def build_schedule_ppp(rows: int) -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "RESUMEN"
+    for i in range(4):
+        ws.append([f"Cabecera {i}"])
+    days = [dt.datetime(2025, 1, d) for d in range(6, 13)]
+    ws.append(["DNI", "NOMBRE"] + [d for d in days for _ in (0, 1)])
+    ws.append(["DNI", "NOMBRE"] + ["ENTRADA", "SALIDA"] * len(days))
+    for i in range(rows):
+        shift = [dt.time(8, 0), dt.time(17, 0)] if i % 5 else ["LIBRE", "LIBRE"]
+        ws.append([str(70000000 + i), f"Agente {i}"] + shift * len(days))
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def build_people_consultation(rows: int) -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    header = ["DNI", "Nombre Completo", "Cargo", "Estado", "Fecha Ingreso", "Supervisor", "Campaña", "Sede"]
+    ws.append(header + [f"Extra {i}" for i in range(12)])
+    for i in range(rows):
+        ws.append(
+            [str(40000000 + i), f"Persona {i}", "AGENTE", "ACTIVO", dt.datetime(2024, 1, 1 + i % 28),
+             f"Supervisor {i % 40}", "GLOVO", "LIMA"] + [i * 0.5] * 12
+        )
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def bench(name: str, payload: bytes, repeat: int) -> None:
+    _, params = get_read_config(name)
+    kwargs = {k: v for k, v in params.items() if k != "engines"}
+    reference = pd.read_excel(io.BytesIO(payload), engine="openpyxl", **kwargs)
+    print(f"\n{name} ({len(payload) / 1024 ** 2:.1f} MB)")
+    for engine, (available, reader) in EXCEL_ENGINES.items():
+        if not available:
+            print(f"  {engine:<16} no instalado")
+            continue
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            df = reader(io.BytesIO(payload), kwargs)
+            times.append(time.perf_counter() - t0)
+        same = "idéntico" if df.equals(reference) and df.columns.equals(reference.columns) else "DIFERENTE"
+        print(f"  {engine:<16} mejor {min(times):.3f}s | filas {len(df)} | vs openpyxl: {same}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.files:
+        samples = []
+        for path in args.files:
+            with open(path, "rb") as fh:
+                samples.append((path.rsplit("/", 1)[-1], fh.read()))
+    else:
+        samples = [
+            ("schedule_ppp_sintetico.xlsx", build_schedule_ppp(args.rows)),
+            ("people_consultation_sintetico.xlsx", build_people_consultation(args.rows)),
+        ]
+
+    for name, payload in samples:
+        bench(name, payload, args.repeat)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
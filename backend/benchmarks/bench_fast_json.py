@@ -0,0 +1,155 @@
+"""
+Compara, por endpoint de listas, el camino de siempre (objetos ORM → response_model
+→ JSON estándar) con JSONArrayResponse (tuplas del SELECT → orjson en streaming):
+latencia, CPU del proceso y tamaño de la respuesta, verificando que el JSON sea
+el mismo.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_fast_json [--rows 10000] [--repeat 3] [--database-url postgresql://...]
+
+Sin --database-url usa una base SQLite temporal con datos sintéticos; ahí se omite
+/sla-breached-data/ (la columna link es un ARRAY de Postgres). Con una URL de
+Postgres las tablas deben existir (alembic upgrade head) y se usan sus datos.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from datetime import date, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlmodel import SQLModel, Session, create_engine
+
+from app.database.database import get_session
+from app.routers import real_time_data, sla_breached, contacts_with_ccr, planned, operational_view
+from app.models.real_time_data import RealTimeData
+from app.models.sla_breached import SlaBreached
+from app.models.planned import Planned
+from app.models.operational_view import OperationalView
+from app.models.contacts_with_ccr import ContactsReceived, ContactsReceivedReason
+from app.utils import fast_json
+
+# Endpoint → (módulo del router, tablas que necesita)
+ENDPOINTS = {
+    "/real-time-data/": (real_time_data, [RealTimeData]),
+    "/sla-breached-data/": (sla_breached, [SlaBreached]),
+    "/contacts-with-ccr/": (contacts_with_ccr, [ContactsReceived, ContactsReceivedReason]),
+    "/planned-data/": (planned, [Planned]),
+    "/operational-view/": (operational_view, [OperationalView]),
+}
+TEAMS = ["CUSTOMER TIER1", "RIDER TIER1", "VENDOR CALL", "PARTNER TIER2"]
+
+
+def intervals(rows: int):
+    """(team, fecha, intervalo) únicos, como los cargan los uploads."""
+    day, slot = date(2025, 1, 1), 0
+    for i in range(rows):
+        team = TEAMS[i % len(TEAMS)]
+        if i and i % len(TEAMS) == 0:
+            slot += 1
+            if slot == 48:
+                slot, day = 0, day + timedelta(days=1)
+        yield team, day, f"{slot // 2:02d}:{30 * (slot % 2):02d}"
+
+
+def seed(engine, rows: int, with_sla: bool) -> None:
+    rng = random.Random(0)
+    tables = [m.__table__ for _, models in ENDPOINTS.values() for m in models if with_sla or m is not SlaBreached]
+    SQLModel.metadata.create_all(engine, tables=tables)
+    keys = list(intervals(rows))
+    with Session(engine) as session:
+        session.execute(insert(RealTimeData), [
+            {"team": t, "date": d, "interval": i, "contacts_received": rng.randint(0, 300),
+             "sla_frt": rng.random() * 100, "tht": None if rng.random() < 0.1 else rng.random() * 900}
+            for t, d, i in keys
+        ])
+        session.execute(insert(Planned), [
+            {"team": t, "date": d, "interval": i, "forecast_tht": rng.randint(200, 900), "forecast_received": rng.randint(0, 300),
+             "required_agents": rng.randint(0, 60), "scheduled_agents": rng.randint(0, 60)}
+            for t, d, i in keys
+        ])
+        session.execute(insert(OperationalView), [
+            {"team": t, "date": d, "time_interval": i, "forecast_received": rng.randint(0, 300),
+             "service_level": rng.random() * 100, "agents_online": rng.randint(0, 60), "aht": rng.randint(200, 900)}
+            for t, d, i in keys
+        ])
+        session.execute(insert(ContactsReceived), [
+            {"team": t, "date_pe": d, "interval_pe": i, "date_es": d, "interval_es": i, "contacts_received": rng.randint(0, 300)}
+            for t, d, i in keys
+        ])
+        session.execute(insert(ContactsReceivedReason), [
+            {"contacts_received_id": n + 1, "contact_reason": f"motivo {k}", "count": rng.randint(1, 50)}
+            for n in range(rows) for k in range(3)
+        ])
+        if with_sla:
+            session.execute(insert(SlaBreached), [
+                {"team": t, "date": d, "interval": i, "api_email": f"agente{n % 500}@glovo.com",
+                 "chat_breached": None if n % 7 == 0 else rng.randint(0, 5), "link": [f"https://x/{n}"]}
+                for n, (t, d, i) in enumerate(keys)
+            ])
+        session.commit()
+
+
+def measure(client: TestClient, path: str, repeat: int):
+    walls, cpus = [], []
+    for _ in range(repeat):
+        w0, c0 = time.perf_counter(), time.process_time()
+        response = client.get(path)
+        cpus.append(time.process_time() - c0)
+        walls.append(time.perf_counter() - w0)
+        response.raise_for_status()
+    return response, statistics.median(walls), statistics.median(cpus)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+        skip = set()
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "bench_fast_json.db")
+        engine = create_engine(f"sqlite:///{path}")
+        seed(engine, args.rows, with_sla=False)
+        skip = {"/sla-breached-data/"}
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app = FastAPI()
+    for module, _ in ENDPOINTS.values():
+        app.include_router(module.router)
+    app.dependency_overrides[get_session] = session_override
+    client = TestClient(app)
+
+    encoder = "orjson" if fast_json.orjson is not None else "json (sin orjson)"
+    print(f"{engine.dialect.name} | filas por tabla {args.rows if not args.database_url else '(las de la BD)'} | {encoder}")
+    for path, (module, _) in ENDPOINTS.items():
+        if path in skip:
+            print(f"  {path:<22} | omitido en {engine.dialect.name}")
+            continue
+        results = {}
+        for enabled in (False, True):
+            module.FAST_JSON_ENABLED = enabled
+            results[enabled] = measure(client, path, args.repeat)
+        (old, t_old, cpu_old), (new, t_new, cpu_new) = results[False], results[True]
+        same = "idéntico" if old.json() == new.json() else "DIFERENTE"
+        print(
+            f"  {path:<22} | antes {t_old * 1000:7.1f}ms cpu {cpu_old * 1000:7.1f}ms | "
+            f"ahora {t_new * 1000:7.1f}ms cpu {cpu_new * 1000:7.1f}ms | x{t_old / t_new:.1f} | "
+            f"{len(new.content) / 1024:.0f} KB | {same}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,134 @@
+"""
+Compara el matching difuso denso (matriz completa de cdist) con el matcher por
+bloques de workers_cx/utils sobre padrones sintéticos de tamaño creciente: nombres
+de 2 a 4 tokens, targets con coincidencias exactas, tokens reordenados, typos y
+nombres ajenos al padrón (la forma de supervisores/coordinadores vs WORKER).
+
+Uso (desde backend/):
+    python -m benchmarks.bench_fuzzy_matching [--sizes 1000 5000 20000] [--targets 2000] [--threshold 90]
+
+Para cada tamaño mide el tiempo de ambos caminos, el tamaño de la matriz densa vs el
+pico de memoria del matcher por bloques (tracemalloc, en una corrida aparte para no
+inflar los tiempos) y verifica que las coincidencias que pasan el umbral sean
+idénticas. Fuerza el camino por bloques aunque el problema sea chico.
+
+Antes de medir comprueba los bordes: padrón vacío (sin coincidencias, como el
+process.extractOne anterior) y targets vacíos.
+"""
+import sys
+import time
+import argparse
+import tracemalloc
+import numpy as np
+from rapidfuzz import fuzz
+
+from app.core.utils.workers_cx import utils as workers_utils
+from app.core.utils.workers_cx.utils import blocked_best_matches, cdist_best_matches
+from app.core.utils.workers_cx.name_match_index import normalize_match_name
+
+ALPHABET = list("abcdefghijklmnopqrstuvwxyzáéíóúñ")
+
+
+def build_names(rng, size: int):
+    first = ["".join(rng.choice(ALPHABET, rng.integers(3, 9))) for _ in range(max(50, size // 20))]
+    last = ["".join(rng.choice(ALPHABET, rng.integers(4, 11))) for _ in range(max(100, size // 10))]
+    names = set()
+    while len(names) < size:
+        tokens = [rng.choice(first)] + [rng.choice(last) for _ in range(rng.integers(1, 4))]
+        names.add(" ".join(tokens).title())
+    return sorted(names)
+
+
+def typo(rng, name: str) -> str:
+    chars = list(name)
+    pos = int(rng.integers(len(chars)))
+    op = rng.integers(3)
+    if op == 0:
+        chars[pos] = rng.choice(ALPHABET)
+    elif op == 1:
+        del chars[pos]
+    else:
+        chars.insert(pos, rng.choice(ALPHABET))
+    return "".join(chars)
+
+
+def build_targets(rng, refs, count: int):
+    outsiders = build_names(rng, max(1, count // 10))
+    targets = []
+    for _ in range(count):
+        ref = refs[rng.integers(len(refs))]
+        u = rng.random()
+        if u < 0.5:
+            targets.append(ref)
+        elif u < 0.8:
+            targets.append(typo(rng, ref))
+        elif u < 0.9:
+            targets.append(" ".join(reversed(ref.split())).upper())
+        else:
+            targets.append(outsiders[rng.integers(len(outsiders))])
+    return list(dict.fromkeys(targets))
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def peak_mb(fn, *args, **kwargs) -> float:
+    tracemalloc.start()
+    fn(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 ** 2
+
+
+def bench(size: int, n_targets: int, threshold: float, scorer, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    refs = build_names(rng, size)
+    targets = build_targets(rng, refs, n_targets)
+    kwargs = {"scorer": scorer, "processor": normalize_match_name}
+
+    dense, t_dense = timed(cdist_best_matches, targets, refs, threshold, **kwargs)
+    blocked, t_blocked = timed(blocked_best_matches, targets, refs, threshold, **kwargs)
+    mb_dense = len(targets) * len(refs) * 4 / 1024 ** 2  # matriz float32 de cdist
+    mb_blocked = peak_mb(blocked_best_matches, targets, refs, threshold, **kwargs)
+
+    expected = [(m, s) if s >= threshold else (None, 0.0) for m, s in dense]
+    same = "idéntico" if expected == blocked else "DIFERENTE"
+    matched = sum(1 for m, _ in blocked if m is not None)
+    print(
+        f"  padrón {size:>6} | targets {len(targets):>5} | con match {matched:>5} | "
+        f"denso {t_dense:.3f}s {mb_dense:7.1f}MB | bloques {t_blocked:.3f}s {mb_blocked:7.1f}MB | "
+        f"x{t_dense / t_blocked if t_blocked else float('inf'):.1f} | {same}"
+    )
+
+
+def check_edge_cases(scorer) -> None:
+    kwargs = {"scorer": scorer, "processor": normalize_match_name}
+    targets = ["Juan Perez", "Maria Lopez"]
+    for matcher in (cdist_best_matches, blocked_best_matches):
+        assert matcher(targets, [], 90, **kwargs) == [(None, 0.0), (None, 0.0)], matcher.__name__
+        assert matcher([], ["Juan Perez"], 90, **kwargs) == [], matcher.__name__
+    print("  bordes (padrón vacío, targets vacíos): ok")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000, 50000])
+    parser.add_argument("--targets", type=int, default=2000)
+    parser.add_argument("--threshold", type=float, default=90)
+    parser.add_argument("--scorer", choices=["token_sort_ratio", "token_set_ratio"], default="token_sort_ratio")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    scorer = getattr(fuzz, args.scorer)
+    workers_utils.FUZZY_DENSE_MAX_CELLS = 0
+    print(f"{args.scorer} | umbral {args.threshold}")
+    check_edge_cases(scorer)
+    for size in args.sizes:
+        bench(size, args.targets, args.threshold, scorer, args.seed)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
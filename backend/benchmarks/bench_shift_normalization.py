@@ -0,0 +1,208 @@
+"""
+Compara schedule_concentrix y schedule_ppp (normalización de turnos por columnas,
+app/core/workers_schedule/shift_normalization.py) con sus versiones anteriores
+(iterrows por día + pd.to_timedelta por celda + apply por celda) sobre reportes
+sintéticos: turnos de día y de madrugada, descansos ("DSO"), celdas vacías,
+refrigerios "HH:MM:SS - HH:MM:SS", horas como texto, datetime.time y Timedelta.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_shift_normalization [--agents 3000] [--repeat 3]
+
+Para cada caso mide ambas versiones (mejor de `repeat`) y verifica que el
+DataFrame resultante sea idéntico (valores, índice y dtypes).
+"""
+import sys
+import time
+import argparse
+from datetime import date, datetime, timedelta, time as dtime
+import numpy as np
+import pandas as pd
+
+from app.core.utils.workers_cx.columns_names import (
+    DOCUMENT, START_DATE, END_DATE, START_TIME, END_TIME, BREAK_START, BREAK_END, REST_DAY,
+)
+from app.core.workers_schedule.schedule_concentrix import schedule_concentrix, SCHEDULE_CONCENTRIX_DAYS
+from app.core.workers_schedule.schedule_concentrix_ppp import schedule_ppp
+
+WEEK, YEAR = 2, 2025
+SHIFTS = [("08:00:00", "17:00:00"), ("14:00:00", "23:00:00"), ("22:00:00", "06:00:00"), ("23:30:00", "07:30:00")]
+
+
+def clock_cell(rng, text: str, style: str):
+    """La misma hora como texto, datetime.time o Timedelta (según `style`)."""
+    if style == "texto" or rng.random() < 0.5:
+        return text
+    h, m, s = map(int, text.split(":"))
+    return dtime(h, m, s) if rng.random() < 0.5 else pd.Timedelta(hours=h, minutes=m, seconds=s)
+
+
+def build_concentrix(rng, agents: int):
+    documents = [f"{int(rng.integers(1, 10**8)):08d}" for _ in range(agents)]
+    data = {"NRO_DOCUMENTO": documents, "SERVICIO": rng.choice(["GLOVO", "GLOVO", "GLOVO", "OTRO"], agents)}
+    for day in SCHEDULE_CONCENTRIX_DAYS:
+        starts, ends, breaks = [], [], []
+        for _ in range(agents):
+            u = rng.random()
+            if u < 0.15:
+                starts.append(np.nan); ends.append(np.nan); breaks.append(np.nan)
+            elif u < 0.2:
+                starts.append("DSO"); ends.append("DSO"); breaks.append("DSO")
+            else:
+                start, end = SHIFTS[rng.integers(len(SHIFTS))]
+                starts.append(start); ends.append(end)
+                breaks.append("13:00:00 - 14:00:00" if rng.random() < 0.8 else "13:00:00")
+        data[f"INGRESO_{day.upper()}"] = starts
+        data[f"SALIDA_{day.upper()}"] = ends
+        data[f"REFRIGERIO_{day.upper()}"] = breaks
+
+    monday = date.fromisocalendar(YEAR, WEEK, 1)
+    obs = {"NRO_DOCUMENTO": documents}
+    for i in range(7):
+        obs[(monday + timedelta(days=i)).strftime("%d/%m/%Y")] = rng.choice(["VAC", "FALTA", "08:00", None], agents)
+    return pd.DataFrame(data), pd.DataFrame(obs)
+
+
+def build_ppp(rng, agents: int, style: str) -> pd.DataFrame:
+    monday = datetime.fromisocalendar(YEAR, WEEK, 1)
+    columns = {("Agente", "DNI"): [f"{int(rng.integers(1, 10**8)):08d}" for _ in range(agents)]}
+    for i in range(7):
+        day = monday + timedelta(days=i)
+        cells = {"Hora Inicio": [], "Hora Fin": [], "Inicio Almuerzo": [], "Fin Almuerzo": []}
+        for _ in range(agents):
+            if rng.random() < 0.2:
+                for values in cells.values():
+                    values.append(np.nan)
+                continue
+            start, end = SHIFTS[rng.integers(len(SHIFTS))]
+            cells["Hora Inicio"].append(clock_cell(rng, start, style))
+            cells["Hora Fin"].append(clock_cell(rng, end, style))
+            cells["Inicio Almuerzo"].append(clock_cell(rng, "13:00:00", style))
+            cells["Fin Almuerzo"].append(clock_cell(rng, "14:00:00", style))
+        for label, values in cells.items():
+            columns[(day, label)] = pd.Series(values, dtype=object)
+    return pd.DataFrame(columns)
+
+
+# --- Versiones anteriores (referencia) ---------------------------------------
+
+def _legacy_end_dates(sub: pd.DataFrame) -> None:
+    for i, row in sub.iterrows():
+        try:
+            start_time = pd.to_timedelta(row[START_TIME])
+            end_time = pd.to_timedelta(row[END_TIME])
+        except ValueError:
+            continue
+        if end_time.total_seconds() / 60 < start_time.total_seconds() / 60:
+            sub.at[i, END_DATE] = sub.at[i, END_DATE] + timedelta(days=1)
+
+
+def _legacy_times(df: pd.DataFrame) -> None:
+    for col in (START_TIME, END_TIME, BREAK_START, BREAK_END):
+        df[col] = pd.to_datetime(df[col], format="%H:%M:%S", errors="coerce").dt.time
+    for col in (START_TIME, END_TIME, BREAK_START, BREAK_END):
+        df[col] = df[col].apply(lambda x: x if isinstance(x, dtime) else None)
+
+
+def legacy_schedule_concentrix(data, data_obs, week=None, year=None):
+    data["NRO_DOCUMENTO"] = data["NRO_DOCUMENTO"].astype(str).str.lstrip("0")
+    data_obs["NRO_DOCUMENTO"] = data_obs["NRO_DOCUMENTO"].astype(str).str.lstrip("0")
+    data = data[data['SERVICIO'] == 'GLOVO']
+    monday = date.fromisocalendar(year, week, 1)
+    records = []
+    for idx, day in enumerate(SCHEDULE_CONCENTRIX_DAYS):
+        current_date = monday + timedelta(days=idx)
+        ing_col, sal_col, ref_col = f"INGRESO_{day.upper()}", f"SALIDA_{day.upper()}", f"REFRIGERIO_{day.upper()}"
+        sub = data[["NRO_DOCUMENTO", ing_col, sal_col, ref_col]].copy()
+        sub.rename(columns={"NRO_DOCUMENTO": DOCUMENT, ing_col: START_TIME, sal_col: END_TIME, ref_col: "REF"}, inplace=True)
+        sub[START_DATE] = current_date
+        sub[END_DATE] = current_date
+        ref_split = sub["REF"].astype(str).str.split("-", n=1, expand=True)
+        sub[BREAK_START] = ref_split[0].str.strip()
+        sub[BREAK_END] = ref_split[1].str.strip() if ref_split.shape[1] > 1 else None
+        sub.drop(columns=["REF"], inplace=True)
+        _legacy_end_dates(sub)
+        sub[REST_DAY] = sub[START_TIME].isna()
+        date_col = current_date.strftime("%d/%m/%Y")
+        if date_col in data_obs.columns:
+            obs_map = data_obs.set_index("NRO_DOCUMENTO")[date_col]
+            sub["obs"] = sub[DOCUMENT].map(obs_map)
+            sub["obs"] = sub["obs"].where(~sub["obs"].astype(str).str.match(r"^\d{1,2}:\d{2}(:\d{2})?$"))
+        else:
+            sub["obs"] = None
+        records.append(sub)
+    df = pd.concat(records, ignore_index=True)
+    _legacy_times(df)
+    df["obs"] = df["obs"].replace({pd.NA: None, np.nan: None})
+    return df[[DOCUMENT, START_DATE, END_DATE, START_TIME, END_TIME, BREAK_START, BREAK_END, REST_DAY, "obs"]]
+
+
+def legacy_schedule_ppp(df):
+    dni_col = next(col for col in df.columns if col[1] == "DNI")
+    date_values = sorted({c[0] for c in df.columns if isinstance(c[0], datetime)})
+    wanted = {"Hora Inicio": START_TIME, "Hora Fin": END_TIME, "Inicio Almuerzo": BREAK_START, "Fin Almuerzo": BREAK_END}
+    records = []
+    for day in date_values:
+        sub_cols, col_renames = [dni_col], {"DNI": DOCUMENT}
+        for original_name, new_name in wanted.items():
+            if (day, original_name) in df.columns:
+                sub_cols.append((day, original_name))
+                col_renames[original_name] = new_name
+        if len(sub_cols) == 1:
+            continue
+        sub = df.loc[:, sub_cols].copy()
+        sub.columns = [c[1] for c in sub.columns]
+        sub = sub.rename(columns=col_renames)
+        for col in [START_TIME, END_TIME, BREAK_START, BREAK_END]:
+            if col not in sub.columns:
+                sub[col] = None
+        sub[START_DATE] = day.date()
+        sub[END_DATE] = day.date()
+        _legacy_end_dates(sub)
+        sub[REST_DAY] = sub[START_TIME].isna()
+        for col in [START_TIME, END_TIME, BREAK_START, BREAK_END]:
+            sub[col] = sub[col].apply(lambda x: f"{x.components.hours:02}:{x.components.minutes:02}:{x.components.seconds:02}" if isinstance(x, pd.Timedelta) else x)
+        records.append(sub[[DOCUMENT, START_DATE, END_DATE, START_TIME, END_TIME, BREAK_START, BREAK_END, REST_DAY]])
+    final_df = pd.concat(records, ignore_index=True)
+    _legacy_times(final_df)
+    return final_df
+
+
+# --- Medición ----------------------------------------------------------------
+
+def best_of(repeat: int, fn, *frames, **kwargs):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        copies = [f.copy() for f in frames]  # los limpiadores modifican su entrada
+        t0 = time.perf_counter()
+        result = fn(*copies, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return result, best
+
+
+def compare(label: str, repeat: int, legacy, vectorized, *frames, **kwargs) -> None:
+    old, t_old = best_of(repeat, legacy, *frames, **kwargs)
+    new, t_new = best_of(repeat, vectorized, *frames, **kwargs)
+    same = list(old.dtypes) == list(new.dtypes) and list(old.columns) == list(new.columns) and old.equals(new)
+    overnight = int((new[END_DATE] != new[START_DATE]).sum())
+    print(f"  {label:<24} | filas {len(new):>6} | madrugada {overnight:>5} | antes {t_old:7.3f}s | "
+          f"ahora {t_new:7.3f}s | x{t_old / t_new if t_new else float('inf'):.1f} | {'idéntico' if same else 'DIFERENTE'}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agents", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    conc, obs = build_concentrix(rng, args.agents)
+    print(f"{args.agents} agentes x 7 días")
+    compare("schedule_concentrix", args.repeat, legacy_schedule_concentrix, schedule_concentrix, conc, obs, week=WEEK, year=YEAR)
+    for style in ("texto", "mixto"):
+        ppp = build_ppp(rng, args.agents, style)
+        compare(f"schedule_ppp ({style})", args.repeat, legacy_schedule_ppp, schedule_ppp, ppp)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
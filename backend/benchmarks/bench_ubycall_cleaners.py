@@ -0,0 +1,169 @@
+"""
+Compara los limpiadores de la rama Ubycall (app/core/workers_ubycall) con sus
+versiones anteriores (apply con lambdas por celda) sobre un maestro Glovo y un
+archivo de scheduling sintéticos: nombres con espacios y mayúsculas mezcladas,
+celdas vacías y no textuales, fechas de alta inválidas o del mes en curso, DNIs
+con ceros a la izquierda y ".0", columnas que la limpieza no usa.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_ubycall_cleaners [--agents 10000] [--repeat 5]
+
+Para cada paso mide ambas versiones (mejor de `repeat`) y verifica que el
+resultado sea idéntico (valores, índice y dtypes). El cruce difuso de
+supervisores/coordinadores no cambia aquí: se mide en bench_fuzzy_matching.
+"""
+import sys
+import time
+import argparse
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+from app.core.utils.workers_cx.columns_names import DOCUMENT, NAME, TEAM
+from app.core.workers_ubycall.clean_master_glovo import strip_title, tenure_in_months
+from app.core.workers_ubycall.clean_scheduling_ubycall import COLUMNS_SCHEDULING_UBYCALL, clean_scheduling_ubycall
+
+FIRST = ["maría", "JOSÉ", "Luis", "ana belén", "carlos", "LUCÍA", "pedro", "Sofía", "juan carlos", "elena"]
+LAST = ["garcía", "PÉREZ", "de la cruz", "López", "martínez", "o'neill", "SÁNCHEZ", "ruiz-díaz", "gómez", "vega"]
+SYLLABLES = ["ro", "DRI", "gue", "Ma", "tí", "nez", "ca", "BE", "llo", "sa", "lar", "zá"]
+GLOVO_TEAMS = ["Ubycall Chat User", "Ubycall Chat Glover", "Ubycall Partnercall Es", "Otro Canal"]
+SCHEDULING_TEAMS = [
+    "GLOVO -  GLOVER ESPANA", "GLOVO -  USER ESPANA", "GLOVO - USER TIER C", "GLOVO - PARTNER SERVICES", "OTRA CAMPAÑA",
+]
+
+
+def surname(rng) -> str:
+    return rng.choice(LAST) if rng.random() < 0.5 else "".join(rng.choice(SYLLABLES, rng.integers(2, 4)))
+
+
+def build_names(rng, count: int, blanks: float = 0.02) -> list:
+    names = [
+        f"  {rng.choice(FIRST)} {surname(rng)} {surname(rng)} " if rng.random() < 0.3
+        else f"{rng.choice(FIRST)} {surname(rng)} {surname(rng)}"
+        for _ in range(count)
+    ]
+    for i in np.flatnonzero(rng.random(count) < blanks):
+        names[i] = [np.nan, None, 12345][i % 3]
+    return names
+
+
+def build_start_dates(rng, count: int, now: datetime) -> list:
+    dates = []
+    for _ in range(count):
+        u = rng.random()
+        if u < 0.01:
+            dates.append("sin fecha")
+        elif u < 0.1:
+            dates.append(now - timedelta(days=int(rng.integers(0, 45))))  # mes en curso / anterior
+        else:
+            dates.append(now - timedelta(days=int(rng.integers(45, 3000))))
+    return dates
+
+
+def build_master(rng, agents: int, now: datetime) -> pd.DataFrame:
+    supervisors = build_names(rng, 200, blanks=0.05)
+    return pd.DataFrame({
+        "DNI": [f"{int(rng.integers(1, 10**8)):08d}" for _ in range(agents)],
+        "NOMBRE": build_names(rng, agents),
+        "ESTADO": rng.choice(["ACTIVO", "baja", "Activo"], agents),
+        "FECHA DE ALTA": build_start_dates(rng, agents, now),
+        "SUPERVISOR": [supervisors[i] for i in rng.integers(0, len(supervisors), agents)],
+        "RESPONSABLE": [supervisors[i] for i in rng.integers(0, len(supervisors), agents)],
+        "CANALES GLOVO": rng.choice(GLOVO_TEAMS, agents),
+    })
+
+
+def build_scheduling(rng, agents: int) -> pd.DataFrame:
+    documents = rng.integers(1, 10**8, agents).astype(float)
+    return pd.DataFrame({
+        "DNI": [f" {d:.1f} " if i % 4 == 0 else d for i, d in enumerate(documents)],
+        "NOMBRECOMPLETO": [n if isinstance(n, str) else np.nan for n in build_names(rng, agents)],
+        "CAMPANA": rng.choice(SCHEDULING_TEAMS, agents),
+        "HORARIOSELECCIONADO": rng.choice(["M", "T", "N"], agents),
+        "FECHA_CREA_AGENTE": rng.integers(20200101, 20251231, agents),
+        "CORREO": [f"agente{i}@ubycall.com" for i in range(agents)],
+    })
+
+
+# --- Versiones anteriores (referencia) ---------------------------------------
+
+def legacy_strip_title(values: pd.Series) -> pd.Series:
+    return values.apply(lambda x: x.strip().title() if isinstance(x, str) else x)
+
+
+def legacy_tenure(start_dates: pd.Series, current_date: datetime) -> pd.Series:
+    return start_dates.apply(
+        lambda x: 0 if (current_date.year == x.year and current_date.month == x.month) or
+        (current_date.year == x.year and current_date.month - x.month == 1 and current_date.day < x.day) else
+        (current_date.year - x.year) * 12 + current_date.month - x.month
+    )
+
+
+def legacy_clean_scheduling_ubycall(data: pd.DataFrame) -> pd.DataFrame:
+    data = data.rename(columns=COLUMNS_SCHEDULING_UBYCALL)
+    data[DOCUMENT] = (
+        data[DOCUMENT].astype(str).str.strip().str.replace(r"\.0$", "", regex=True).str.lstrip("0")
+    )
+    data[DOCUMENT] = pd.to_numeric(data[DOCUMENT], errors="coerce").astype("Int64")
+    data[NAME] = data[NAME].str.title()
+    data = data.drop_duplicates(subset=[NAME])
+    data[TEAM] = data[TEAM].replace({
+        'GLOVO -  GLOVER ESPANA': 'RIDER TIER1',
+        'GLOVO -  USER ESPANA': 'CUSTOMER TIER1',
+        'GLOVO - USER TIER C': 'CUSTOMER TIER1',
+        'GLOVO - PARTNER SERVICES': 'VENDOR CALL'
+    })
+    data = data[data[TEAM].isin(['CUSTOMER TIER1', 'RIDER TIER1', 'VENDOR CALL'])]
+    data["SUPERVISOR"] = np.nan
+    data["COORDINATOR"] = np.nan
+    return data[[DOCUMENT, NAME, TEAM]]
+
+
+# --- Medición ----------------------------------------------------------------
+
+def best_of(repeat: int, fn, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return result, best
+
+
+def identical(a, b) -> bool:
+    if isinstance(a, pd.Series):
+        return a.dtype == b.dtype and a.equals(b)
+    return list(a.dtypes) == list(b.dtypes) and list(a.columns) == list(b.columns) and a.equals(b)
+
+
+def compare(label: str, repeat: int, legacy, vectorized, *args) -> None:
+    old, t_old = best_of(repeat, legacy, *args)
+    new, t_new = best_of(repeat, vectorized, *args)
+    same = "idéntico" if identical(old, new) else "DIFERENTE"
+    print(f"  {label:<28} | antes {t_old * 1000:8.1f}ms | ahora {t_new * 1000:7.1f}ms | "
+          f"x{t_old / t_new if t_new else float('inf'):.1f} | {same}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agents", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    now = datetime.now()
+    master = build_master(rng, args.agents, now)
+    scheduling = build_scheduling(rng, args.agents)
+    start_dates = pd.to_datetime(master["FECHA DE ALTA"], errors="coerce")
+
+    print(f"maestro Glovo {len(master)} agentes | scheduling {len(scheduling)} filas")
+    for column in ("NOMBRE", "SUPERVISOR", "RESPONSABLE"):
+        compare(f"strip/title {column}", args.repeat, legacy_strip_title, strip_title, master[column])
+    compare("TENURE (con NaT)", args.repeat, legacy_tenure, tenure_in_months, start_dates, now)
+    compare("TENURE (sin NaT)", args.repeat, legacy_tenure, tenure_in_months, start_dates.dropna(), now)
+    compare("clean_scheduling_ubycall", args.repeat, legacy_clean_scheduling_ubycall, clean_scheduling_ubycall, scheduling)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])